@@ -0,0 +1,240 @@
+"""
+Benchmarks of the SDK's hot paths on synthetic Arrow payloads, runnable offline.
+
+Each case measures one stage for one event and payload size, reporting rows per second and the peak RSS of the
+process. Cases run in a fresh process each, so peak RSS isn't inflated by earlier cases.
+
+Usage:
+    python -m benchmarks.run --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import hypersync
+import polars as pl
+import pyarrow as pa
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import List, Optional
+from mev_commit_sdk_py.hypersync_client import EVENT_REGISTRY, EVENT_TX_COLUMNS, create_field_selection
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+# The measured stages: building event queries, converting Arrow responses to Polars, joining decoded logs to their
+# transactions and blocks, and writing the joined result to Parquet
+STAGES = ("query_build", "arrow_to_polars", "join", "parquet_write")
+
+# Events with few static parameters, many dynamic parameters, and only indexed parameters
+EVENTS = ("FundsSlashed", "OpenedCommitmentStored", "NewL1Block")
+
+SIZES = (1_000, 10_000, 100_000)
+
+# Logs emitted per synthetic block
+LOGS_PER_BLOCK = 4
+
+
+def sample_value(abi_type: str, i: int):
+    """A distinct value of an ABI type."""
+    if abi_type == "address":
+        return "0x" + format(i % (1 << 160), "040x")
+    if abi_type == "bool":
+        return i % 2 == 0
+    if abi_type.startswith(("uint", "int")):
+        return 10**18 + i if abi_type == "uint256" else i
+    if abi_type == "string":
+        return f"value {i}"
+    if abi_type == "bytes":
+        return "0x" + format(i, "064x") * 2
+    return "0x" + format(i, "064x")
+
+
+def build_payload(event_name: str, rows: int):
+    """
+    Build the Arrow response of an event query over a synthetic chain with `rows` logs of the event.
+
+    Returns:
+        tuple[Hypersync, hypersync.ArrowResponseData]: The client and the response data.
+    """
+    spec = EVENT_REGISTRY.get(event_name)
+    chain = SyntheticChain()
+    for i in range(rows):
+        values = {p.name: sample_value(p.type, i + j) for j, p in enumerate(spec.params)}
+        chain.emit(spec, values, block_number=i // LOGS_PER_BLOCK)
+
+    client = fake_hypersync(chain)
+    query = client.create_query(
+        from_block=0,
+        to_block=chain.height,
+        logs=[spec.select_logs()],
+        field_selection=create_field_selection(list(spec.columns or EVENT_TX_COLUMNS), logs=True),
+    )
+    config = hypersync.StreamConfig(
+        hex_output=hypersync.HexOutput.PREFIXED,
+        event_signature=spec.signature,
+        column_mapping=spec.column_mapping,
+    )
+    return client, asyncio.run(client.client.collect_arrow(query, config)).data
+
+
+def run_stage(stage: str, client, data, event_name: str, rows: int, directory: str) -> int:
+    """
+    Run a stage once.
+
+    Returns:
+        int: The number of rows (or queries) processed.
+    """
+    if stage == "query_build":
+        signature = EVENT_REGISTRY.get(event_name).signature
+        for i in range(rows):
+            client.create_event_query(signature, i, i + 1_000)
+        return rows
+    if stage == "arrow_to_polars":
+        for table in (data.decoded_logs, data.logs, data.transactions, data.blocks):
+            pl.from_arrow(table)
+        return data.decoded_logs.num_rows
+    df = client.build_frame(data, tx_data=True, columns=list(EVENT_TX_COLUMNS))
+    if stage == "join":
+        return df.height
+    if stage == "parquet_write":
+        df.write_parquet(os.path.join(directory, "bench.parquet"))
+        return df.height
+    raise ValueError(f"Unsupported stage: {stage}")
+
+
+def peak_rss_mb() -> float:
+    """The peak resident set size of the process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_case(stage: str, event_name: str, rows: int, repeat: int = 3) -> dict:
+    """
+    Measure a stage for an event and payload size.
+
+    Args:
+        stage (str): The stage, one of `STAGES`.
+        event_name (str): The event of the payload.
+        rows (int): The number of event logs in the payload.
+        repeat (int): The number of timed runs.
+
+    Returns:
+        dict: The result, with the best and median rows per second, and the peak RSS before and after the stage.
+    """
+    client, data = build_payload(event_name, rows)
+    # Warm up, e.g. Polars' thread pool and lazily compiled expressions
+    run_stage(stage, client, data, event_name, min(rows, 100), tempfile.gettempdir())
+    baseline_rss = peak_rss_mb()
+
+    timings, processed = [], 0
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            processed = run_stage(stage, client, data, event_name, rows, directory)
+            timings.append(time.perf_counter() - start)
+
+    rss = peak_rss_mb()
+    return {
+        "stage": stage,
+        "event": event_name,
+        "rows": processed,
+        "best_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "rows_per_sec": processed / max(min(timings), 1e-9),
+        "peak_rss_mb": round(rss, 1),
+        "stage_rss_mb": round(rss - baseline_rss, 1),
+    }
+
+
+def run_isolated(stage: str, event_name: str, rows: int, repeat: int) -> dict:
+    """Run a case in a fresh process, so its peak RSS only covers the case."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(run_case, stage, event_name, rows, repeat).result()
+
+
+def environment() -> dict:
+    """The versions and platform the benchmarks ran on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "polars": pl.__version__,
+        "pyarrow": pa.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    """
+    Find cases that got slower than a baseline.
+
+    Args:
+        results (List[dict]): The current results.
+        baseline (List[dict]): The baseline results.
+        threshold (float): The tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: A description of each regressed case.
+    """
+    previous = {(r["stage"], r["event"], r["rows"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["stage"], result["event"], result["rows"]))
+        if before and result["rows_per_sec"] < before["rows_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{result['stage']} {result['event']} {result['rows']} rows: "
+                f"{before['rows_per_sec']:,.0f} -> {result['rows_per_sec']:,.0f} rows/sec"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--events", nargs="+", default=list(EVENTS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results as JSON to this file instead of stdout")
+    parser.add_argument("--compare", help="A previous results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="The tolerated relative slowdown")
+    parser.add_argument("--in-process", action="store_true", help="Run every case in this process")
+    args = parser.parse_args(argv)
+
+    results = []
+    for event_name in args.events:
+        for rows in args.sizes:
+            for stage in args.stages:
+                run = run_case if args.in_process else run_isolated
+                result = run(stage, event_name, rows, args.repeat)
+                results.append(result)
+                print(
+                    f"{stage:>16} {event_name:>24} {rows:>9,} rows  {result['rows_per_sec']:>14,.0f} rows/sec  "
+                    f"{result['peak_rss_mb']:>8,.1f} MB peak",
+                    file=sys.stderr,
+                )
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
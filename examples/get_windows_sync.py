@@ -1,34 +1,28 @@
-import asyncio
 import polars as pl
-from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.helpers import wei_to_eth
+from mev_commit_sdk_py.ledger import BidderLedger
+from mev_commit_sdk_py.sync import SyncHypersync
 
 # expand polars df output
 pl.Config.set_fmt_str_lengths(200)
 pl.Config.set_fmt_float("full")
 
-# query window data
-client = Hypersync(url='https://mev-commit.hypersync.xyz')
+bidder = '0xe51EF1836Dbef052BfFd2eB3Fe1314365d23129d'
 
-deposits_df = asyncio.run(client.get_window_deposits_v1(
-    address='0xe51EF1836Dbef052BfFd2eB3Fe1314365d23129d'))
+# build the bidder ledger. With a path, later runs only ingest the blocks since the last run
+ledger = BidderLedger(path='bidder_ledger.parquet')
+with SyncHypersync(url='https://mev-commit.hypersync.xyz') as client:
+    client.update_bidder_ledger(ledger)
 
-withdraws_df = asyncio.run(client.get_window_withdraws_v1(
-    address='0xe51EF1836Dbef052BfFd2eB3Fe1314365d23129d'))
-
-# extract dataframe columns to lists
-deposit_windows: list[int] = deposits_df['windowNumber'].to_list()
-withdraw_windows: list[int] = withdraws_df['window'].to_list()
-# take the set difference between deposit_windows and withdraw_windows
-windows: list[int] = list(set(deposit_windows) - set(withdraw_windows))
+# balances of the bidder per window
+windows = ledger.balances(bidders=bidder).filter(pl.col('locked') > 0)
 print('windows with funds still locked')
-print(windows)
+print(windows['window'].to_list())
 
-# total the amount of ETH locked
-total_deposited = sum(deposits_df.filter(
-    pl.col('windowNumber').is_in(windows))['depositedAmount'].to_list())
-total_withdrawn = sum(withdraws_df.filter(
-    pl.col('window').is_in(windows))['amount'].to_list())
+totals = windows.select(wei_to_eth(pl.col('deposited', 'withdrawn', 'locked')).sum())
+print(f"Total ETH deposited: {totals['deposited'].item()}")
+print(f"Total ETH withdrawn: {totals['withdrawn'].item()}")
+print(f"Total ETH locked: {totals['locked'].item()}")
 
-print(f'Total ETH deposited: {total_deposited / 10**18}')
-print(f'Total ETH withdrawn: {total_withdrawn / 10**18}')
-print(f'Total ETH locked: {(total_deposited - total_withdrawn) / 10**18}')
+# locked funds of every bidder at once
+print(ledger.locked())
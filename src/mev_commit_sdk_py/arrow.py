@@ -0,0 +1,163 @@
+import binascii
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from typing import List, Optional
+
+# Temporary columns keeping the row positions of both sides of a join, as Arrow's hash join doesn't preserve order
+ROW_INDEX = "__row_index"
+RIGHT_ROW_INDEX = "__right_row_index"
+
+
+def select_arrow_columns(table: pa.Table, columns: List[str]) -> List[str]:
+    """
+    Select the requested columns present in an Arrow table, in request order, always keeping the join keys.
+
+    Args:
+        table (pa.Table): The table to select from.
+        columns (List[str]): The requested columns.
+
+    Returns:
+        List[str]: The column names to select.
+    """
+    names = table.column_names
+    keys = [c for c in ("hash", "block_number") if c in names]
+    return list(dict.fromkeys(keys + [c for c in columns if c in names]))
+
+
+def row_positions(table: pa.Table, keys: List[str], name: str) -> pa.Table:
+    """The join keys of a table with the position of each row."""
+    return table.select(keys).append_column(name, pa.array(range(table.num_rows), pa.uint64()))
+
+
+def left_join(left: pa.Table, right: pa.Table, keys: List[str], right_suffix: Optional[str] = None) -> pa.Table:
+    """
+    Left join two Arrow tables with Arrow compute, keeping the row order of the left table.
+
+    Only the join keys and row positions go through the hash join. The right columns are then gathered by position,
+    and the left columns are kept as they are, without a copy, when each left row matches at most one right row, so
+    the large side should be on the left.
+
+    Args:
+        left (pa.Table): The left table.
+        right (pa.Table): The right table.
+        keys (List[str]): The join keys, present in both tables.
+        right_suffix (Optional[str]): The suffix of right columns clashing with left columns, optional.
+
+    Returns:
+        pa.Table: The joined table, with the left columns first.
+    """
+    positions = row_positions(left, keys, ROW_INDEX).join(
+        row_positions(right, keys, RIGHT_ROW_INDEX), keys=keys, join_type="left outer"
+    )
+    positions = positions.select([ROW_INDEX, RIGHT_ROW_INDEX]).sort_by(
+        [(ROW_INDEX, "ascending"), (RIGHT_ROW_INDEX, "ascending")]
+    )
+    if positions.num_rows != left.num_rows:
+        # Left rows matching several right rows are repeated
+        left = left.take(positions[ROW_INDEX])
+
+    gathered = right.drop_columns(keys).take(positions[RIGHT_ROW_INDEX])
+    for name in gathered.column_names:
+        clashes = name in left.column_names and right_suffix
+        left = left.append_column(name + right_suffix if clashes else name, gathered[name])
+    return left
+
+
+def hex_to_binary(array: pa.Array | pa.ChunkedArray) -> pa.Array:
+    """
+    Decode an Arrow array of hex strings, prefixed with "0x" or not, to raw bytes.
+
+    The hex characters of all values are decoded in one call over the array's data buffer, and the offsets are
+    halved, so there is no per-value Python loop.
+
+    Args:
+        array (pa.Array | pa.ChunkedArray): The hex strings.
+
+    Returns:
+        pa.Array: The bytes, null where the strings are null.
+
+    Raises:
+        binascii.Error: If a value has an odd length or a non-hex character.
+    """
+    strings = pc.replace_substring_regex(array, "^0[xX]", "")
+    if isinstance(strings, pa.ChunkedArray):
+        strings = strings.combine_chunks()
+    strings = strings.cast(pa.large_string())
+    validity, offsets, data = strings.buffers()
+    offsets = pa.Array.from_buffers(pa.int64(), len(strings) + 1, [None, offsets], offset=strings.offset)
+    start, end = offsets[0].as_py(), offsets[-1].as_py()
+    decoded = binascii.unhexlify(memoryview(data)[start:end] if data is not None else b"")
+    offsets = pc.divide(pc.subtract(offsets, start), 2)
+    # The validity bitmap is shared with the strings, so it keeps their offset
+    if strings.offset:
+        validity = pc.is_valid(strings).buffers()[1] if strings.null_count else None
+    return pa.Array.from_buffers(
+        pa.large_binary(), len(strings), [validity, offsets.buffers()[1], pa.py_buffer(decoded)],
+        null_count=strings.null_count,
+    )
+
+
+def join_blocks_arrow(transactions: pa.Table, blocks: pa.Table) -> pa.Table:
+    """
+    Join block columns onto transactions by block number, matching `Hypersync.join_blocks`.
+
+    Args:
+        transactions (pa.Table): The transactions.
+        blocks (pa.Table): The blocks, keyed by "number".
+
+    Returns:
+        pa.Table: The transactions with block columns, clashing names suffixed with "_block".
+    """
+    if "block_number" not in transactions.column_names or "number" not in blocks.column_names:
+        return transactions
+    blocks = blocks.rename_columns(["block_number" if c == "number" else c for c in blocks.column_names])
+    return left_join(transactions, blocks, ["block_number"], right_suffix="_block")
+
+
+def join_logs_arrow(
+    decoded_logs: pa.Table,
+    logs: pa.Table,
+    txs_blocks: pa.Table,
+    tx_data: bool,
+    columns: List[str],
+    tx_columns: List[str],
+) -> Optional[pa.Table]:
+    """
+    Join decoded logs to the position of their log and their transaction and block columns, matching
+    `Hypersync.join_logs`.
+
+    Args:
+        decoded_logs (pa.Table): The decoded logs, row aligned with `logs`.
+        logs (pa.Table): The raw logs.
+        txs_blocks (pa.Table): The transactions joined to their blocks.
+        tx_data (bool): Whether to include transaction data in the result.
+        columns (List[str]): The transaction and block columns to return.
+        tx_columns (List[str]): The transaction and block columns to return when there are no logs.
+
+    Returns:
+        Optional[pa.Table]: The joined data, the transactions and blocks if there are no logs, or None if everything
+            is empty.
+    """
+    if decoded_logs.num_rows == 0 or logs.num_rows == 0:
+        if txs_blocks.num_rows == 0:
+            return None
+        return txs_blocks.select(select_arrow_columns(txs_blocks, tx_columns))
+
+    # Appending the log position columns shares their buffers instead of copying them
+    for name in ("transaction_hash", "block_number", "log_index"):
+        if name in logs.column_names:
+            decoded_logs = decoded_logs.append_column(
+                "hash" if name == "transaction_hash" else name, logs[name]
+            )
+
+    if not tx_data:
+        return decoded_logs.drop_columns([c for c in ("hash",) if c in decoded_logs.column_names])
+    if "hash" not in txs_blocks.column_names:
+        return decoded_logs
+
+    return left_join(
+        decoded_logs,
+        txs_blocks.select(select_arrow_columns(txs_blocks, columns)),
+        ["hash", "block_number"],
+    )
@@ -0,0 +1,264 @@
+import math
+import os
+import polars as pl
+import pyarrow as pa
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# Schema of the index, one row per block in block order
+INDEX_SCHEMA = {
+    "number": pl.UInt64,
+    "timestamp": pl.UInt64,
+    "base_fee_per_gas": pl.Decimal(38, 0),
+    "gas_used": pl.UInt64,
+}
+
+# The result columns served by the index, named as in the transaction to block join, with their index column
+INDEXED_COLUMNS = {
+    "timestamp": "timestamp",
+    "base_fee_per_gas": "base_fee_per_gas",
+    "gas_used_block": "gas_used",
+}
+
+# The number of segment files kept before `save` compacts them into one
+MAX_SEGMENTS = 32
+
+
+def to_timestamp(value: int | float | datetime) -> int:
+    """Convert a Unix timestamp in seconds or a datetime to whole seconds, rounding up."""
+    return math.ceil(value.timestamp() if isinstance(value, datetime) else value)
+
+
+def segment_range(name: str) -> Optional[tuple[int, int]]:
+    """The [start, end) block range of a segment file name, or None for other files."""
+    stem, ext = os.path.splitext(name)
+    start, _, end = stem.partition("-")
+    if ext != ".arrow" or not start.isdigit() or not end.isdigit():
+        return None
+    return int(start), int(end)
+
+
+@dataclass
+class BlockIndex:
+    """
+    The number, timestamp, base fee and gas used of a contiguous range of blocks, kept locally across queries.
+
+    Blocks are stored in order without gaps, so the row of a block is its number minus `first_block`, and the block
+    columns of many transactions are gathered by position in one vectorized lookup. Timestamps never decrease, so the
+    block at a time is found by binary search.
+
+    The index is persisted as Arrow IPC segment files in a directory, each holding the blocks added by one `save`.
+    Segments are memory-mapped on load, so opening a large index doesn't read it into memory.
+
+    Attributes:
+        path (Optional[str]): The directory persisting the index, optional. Loaded on creation if it exists.
+    """
+
+    path: Optional[str] = None
+    _first_block: int = field(default=0, init=False, repr=False)
+    _segments: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _pending: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _frame: Optional[pl.DataFrame] = field(default=None, init=False, repr=False)
+    _saved_block: Optional[int] = field(default=None, init=False, repr=False)
+    _rewrite: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self):
+        """Memory-map the persisted segments, if any."""
+        if not self.path or not os.path.isdir(self.path):
+            return
+        ranges = sorted(
+            (r for r in map(segment_range, os.listdir(self.path)) if r is not None),
+            key=lambda r: (r[0], -r[1]),
+        )
+        for start, end in ranges:
+            # Only load a contiguous chain of segments. Others are left over from an interrupted compaction
+            if self._saved_block is not None and start != self._saved_block:
+                continue
+            source = pa.memory_map(os.path.join(self.path, f"{start:012d}-{end:012d}.arrow"))
+            self._segments.append(pl.from_arrow(pa.ipc.open_file(source).read_all(), rechunk=False))
+            if self._saved_block is None:
+                self._first_block = start
+            self._saved_block = end
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        """Every indexed block in `INDEX_SCHEMA`, in block order."""
+        if self._frame is None:
+            frames = self._segments + self._pending
+            self._frame = pl.concat(frames, rechunk=False) if frames else pl.DataFrame(schema=INDEX_SCHEMA)
+        return self._frame
+
+    @property
+    def first_block(self) -> int:
+        """The first indexed block."""
+        return self._first_block
+
+    @property
+    def next_block(self) -> int:
+        """The first block after the index."""
+        return self._first_block + len(self)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """The timestamp of the last indexed block, or None if the index is empty."""
+        return self.frame["timestamp"][-1] if len(self) else None
+
+    def ingest(self, blocks: pl.DataFrame | pa.Table) -> int:
+        """
+        Append blocks to the index.
+
+        Args:
+            blocks (pl.DataFrame | pa.Table): Blocks with the `INDEX_SCHEMA` columns, e.g. the result of
+                `Hypersync.get_blocks`. Blocks below the index's next block are skipped, the rest must follow it
+                without gaps. An empty index starts at the first block.
+
+        Returns:
+            int: The number of appended blocks.
+
+        Raises:
+            ValueError: If the blocks leave a gap.
+        """
+        if isinstance(blocks, pa.Table):
+            blocks = pl.from_arrow(blocks)
+        new = blocks.select(pl.col(name).cast(dtype) for name, dtype in INDEX_SCHEMA.items())
+        if len(self):
+            new = new.filter(pl.col("number") >= self.next_block)
+        new = new.sort("number")
+        if new.is_empty():
+            return 0
+
+        start = self.next_block if len(self) else new["number"][0]
+        expected = pl.int_range(start, start + new.height, dtype=pl.UInt64, eager=True)
+        if not (new["number"] == expected).all():
+            raise ValueError(f"Blocks must follow block {start - 1} without gaps")
+        if not len(self):
+            self._first_block = start
+        self._pending.append(new)
+        self._frame = None
+        return new.height
+
+    def rollback(self, block_number: int) -> None:
+        """
+        Drop every block at or above a block, e.g. after a reorg, so the blocks can be ingested again.
+
+        Args:
+            block_number (int): The first block to drop.
+        """
+        if block_number >= self.next_block:
+            return
+        kept = self.frame.head(max(0, block_number - self._first_block))
+        self._segments, self._pending, self._frame = [], [kept] if not kept.is_empty() else [], None
+        if self._saved_block is not None and block_number < self._saved_block:
+            # The persisted segments past the block are rewritten on the next save
+            self._rewrite = True
+
+    def covers(self, from_block: int, to_block: int) -> bool:
+        """Whether every block of the range [from_block, to_block) is indexed."""
+        return len(self) > 0 and self._first_block <= from_block and to_block <= self.next_block
+
+    def lookup(self, block_numbers: pl.Series) -> pl.DataFrame:
+        """
+        Gather the indexed rows of blocks by position.
+
+        Args:
+            block_numbers (pl.Series): The block numbers.
+
+        Returns:
+            pl.DataFrame: The row of each block in `INDEX_SCHEMA`, in order, null for blocks outside the index.
+        """
+        position = block_numbers.cast(pl.Int64) - self._first_block
+        in_range = position.is_between(0, len(self) - 1)
+        return self.frame.select(pl.all().gather(pl.select(pl.when(in_range).then(position)).to_series()))
+
+    def join(
+        self, df: pl.DataFrame | pl.LazyFrame | pa.Table, block_column: str = "block_number"
+    ) -> pl.DataFrame | pl.LazyFrame | pa.Table:
+        """
+        Attach the block columns of `INDEXED_COLUMNS` that a result doesn't have yet.
+
+        Args:
+            df (pl.DataFrame | pl.LazyFrame | pa.Table): The result, with a block number column.
+            block_column (str): The name of the block number column.
+
+        Returns:
+            pl.DataFrame | pl.LazyFrame | pa.Table: The result with the block columns, null for blocks outside the
+                index. Results without the block column, or with every block column, are returned as is.
+        """
+        names = df.column_names if isinstance(df, pa.Table) else df.collect_schema().names()
+        missing = {name: column for name, column in INDEXED_COLUMNS.items() if name not in names}
+        if not missing or block_column not in names or not len(self):
+            return df
+        columns = [pl.col(column).alias(name) for name, column in missing.items()]
+
+        if isinstance(df, pl.LazyFrame):
+            blocks = self.frame.lazy().select(
+                pl.col("number").cast(df.collect_schema()[block_column]).alias(block_column), *columns
+            )
+            return df.join(blocks, on=block_column, how="left", maintain_order="left")
+        if isinstance(df, pa.Table):
+            found = self.lookup(pl.from_arrow(df[block_column])).select(columns)
+            for name in found.columns:
+                df = df.append_column(name, found[name].to_arrow())
+            return df
+        return df.hstack(self.lookup(df[block_column]).select(columns))
+
+    def block_at_time(self, timestamp: int | datetime) -> int:
+        """
+        Find the first block at or after a time by binary search.
+
+        Args:
+            timestamp (int | datetime): The time, as a Unix timestamp in seconds or a datetime.
+
+        Returns:
+            int: The first indexed block with a timestamp at or after the time, or the index's next block if there is
+                none.
+
+        Raises:
+            ValueError: If the index is empty, or the time is before its first block and the index doesn't start at
+                genesis, so earlier blocks could match.
+        """
+        if not len(self):
+            raise ValueError("Block index is empty")
+        timestamps = self.frame["timestamp"]
+        timestamp = to_timestamp(timestamp)
+        if timestamp < timestamps[0] and self._first_block > 0:
+            raise ValueError(f"Time {timestamp} is before the first indexed block {self._first_block}")
+        return self._first_block + timestamps.search_sorted(timestamp, side="left")
+
+    def save(self) -> None:
+        """
+        Persist the blocks added since the last save to `path` as a new segment.
+
+        After a rollback into the persisted blocks, or once there are `MAX_SEGMENTS` segments, the index is rewritten
+        as a single segment instead. Segments are written atomically, so an interrupted save leaves the previous state.
+
+        Raises:
+            ValueError: If the index has no path.
+        """
+        if not self.path:
+            raise ValueError("Block index has no path to save to")
+        os.makedirs(self.path, exist_ok=True)
+        existing = [name for name in os.listdir(self.path) if segment_range(name) is not None]
+        if self._saved_block is None or self._rewrite or len(existing) >= MAX_SEGMENTS:
+            saved_block = self._first_block
+        else:
+            saved_block, existing = self._saved_block, []
+        if self.next_block > saved_block:
+            name = f"{saved_block:012d}-{self.next_block:012d}.arrow"
+            table = self.frame.slice(saved_block - self._first_block).to_arrow()
+            tmp_path = os.path.join(self.path, f"{name}.tmp")
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, os.path.join(self.path, name))
+            existing = [n for n in existing if n != name]
+        # Remove the segments replaced by a rewrite
+        for name in existing:
+            os.remove(os.path.join(self.path, name))
+        self._saved_block = self.next_block if len(self) else None
+        self._rewrite = False
+
+    def __len__(self) -> int:
+        return sum(frame.height for frame in self._segments + self._pending)
@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import hypersync
+import json
+import os
+import weakref
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Callable, Awaitable
+from mev_commit_sdk_py.instrumentation import count
+
+
+def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """
+    Merge overlapping or adjacent half-open block ranges.
+
+    Args:
+        ranges (List[List[int]]): The [from_block, to_block) ranges to merge.
+
+    Returns:
+        List[List[int]]: The merged ranges, sorted by start block.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def mapping_fingerprint(column_mapping: Optional[hypersync.ColumnMapping]) -> Optional[dict]:
+    """
+    Describe a column mapping independently of the order its fields were added in.
+
+    Args:
+        column_mapping (Optional[hypersync.ColumnMapping]): The column mapping, optional.
+
+    Returns:
+        Optional[dict]: The sorted (field, type) pairs of each mapped table, or None without a mapping.
+    """
+    if column_mapping is None:
+        return None
+    return {
+        table: sorted([getattr(name, "value", name), getattr(dtype, "value", dtype)] for name, dtype in fields.items())
+        for table, fields in vars(column_mapping).items()
+        if fields
+    }
+
+
+@dataclass
+class EventCache:
+    """
+    An incremental on-disk cache of event query results.
+
+    Results are stored per cache key (event name, signature, column mapping, contract, address filter and projection)
+    as Parquet partitions, one per fetched block range, alongside a manifest of the block ranges they cover. Only
+    blocks at least `reorg_depth` blocks behind the chain tip are cached, so the most recent blocks are always fetched
+    again and a reorg can never leave stale rows behind.
+
+    Attributes:
+        path (str): The directory holding the cache.
+        reorg_depth (int): The number of most recent blocks that are never cached.
+    """
+
+    path: str
+    reorg_depth: int = 64
+    _locks: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary, init=False, repr=False)
+
+    def key(
+        self,
+        event_name: str,
+        contract: str,
+        address: Optional[str] = None,
+        tx_data: bool = True,
+        columns: Optional[List[str]] = None,
+        signature: Optional[str] = None,
+        column_mapping: Optional[hypersync.ColumnMapping] = None,
+    ) -> str:
+        """
+        Build the cache key of an event query.
+
+        Args:
+            event_name (str): The name of the event.
+            contract (str): The contract address emitting the event.
+            address (Optional[str]): The address filter of the query, optional.
+            tx_data (bool): Whether the results include transaction data.
+            columns (Optional[List[str]]): The transaction and block columns of the results, optional.
+            signature (Optional[str]): The event signature the logs are decoded with, optional.
+            column_mapping (Optional[hypersync.ColumnMapping]): The column mapping applied to the results, optional.
+
+        Returns:
+            str: The cache key, also the relative directory of the cached partitions.
+        """
+        fingerprint = json.dumps([
+            contract.lower(),
+            address.lower() if address else None,
+            tx_data,
+            columns if tx_data else None,
+            signature,
+            mapping_fingerprint(column_mapping),
+        ])
+        return os.path.join(event_name, hashlib.sha1(fingerprint.encode()).hexdigest()[:16])
+
+    def manifest_lock(self) -> asyncio.Lock:
+        """
+        The lock serializing manifest writes of the running event loop.
+
+        Locks are bound to the loop they are first awaited in, so each loop gets its own, e.g. across `asyncio.run`
+        calls.
+
+        Returns:
+            asyncio.Lock: The lock of the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+        return self._locks[loop]
+
+    def load_manifest(self, key: str) -> dict:
+        """
+        Load the manifest of a cache key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict: The manifest, with the cached "partitions" and the "ranges" they cover.
+        """
+        manifest_path = os.path.join(self.path, key, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return {"partitions": [], "ranges": []}
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def save_manifest(self, key: str, manifest: dict):
+        """
+        Atomically write the manifest of a cache key.
+
+        Args:
+            key (str): The cache key.
+            manifest (dict): The manifest to write.
+        """
+        manifest_path = os.path.join(self.path, key, "manifest.json")
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def missing_ranges(self, key: str, from_block: int, to_block: int) -> List[List[int]]:
+        """
+        Find the parts of a block range that are not cached yet.
+
+        Args:
+            key (str): The cache key.
+            from_block (int): The first block of the range.
+            to_block (int): The end of the range, exclusive.
+
+        Returns:
+            List[List[int]]: The uncovered [from_block, to_block) ranges.
+        """
+        gaps, cursor = [], from_block
+        for start, end in self.load_manifest(key)["ranges"]:
+            if end <= cursor or start >= to_block:
+                continue
+            if start > cursor:
+                gaps.append([cursor, start])
+            cursor = max(cursor, end)
+        if cursor < to_block:
+            gaps.append([cursor, to_block])
+        return gaps
+
+    def write(self, key: str, from_block: int, to_block: int, df: Optional[pl.DataFrame]):
+        """
+        Store the results of a fetched block range and mark the range as covered.
+
+        Only the parts of the range that are not cached yet are stored, so a range fetched by overlapping queries is
+        never stored twice.
+
+        Args:
+            key (str): The cache key.
+            from_block (int): The first block of the fetched range.
+            to_block (int): The end of the fetched range, exclusive.
+            df (Optional[pl.DataFrame]): The results of the range, or None if it had no data.
+        """
+        os.makedirs(os.path.join(self.path, key), exist_ok=True)
+        manifest = self.load_manifest(key)
+
+        for start, end in self.missing_ranges(key, from_block, to_block):
+            file_name = None
+            if df is not None:
+                part = df.filter(pl.col("block_number").is_between(start, end, closed="left"))
+                if not part.is_empty():
+                    file_name = f"{start:012d}_{end:012d}.parquet"
+                    part.write_parquet(os.path.join(self.path, key, file_name))
+            manifest["partitions"].append({"from_block": start, "to_block": end, "file": file_name})
+
+        manifest["ranges"] = merge_ranges(manifest["ranges"] + [[from_block, to_block]])
+        self.save_manifest(key, manifest)
+
+    def read(self, key: str, from_block: int, to_block: int) -> Optional[pl.DataFrame]:
+        """
+        Read the cached results of a block range.
+
+        Args:
+            key (str): The cache key.
+            from_block (int): The first block of the range.
+            to_block (int): The end of the range, exclusive.
+
+        Returns:
+            Optional[pl.DataFrame]: The cached rows within the range, or None if there are none.
+        """
+        frames = [
+            pl.scan_parquet(os.path.join(self.path, key, partition["file"]))
+            for partition in self.load_manifest(key)["partitions"]
+            if partition["file"]
+            and partition["from_block"] < to_block
+            and partition["to_block"] > from_block
+        ]
+        if not frames:
+            return None
+        return (
+            pl.concat(frames, how="diagonal_relaxed")
+            .filter(pl.col("block_number").is_between(from_block, to_block, closed="left"))
+            .collect()
+        )
+
+    def invalidate(self, key: str, from_block: int):
+        """
+        Drop every cached block from `from_block` onwards, e.g. after a reorg deeper than `reorg_depth`.
+
+        Args:
+            key (str): The cache key.
+            from_block (int): The first block to drop.
+        """
+        manifest = self.load_manifest(key)
+        partitions = []
+        for partition in manifest["partitions"]:
+            if partition["to_block"] <= from_block:
+                partitions.append(partition)
+                continue
+            if partition["file"]:
+                file_path = os.path.join(self.path, key, partition["file"])
+                if partition["from_block"] < from_block:
+                    # Keep the part of the partition below the invalidated blocks
+                    df = pl.read_parquet(file_path).filter(pl.col("block_number") < from_block)
+                    os.remove(file_path)
+                    partition = {**partition, "to_block": from_block, "file": None}
+                    if not df.is_empty():
+                        partition["file"] = f"{partition['from_block']:012d}_{from_block:012d}.parquet"
+                        df.write_parquet(os.path.join(self.path, key, partition["file"]))
+                    partitions.append(partition)
+                else:
+                    os.remove(file_path)
+            elif partition["from_block"] < from_block:
+                partitions.append({**partition, "to_block": from_block})
+
+        manifest["partitions"] = partitions
+        manifest["ranges"] = merge_ranges(
+            [[p["from_block"], p["to_block"]] for p in partitions]
+        )
+        self.save_manifest(key, manifest)
+
+    async def fetch(
+        self,
+        key: str,
+        from_block: int,
+        to_block: int,
+        height: int,
+        fetch: Callable[[int, int], Awaitable[Optional[pl.DataFrame]]],
+        max_concurrency: int = 4,
+    ) -> Optional[pl.DataFrame]:
+        """
+        Fetch a block range, downloading only the parts that are not cached yet.
+
+        Uncovered ranges below `height - reorg_depth` are fetched and cached. Blocks closer to the tip are fetched on
+        every call and never cached. The uncovered ranges are fetched concurrently, and their partitions are written
+        in a worker thread one at a time, so concurrent fetches of overlapping ranges can't lose a manifest update.
+
+        Args:
+            key (str): The cache key.
+            from_block (int): The first block of the range.
+            to_block (int): The end of the range, exclusive.
+            height (int): The current chain height.
+            fetch (Callable[[int, int], Awaitable[Optional[pl.DataFrame]]]): Fetches the data of a start and exclusive
+                end block.
+            max_concurrency (int): The maximum number of uncovered ranges fetched at once.
+
+        Returns:
+            Optional[pl.DataFrame]: The cached and fetched rows of the range ordered by block, or None if there are none.
+        """
+        finalized_block = height - self.reorg_depth
+        missing_ranges = self.missing_ranges(key, from_block, to_block)
+        missing_blocks = sum(end - start for start, end in missing_ranges)
+        count("cache_miss_blocks", missing_blocks)
+        count("cache_hit_blocks", to_block - from_block - missing_blocks)
+
+        # Split the uncovered ranges at the finalized block, caching only the parts below it
+        gaps = []
+        for start, end in missing_ranges:
+            if start < finalized_block:
+                gaps.append((start, min(end, finalized_block), True))
+            if max(start, finalized_block) < end:
+                gaps.append((max(start, finalized_block), end, False))
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_gap(start: int, end: int, cached: bool) -> Optional[pl.DataFrame]:
+            async with semaphore:
+                df = await fetch(start, end)
+            if cached:
+                async with self.manifest_lock():
+                    await asyncio.to_thread(self.write, key, start, end, df)
+                return None
+            return df
+
+        fresh = await asyncio.gather(*(fetch_gap(*gap) for gap in gaps))
+        frames = [self.read(key, from_block, to_block)] + list(fresh)
+        frames = [df for df in frames if df is not None and not df.is_empty()]
+        if not frames:
+            return None
+        sort_columns = [c for c in ("block_number", "log_index") if c in frames[0].columns]
+        return pl.concat(frames, how="diagonal_relaxed").sort(sort_columns)
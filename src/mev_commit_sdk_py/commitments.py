@@ -0,0 +1,354 @@
+import os
+import pyarrow.parquet as pq
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+# The events of the commitment lifecycle, in the order they are applied within a log position tie
+COMMITMENT_EVENTS = ("UnopenedCommitmentStored", "OpenedCommitmentStored", "CommitmentProcessed")
+
+# Parameters set by each lifecycle event. The commitment signature and dispatch timestamp of an opened commitment are
+# only taken when its unopened commitment wasn't seen
+UNOPENED_FIELDS = ("committer", "commitmentDigest", "commitmentSignature", "dispatchTimestamp")
+OPENED_FIELDS = (
+    "bidder",
+    "commiter",
+    "bid",
+    "blockNumber",
+    "bidHash",
+    "decayStartTimeStamp",
+    "decayEndTimeStamp",
+    "txnHash",
+    "revertingTxHashes",
+    "commitmentHash",
+    "bidSignature",
+    "sharedSecretKey",
+)
+SHARED_FIELDS = ("commitmentSignature", "dispatchTimestamp")
+
+# Schema of the book, one row per commitment in the order they were first seen
+COMMITMENT_SCHEMA = {
+    "commitmentIndex": pl.String,
+    "status": pl.String,
+    "stored_block": pl.UInt64,
+    "opened_block": pl.UInt64,
+    "processed_block": pl.UInt64,
+    "isSlash": pl.Boolean,
+    "committer": pl.String,
+    "commitmentDigest": pl.String,
+    "commitmentSignature": pl.String,
+    "dispatchTimestamp": pl.UInt64,
+    "bidder": pl.String,
+    "commiter": pl.String,
+    "bid": pl.Decimal(38, 0),
+    "blockNumber": pl.UInt64,
+    "bidHash": pl.String,
+    "decayStartTimeStamp": pl.UInt64,
+    "decayEndTimeStamp": pl.UInt64,
+    "txnHash": pl.String,
+    "revertingTxHashes": pl.String,
+    "commitmentHash": pl.String,
+    "bidSignature": pl.String,
+    "sharedSecretKey": pl.String,
+}
+
+
+# The status of a row from its lifecycle blocks
+STATUS = (
+    pl.when(pl.col("processed_block").is_not_null())
+    .then(pl.when(pl.col("isSlash")).then(pl.lit("slashed")).otherwise(pl.lit("processed")))
+    .when(pl.col("opened_block").is_not_null())
+    .then(pl.lit("opened"))
+    .otherwise(pl.lit("unopened"))
+    .alias("status")
+)
+
+
+def event_column(df: pl.DataFrame, name: str) -> pl.Expr:
+    """An event parameter cast to its book type, null if the event doesn't have it."""
+    dtype = COMMITMENT_SCHEMA[name]
+    return pl.col(name).cast(dtype) if name in df.columns else pl.lit(None, dtype).alias(name)
+
+
+def reduce_events(logs: pl.DataFrame) -> pl.DataFrame:
+    """
+    Reduce ordered lifecycle events to one row per commitment, in the order commitments are first seen.
+
+    Each commitment gets the block of its first event, the first non-null value of each unopened field, the first
+    opening and the first processing. Columns taken from events are prefixed with "new_".
+    """
+    unopened, opened, processed = (pl.col("order") == order for order in range(len(COMMITMENT_EVENTS)))
+    return logs.group_by("commitmentIndex", maintain_order=True).agg(
+        pl.col("block_number").first().alias("new_stored_block"),
+        (pl.col("order").first() == 1).alias("new_opened_first"),
+        *(pl.col(name).filter(unopened).drop_nulls().first().alias(f"new_unopened_{name}") for name in UNOPENED_FIELDS),
+        pl.col("block_number").filter(opened).first().alias("new_opened_block"),
+        *(pl.col(name).filter(opened).first().alias(f"new_{name}") for name in OPENED_FIELDS),
+        *(pl.col(name).filter(opened).first().alias(f"new_opened_{name}") for name in SHARED_FIELDS),
+        pl.col("block_number").filter(processed).first().alias("new_processed_block"),
+        pl.col("isSlash").filter(processed).first().alias("new_isSlash"),
+    )
+
+
+@dataclass
+class CommitmentBook:
+    """
+    The lifecycle of every commitment, maintained incrementally from commitment events.
+
+    Each commitment is one row keyed by its commitmentIndex, moving from "unopened" to "opened" to "processed" or
+    "slashed". The book is a Polars frame: each ingest reduces its events to one row per commitment with a group by,
+    updates the commitments already in the book with a left join on commitmentIndex and appends the new ones. A
+    dictionary of row positions serves point lookups. Commitments are appended in block order, so "open at block N"
+    queries binary search the stored blocks.
+
+    Events must be ingested in block order. Events below `next_block` are skipped as already ingested, so overlapping
+    refreshes are harmless. Commitments first seen opened or processed, e.g. when starting mid-history, are stored at
+    that block.
+
+    Attributes:
+        path (Optional[str]): The Parquet file persisting the book, optional. Loaded on creation if it exists.
+        next_block (int): The first block not ingested yet.
+    """
+
+    path: Optional[str] = None
+    next_block: int = 0
+    _frame: pl.DataFrame = field(init=False, repr=False)
+    _positions: dict[str, int] = field(init=False, repr=False)
+    _processed_blocks: pl.Series = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the persisted book, if any."""
+        if self.path and os.path.exists(self.path):
+            table = pq.read_table(self.path)
+            self.next_block = int(table.schema.metadata[b"next_block"])
+            self.load_frame(pl.from_arrow(table))
+        else:
+            self.load_frame(pl.DataFrame(schema=COMMITMENT_SCHEMA))
+
+    def load_frame(self, frame: pl.DataFrame) -> None:
+        """Replace the state with the rows of a frame in `COMMITMENT_SCHEMA`, in stored block order."""
+        self._frame = frame.select(pl.col(name).cast(dtype) for name, dtype in COMMITMENT_SCHEMA.items())
+        self._positions = dict(zip(self._frame["commitmentIndex"].to_list(), range(self._frame.height)))
+        self._processed_blocks = self._frame["processed_block"].drop_nulls().sort()
+
+    def ingest(self, events: dict[str, Optional[pl.DataFrame]], next_block: Optional[int] = None) -> int:
+        """
+        Apply new commitment events to the book.
+
+        Args:
+            events (dict[str, Optional[pl.DataFrame]]): The rows of each event, e.g. the result of
+                `Hypersync.execute_events_query` or the events of a subscription update. Rows need the event
+                parameters and "block_number", and are ordered by "log_index" if present. Other events are ignored.
+            next_block (Optional[int]): The first block not covered by the events, optional. Defaults to the block
+                after the last event.
+
+        Returns:
+            int: The number of applied events.
+        """
+        frames = []
+        for order, event_name in enumerate(COMMITMENT_EVENTS):
+            df = events.get(event_name)
+            if df is None or df.is_empty():
+                continue
+            df = df.filter(pl.col("block_number") >= self.next_block)
+            frames.append(df.select(
+                pl.col("commitmentIndex").str.to_lowercase(),
+                pl.col("block_number").cast(pl.UInt64),
+                (pl.col("log_index") if "log_index" in df.columns else pl.lit(0)).cast(pl.UInt64).alias("log_index"),
+                pl.lit(order, pl.UInt8).alias("order"),
+                *(event_column(df, name) for name in (*UNOPENED_FIELDS, *OPENED_FIELDS, "isSlash")),
+            ))
+        logs = pl.concat(frames).sort("block_number", "log_index", "order") if frames else pl.DataFrame()
+
+        if not logs.is_empty():
+            self.merge(reduce_events(logs))
+            self.next_block = max(self.next_block, logs["block_number"][-1] + 1)
+        if next_block is not None:
+            self.next_block = max(self.next_block, next_block)
+        return logs.height
+
+    def merge(self, batch: pl.DataFrame) -> None:
+        """
+        Move the commitments of a batch of `reduce_events` along their lifecycle.
+
+        Commitments already in the book take the unopened fields they lack and their first opening and processing if
+        they weren't opened or processed yet. New commitments are appended with the fields of their events, and take
+        the shared fields of their opening only if it was their first event.
+        """
+        opened_now = pl.col("opened_block").is_null() & pl.col("new_opened_block").is_not_null()
+        processed_now = pl.col("processed_block").is_null() & pl.col("new_processed_block").is_not_null()
+        updated = (
+            self._frame.with_row_index("position")
+            .join(batch, on="commitmentIndex", how="left")
+            .sort("position")
+            .with_columns(
+                *(pl.coalesce(name, f"new_unopened_{name}").alias(name) for name in UNOPENED_FIELDS),
+                *(pl.when(opened_now).then(pl.col(f"new_{name}")).otherwise(pl.col(name)).alias(name)
+                  for name in ("opened_block", *OPENED_FIELDS)),
+                *(pl.when(processed_now).then(pl.col(f"new_{name}")).otherwise(pl.col(name)).alias(name)
+                  for name in ("processed_block", "isSlash")),
+            )
+            .with_columns(STATUS)
+            .select(*COMMITMENT_SCHEMA)
+        )
+
+        def shared(name: str) -> pl.Expr:
+            unopened = pl.col(f"new_unopened_{name}")
+            return pl.when("new_opened_first").then(pl.coalesce(f"new_opened_{name}", unopened)).otherwise(unopened)
+
+        added = (
+            batch.filter(~pl.col("commitmentIndex").is_in(self._frame["commitmentIndex"].implode()))
+            .select(
+                "commitmentIndex",
+                *(pl.col(f"new_{name}").alias(name)
+                  for name in ("stored_block", "opened_block", "processed_block", "isSlash", *OPENED_FIELDS)),
+                *((shared(name) if name in SHARED_FIELDS else pl.col(f"new_unopened_{name}")).alias(name)
+                  for name in UNOPENED_FIELDS),
+            )
+            .with_columns(STATUS)
+            .select(*COMMITMENT_SCHEMA)
+        )
+
+        # Processings of a batch are at or above the book's next block, so they sort after the ones seen before
+        newly_processed = self._frame["processed_block"].is_null() & updated["processed_block"].is_not_null()
+        processed_blocks = pl.concat([updated["processed_block"].filter(newly_processed), added["processed_block"]])
+        self._processed_blocks = pl.concat([self._processed_blocks, processed_blocks.drop_nulls().sort()])
+        positions = range(updated.height, updated.height + added.height)
+        self._positions.update(zip(added["commitmentIndex"].to_list(), positions))
+        self._frame = pl.concat([updated, added])
+
+    def apply(self, update) -> int:
+        """
+        Apply an update of `Hypersync.subscribe`, rolling the book back on reorgs.
+
+        Args:
+            update (SubscriptionUpdate): The update of a subscription including the commitment events.
+
+        Returns:
+            int: The number of applied events.
+        """
+        if update.rollback_block is not None:
+            self.rollback(update.rollback_block)
+            return 0
+        return self.ingest(update.events, update.next_block)
+
+    def rollback(self, block_number: int) -> None:
+        """
+        Undo every event at or above a block, e.g. after a reorg, so the blocks can be ingested again.
+
+        Args:
+            block_number (int): The first block to undo.
+        """
+        frame = self.frame.filter(pl.col("stored_block") < block_number)
+        opened_undone = pl.col("opened_block") >= block_number
+        processed_undone = pl.col("processed_block") >= block_number
+        frame = frame.with_columns(
+            *(pl.when(opened_undone).then(None).otherwise(pl.col(name)).alias(name) for name in OPENED_FIELDS),
+            pl.when(processed_undone).then(None).otherwise(pl.col("isSlash")).alias("isSlash"),
+        ).with_columns(
+            pl.when(opened_undone).then(None).otherwise(pl.col("opened_block")).alias("opened_block"),
+            pl.when(processed_undone).then(None).otherwise(pl.col("processed_block")).alias("processed_block"),
+        ).with_columns(STATUS)
+        self.load_frame(frame)
+        self.next_block = min(self.next_block, block_number)
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        """Every commitment in `COMMITMENT_SCHEMA`, in stored block order."""
+        return self._frame
+
+    def get(self, commitment_index: str) -> Optional[dict]:
+        """
+        Look up a commitment.
+
+        Args:
+            commitment_index (str): The prefixed hex commitmentIndex.
+
+        Returns:
+            Optional[dict]: The row of the commitment, or None if it wasn't seen.
+        """
+        position = self._positions.get(commitment_index.lower())
+        if position is None:
+            return None
+        return self._frame.row(position, named=True)
+
+    def status_at(self, commitment_index: str, block_number: int) -> Optional[str]:
+        """
+        Look up the status of a commitment as of a block.
+
+        Args:
+            commitment_index (str): The prefixed hex commitmentIndex.
+            block_number (int): The block, inclusive.
+
+        Returns:
+            Optional[str]: "unopened", "opened", "processed" or "slashed", or None if the commitment wasn't stored yet.
+        """
+        commitment = self.get(commitment_index)
+        if commitment is None or commitment["stored_block"] > block_number:
+            return None
+        if commitment["processed_block"] is not None and commitment["processed_block"] <= block_number:
+            return commitment["status"]
+        if commitment["opened_block"] is not None and commitment["opened_block"] <= block_number:
+            return "opened"
+        return "unopened"
+
+    def open_count(self, block_number: int) -> int:
+        """
+        Count the commitments stored but not processed as of a block, in O(log n).
+
+        Args:
+            block_number (int): The block, inclusive.
+
+        Returns:
+            int: The number of open commitments.
+        """
+        stored = self._frame["stored_block"].search_sorted(block_number, side="right")
+        return stored - self._processed_blocks.search_sorted(block_number, side="right")
+
+    def open_at(self, block_number: int) -> pl.DataFrame:
+        """
+        List the commitments stored but not processed as of a block.
+
+        Only the commitments stored up to the block, found by binary search, are filtered.
+
+        Args:
+            block_number (int): The block, inclusive.
+
+        Returns:
+            pl.DataFrame: The open commitments in `COMMITMENT_SCHEMA`, with "status" as of the block.
+        """
+        stored = self._frame["stored_block"].search_sorted(block_number, side="right")
+        return (
+            self._frame.head(stored)
+            .filter(pl.col("processed_block").is_null() | (pl.col("processed_block") > block_number))
+            .with_columns(
+                status=pl.when(pl.col("opened_block") <= block_number)
+                .then(pl.lit("opened"))
+                .otherwise(pl.lit("unopened"))
+            )
+        )
+
+    def save(self) -> None:
+        """
+        Persist the book and its next block to `path`, atomically replacing the previous file.
+
+        Raises:
+            ValueError: If the book has no path.
+        """
+        if not self.path:
+            raise ValueError("Commitment book has no path to save to")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = self.frame.to_arrow()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), "next_block": str(self.next_block)})
+        tmp_path = f"{self.path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, commitment_index: str) -> bool:
+        return commitment_index.lower() in self._positions
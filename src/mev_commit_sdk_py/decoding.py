@@ -0,0 +1,203 @@
+import re
+import polars as pl
+
+from typing import List, Optional, NamedTuple
+from hypersync import DataType
+
+# Number of hex characters in an ABI word
+WORD = 64
+
+# Polars types of the integer column mappings
+INTEGER_TYPES = {
+    DataType.UINT64: pl.UInt64,
+    DataType.UINT32: pl.UInt32,
+    DataType.INT64: pl.Int64,
+    DataType.INT32: pl.Int32,
+}
+
+# Polars type of the exact DECIMAL128 column mapping
+DECIMAL = pl.Decimal(38, 0)
+
+
+class EventParam(NamedTuple):
+    """A parameter of an event signature."""
+
+    type: str
+    name: str
+    indexed: bool
+
+
+def parse_event_signature(signature: str) -> List[EventParam]:
+    """
+    Parse the parameters of an event signature.
+
+    Args:
+        signature (str): The event signature, e.g. "FundsSlashed(address indexed provider, uint256 amount)".
+
+    Returns:
+        List[EventParam]: The parameters of the event in signature order.
+
+    Raises:
+        ValueError: If the signature can't be parsed.
+    """
+    match = re.fullmatch(r"\s*\w+\((.*)\)\s*", signature)
+    if not match:
+        raise ValueError(f"Invalid event signature: {signature}")
+
+    params = []
+    for param in filter(None, (p.strip() for p in match.group(1).split(","))):
+        parts = param.split()
+        if len(parts) == 3 and parts[1] == "indexed":
+            params.append(EventParam(parts[0], parts[2], True))
+        elif len(parts) == 2:
+            params.append(EventParam(parts[0], parts[1], False))
+        else:
+            raise ValueError(f"Invalid event parameter '{param}' in signature: {signature}")
+    return params
+
+
+def is_dynamic(abi_type: str) -> bool:
+    """Whether an ABI type is encoded out of place in event data."""
+    return abi_type in ("bytes", "string") or abi_type.endswith("]")
+
+
+def word_to_uint64(word: pl.Expr) -> pl.Expr:
+    """Parse the low 8 bytes of a hex ABI word as an unsigned 64 bit integer."""
+    high = word.str.slice(48, 8).str.to_integer(base=16).cast(pl.UInt64)
+    low = word.str.slice(56, 8).str.to_integer(base=16).cast(pl.UInt64)
+    return high * (1 << 32) + low
+
+
+def word_to_float64(word: pl.Expr) -> pl.Expr:
+    """Parse a hex ABI word as a (lossy) 64 bit float."""
+    value = pl.lit(0.0)
+    for i in range(0, WORD, 8):
+        value = value * float(1 << 32) + word.str.slice(i, 8).str.to_integer(base=16).cast(pl.Float64)
+    return value
+
+
+def word_to_decimal128(word: pl.Expr) -> pl.Expr:
+    """
+    Parse a hex ABI word as an exact unsigned Decimal(38, 0), matching Hypersync's DECIMAL128 mapping.
+
+    Raises an overflow error when collected if a value doesn't fit 38 digits.
+    """
+    value = pl.lit(0, dtype=DECIMAL)
+    for i in range(0, WORD, 8):
+        limb = word.str.slice(i, 8).str.to_integer(base=16).cast(DECIMAL)
+        value = value * pl.lit(1 << 32, dtype=DECIMAL) + limb
+    return value
+
+
+def binary_to_utf8(series: pl.Series, fallback: Optional[str] = None) -> pl.Series:
+    """
+    Decode a binary Series as UTF-8, with a per-value Python loop only when the vectorized cast fails.
+
+    Args:
+        series (pl.Series): The binary values.
+        fallback (Optional[str]): The encoding of values that aren't valid UTF-8, e.g. "latin-1", optional. Without
+            it, their invalid bytes are replaced, like Hypersync's decoder does.
+
+    Returns:
+        pl.Series: The strings.
+    """
+    try:
+        return series.cast(pl.String)
+    except pl.exceptions.ComputeError:
+        return pl.Series(
+            series.name,
+            [None if v is None else decode_bytes(v, fallback) for v in series],
+            dtype=pl.String,
+        )
+
+
+def decode_bytes(value: bytes, fallback: Optional[str] = None) -> str:
+    """Decode bytes as UTF-8, falling back to another encoding or replacing invalid bytes."""
+    if fallback is None:
+        return value.decode("utf-8", errors="replace")
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return value.decode(fallback)
+
+
+def decode_word(word: pl.Expr, abi_type: str, data_type: Optional[DataType] = None) -> pl.Expr:
+    """
+    Decode a static ABI value from a hex word, matching the output of Hypersync's decoder with prefixed hex output.
+
+    Args:
+        word (pl.Expr): The unprefixed 64 character hex word.
+        abi_type (str): The ABI type of the value.
+        data_type (Optional[DataType]): The column mapping of the value, optional.
+
+    Returns:
+        pl.Expr: The decoded value.
+    """
+    if abi_type == "address":
+        return "0x" + word.str.slice(24, 40)
+    if abi_type == "bool":
+        return word.str.slice(WORD - 1, 1) == "1"
+    if abi_type.startswith(("uint", "int")) and data_type is not None:
+        if data_type in INTEGER_TYPES:
+            return word_to_uint64(word).cast(INTEGER_TYPES[data_type])
+        if data_type == DataType.DECIMAL128:
+            return word_to_decimal128(word)
+        if data_type in (DataType.FLOAT64, DataType.FLOAT32):
+            return word_to_float64(word).cast(pl.Float32 if data_type == DataType.FLOAT32 else pl.Float64)
+    if abi_type.startswith("bytes") and abi_type != "bytes":
+        return "0x" + word.str.slice(0, 2 * int(abi_type.removeprefix("bytes")))
+    return "0x" + word
+
+
+def decode_logs(
+    logs_df: pl.DataFrame,
+    signature: str,
+    column_mapping: Optional[dict[str, DataType]] = None,
+    params: Optional[List[EventParam]] = None,
+) -> pl.DataFrame:
+    """
+    Decode raw logs of a single event into one column per event parameter, vectorized over the whole frame.
+
+    The logs must have prefixed hex "topic1".."topic3" and "data" columns, as returned by Hypersync with
+    `HexOutput.PREFIXED`. Indexed dynamic values (strings, bytes, arrays) are returned as their topic hash, and
+    dynamic arrays in the log data are not supported.
+
+    Args:
+        logs_df (pl.DataFrame): The raw logs, all emitted by the event of the signature.
+        signature (str): The event signature.
+        column_mapping (Optional[dict[str, DataType]]): Types to map decoded columns to, optional.
+        params (Optional[List[EventParam]]): The parsed parameters of the signature, optional. Parsed from the
+            signature when not given.
+
+    Returns:
+        pl.DataFrame: The decoded logs, one column per event parameter in signature order.
+
+    Raises:
+        ValueError: If the signature has an unsupported parameter type.
+    """
+    column_mapping = column_mapping or {}
+    data = pl.col("data").str.slice(2)
+    columns, topic, head = [], 1, 0
+    for param in params if params is not None else parse_event_signature(signature):
+        data_type = column_mapping.get(param.name)
+        if param.indexed:
+            word = pl.col(f"topic{topic}").str.slice(2)
+            topic += 1
+            value = "0x" + word if is_dynamic(param.type) else decode_word(word, param.type, data_type)
+        elif param.type in ("bytes", "string"):
+            offset = word_to_uint64(data.str.slice(head * WORD, WORD)).cast(pl.Int64) * 2
+            length = word_to_uint64(data.str.slice(offset, WORD)).cast(pl.Int64) * 2
+            content = data.str.slice(offset + WORD, length)
+            if param.type == "string":
+                value = content.str.decode("hex").map_batches(binary_to_utf8, return_dtype=pl.String)
+            else:
+                value = "0x" + content
+            head += 1
+        elif is_dynamic(param.type):
+            raise ValueError(f"Unsupported event parameter type {param.type} in signature: {signature}")
+        else:
+            value = decode_word(data.str.slice(head * WORD, WORD), param.type, data_type)
+            head += 1
+        columns.append(value.alias(param.name))
+
+    return logs_df.select(columns)
@@ -1,3 +1,7 @@
+import polars as pl
+
+from decimal import Decimal
+from mev_commit_sdk_py.decoding import binary_to_utf8
 
 
 def byte_to_string(hex_string):
@@ -12,5 +16,46 @@ def byte_to_string(hex_string):
     return human_readable_string
 
 # Convert address to topic for filtering. Padds the address with zeroes.
+# Accepts a single address, or a Polars expression to convert a whole column of addresses.
 def address_to_topic(address):
-    return "0x000000000000000000000000" + address[2:]
\ No newline at end of file
+    if isinstance(address, pl.Expr):
+        return ("0x000000000000000000000000" + address.str.strip_prefix("0x")).name.keep()
+    return "0x000000000000000000000000" + address[2:]
+
+
+# Convert a column of prefixed hex strings to raw bytes. Accepts a column name or a Polars expression.
+# Binary columns take half the memory of their hex strings, e.g. for hashes and signatures.
+def hex_to_bytes(hex_string):
+    hex_string = pl.col(hex_string) if isinstance(hex_string, str) else hex_string
+    return hex_string.str.strip_prefix("0x").str.decode("hex")
+
+
+# Convert a column of raw bytes back to prefixed hex strings. Accepts a column name or a Polars expression.
+def bytes_to_hex(data):
+    data = pl.col(data) if isinstance(data, str) else data
+    return ("0x" + data.bin.encode("hex")).name.keep()
+
+
+# Decode a column of prefixed hex strings or raw bytes to text, like byte_to_string. Falls back to latin-1 for values
+# that aren't valid UTF-8. Accepts a column name or a Polars expression.
+def bytes_to_string(data):
+    data = pl.col(data) if isinstance(data, str) else data
+    return data.map_batches(utf8_or_latin1, return_dtype=pl.String)
+
+
+# Decode a Series of bytes (or prefixed hex strings) as UTF-8, or latin-1 where it isn't valid UTF-8.
+def utf8_or_latin1(series):
+    if series.dtype == pl.String:
+        series = series.str.strip_prefix("0x").str.decode("hex")
+    return binary_to_utf8(series, fallback="latin-1")
+
+
+# Convert a column of wei amounts to ETH (or gwei, with decimals=9) as Decimal(38, decimals), without losing precision.
+# Accepts a column name or a Polars expression. The whole and fractional parts are split in Int128 and scaled
+# separately, as Decimal division would widen the scale past 38 digits.
+def wei_to_eth(wei, decimals=18):
+    wei = (pl.col(wei) if isinstance(wei, str) else wei).cast(pl.Decimal(38, 0)).cast(pl.Int128)
+    unit = 10**decimals
+    fraction = pl.lit(Decimal(1).scaleb(-decimals), pl.Decimal(38, decimals))
+    whole = (wei // unit).cast(pl.Decimal(38, decimals))
+    return (whole + (wei % unit).cast(pl.Decimal(38, 0)) * fraction).cast(pl.Decimal(38, decimals))
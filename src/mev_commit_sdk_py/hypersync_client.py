@@ -1,12 +1,55 @@
+import os
 import time
+import asyncio
+import logging
+import dataclasses
+import functools
 import hypersync
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from mev_commit_sdk_py.helpers import address_to_topic
-from typing import List, Optional, Callable, Awaitable
+from mev_commit_sdk_py.arrow import hex_to_binary, join_blocks_arrow, join_logs_arrow
+from mev_commit_sdk_py.block_index import INDEX_SCHEMA, INDEXED_COLUMNS, BlockIndex, to_timestamp
+from mev_commit_sdk_py.cache import EventCache
+from mev_commit_sdk_py.commitments import COMMITMENT_EVENTS, CommitmentBook
+from mev_commit_sdk_py.decoding import is_dynamic
+from mev_commit_sdk_py.helpers import hex_to_bytes
+from mev_commit_sdk_py.instrumentation import (
+    CURRENT_METRICS,
+    QueryMetrics,
+    count,
+    current_metrics,
+    measure,
+    notify,
+    record_range,
+    record_response,
+)
+from mev_commit_sdk_py.ledger import LEDGER_EVENTS, BidderLedger
+from mev_commit_sdk_py.pool import CLIENT_POOL, ClientPool, ClientSettings
+from mev_commit_sdk_py.providers import PROVIDER_EVENTS, ProviderState
+from mev_commit_sdk_py.registry import EventRegistry, EventSpec
+from mev_commit_sdk_py.resume import (
+    CollectedData,
+    CollectionCheckpoint,
+    RetryPolicy,
+    checkpoint_key,
+    concat_pages,
+    is_transient,
+)
+from mev_commit_sdk_py.sharding import ShardPlanner, run_sharded
+from mev_commit_sdk_py.sink import ParquetSink
+from mev_commit_sdk_py.tx_index import TxIndex, check_tx_hashes, group_block_ranges
+from mev_commit_sdk_py.validators import VALIDATOR_EVENTS, ValidatorIndex
+from typing import List, Optional, Callable, Awaitable, AsyncIterator
+from datetime import datetime
 from enum import Enum
-from hypersync import TransactionField, DataType, BlockField
+from hypersync import TransactionField, DataType, BlockField, LogField
+
+logger = logging.getLogger(__name__)
 
 
 # Contract addresses for different components of mev-commit
@@ -25,23 +68,23 @@ class Contracts(Enum):
     VALIDATOR_REGISTRY = "0x87D5F694fAD0b6C8aaBCa96277DE09451E277Bcf".lower()
 
 
-# Common transaction column mappings reused across events
+# Common transaction column mappings reused across events. Wei amounts are mapped to exact Decimal(38, 0) columns
 COMMON_TRANSACTION_MAPPING = {
     TransactionField.GAS_USED: DataType.FLOAT64,
-    TransactionField.MAX_PRIORITY_FEE_PER_GAS: DataType.FLOAT64,
-    TransactionField.MAX_FEE_PER_GAS: DataType.FLOAT64,
-    TransactionField.EFFECTIVE_GAS_PRICE: DataType.FLOAT64,
+    TransactionField.MAX_PRIORITY_FEE_PER_GAS: DataType.DECIMAL128,
+    TransactionField.MAX_FEE_PER_GAS: DataType.DECIMAL128,
+    TransactionField.EFFECTIVE_GAS_PRICE: DataType.DECIMAL128,
     TransactionField.NONCE: DataType.UINT64,
     TransactionField.CHAIN_ID: DataType.UINT64,
     TransactionField.CUMULATIVE_GAS_USED: DataType.UINT64,
-    TransactionField.VALUE: DataType.FLOAT64,
+    TransactionField.VALUE: DataType.DECIMAL128,
     TransactionField.GAS: DataType.UINT64,
-    TransactionField.GAS_PRICE: DataType.FLOAT64,
+    TransactionField.GAS_PRICE: DataType.DECIMAL128,
 }
 
 COMMMON_BLOCK_MAPPING = {
     BlockField.TIMESTAMP: DataType.UINT64,
-    BlockField.BASE_FEE_PER_GAS: DataType.FLOAT64,
+    BlockField.BASE_FEE_PER_GAS: DataType.DECIMAL128,
     BlockField.GAS_USED: DataType.UINT64,
     BlockField.NONCE: DataType.UINT64,
     BlockField.DIFFICULTY: DataType.UINT64,
@@ -51,6 +94,115 @@ COMMMON_BLOCK_MAPPING = {
     BlockField.EXCESS_BLOB_GAS: DataType.UINT64,
 }
 
+# Log fields needed to decode events and join them to their transactions
+EVENT_LOG_FIELDS = [
+    LogField.BLOCK_NUMBER,
+    LogField.TRANSACTION_HASH,
+    LogField.LOG_INDEX,
+    LogField.ADDRESS,
+    LogField.DATA,
+    LogField.TOPIC0,
+    LogField.TOPIC1,
+    LogField.TOPIC2,
+    LogField.TOPIC3,
+]
+
+# Default output columns of transaction and block queries
+TX_BLOCK_COLUMNS = [
+    "hash",
+    "block_number",
+    "to",
+    "from",
+    "nonce",
+    "type",
+    "block_hash",
+    "timestamp",
+    "base_fee_per_gas",
+    "gas_used_block",
+    "parent_beacon_block_root",
+    "max_priority_fee_per_gas",
+    "max_fee_per_gas",
+    "effective_gas_price",
+    "gas_used",
+]
+
+# Default transaction and block columns joined to event logs, overridable per event with a "columns" entry
+EVENT_TX_COLUMNS = [c for c in TX_BLOCK_COLUMNS if c != "parent_beacon_block_root"]
+
+# Columns of the commitment, bidder ledger and provider events, which only need when and by whom they were emitted
+EVENT_SLIM_COLUMNS = ["hash", "block_number", "from", "timestamp"]
+
+
+def event_tx_columns(specs: List[EventSpec]) -> List[str]:
+    """
+    Get the default transaction and block columns joined to the logs of events.
+
+    Args:
+        specs (List[EventSpec]): The queried events.
+
+    Returns:
+        List[str]: The union of the events' registered columns, or `EVENT_TX_COLUMNS` if an event has none.
+    """
+    if not specs or any(spec.columns is None for spec in specs):
+        return list(EVENT_TX_COLUMNS)
+    return list(dict.fromkeys(column for spec in specs for column in spec.columns))
+
+
+def create_field_selection(
+    columns: Optional[List[str]] = None,
+    logs: bool = False,
+    blocks_only: bool = False,
+) -> hypersync.FieldSelection:
+    """
+    Create a field selection requesting only the fields needed for the given output columns.
+
+    Column names are matched against transaction fields first, then block fields, mirroring the transaction to block
+    join where clashing block columns get a "_block" suffix (e.g. "gas_used_block"). The join keys (transaction hash,
+    block number) are always requested when transaction or block data is needed.
+
+    Args:
+        columns (Optional[List[str]]): The output columns to request. None selects every field.
+        logs (bool): Whether to request the log fields needed to decode events.
+        blocks_only (bool): Whether the columns refer to block data only, with no transaction join.
+
+    Returns:
+        hypersync.FieldSelection: The field selection for the query.
+
+    Raises:
+        ValueError: If a column is not a known transaction or block field.
+    """
+    if columns is None:
+        return hypersync.FieldSelection(
+            log=[e.value for e in LogField],
+            transaction=[e.value for e in TransactionField],
+            block=[e.value for e in BlockField],
+        )
+
+    transaction_fields = {e.value for e in TransactionField}
+    block_fields = {e.value for e in BlockField}
+    selected_transactions, selected_blocks = [], []
+    for column in columns:
+        if not blocks_only and column in transaction_fields:
+            selected_transactions.append(column)
+        elif column in block_fields:
+            selected_blocks.append(column)
+        elif column.endswith("_block") and column.removesuffix("_block") in block_fields:
+            selected_blocks.append(column.removesuffix("_block"))
+        else:
+            raise ValueError(f"Unsupported column: {column}")
+
+    if selected_transactions or (selected_blocks and not blocks_only):
+        selected_transactions += [TransactionField.HASH.value, TransactionField.BLOCK_NUMBER.value]
+    if selected_blocks:
+        selected_blocks.append(BlockField.NUMBER.value)
+
+    return hypersync.FieldSelection(
+        log=[e.value for e in EVENT_LOG_FIELDS] if logs else [],
+        transaction=list(dict.fromkeys(selected_transactions)),
+        block=list(dict.fromkeys(selected_blocks)),
+    )
+
+
 # Event configurations with event names as keys, including signatures, contracts, and optional column mappings
 EVENT_CONFIG = {
     "NewL1Block": {
@@ -63,6 +215,7 @@ EVENT_CONFIG = {
     "CommitmentProcessed": {
         "signature": "CommitmentProcessed(bytes32 indexed commitmentIndex, bool isSlash)",
         "contract": Contracts.ORACLE,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
         ),
@@ -70,9 +223,10 @@ EVENT_CONFIG = {
     "BidderRegistered": {
         "signature": "BidderRegistered(address indexed bidder, uint256 depositedAmount, uint256 windowNumber)",
         "contract": Contracts.BIDDER_REGISTER,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
-                "depositedAmount": hypersync.DataType.INT64,
+                "depositedAmount": hypersync.DataType.DECIMAL128,
                 "windowNumber": hypersync.DataType.INT64,
             },
             transaction=COMMON_TRANSACTION_MAPPING,
@@ -82,9 +236,10 @@ EVENT_CONFIG = {
     "BidderWithdrawal": {
         "signature": "BidderWithdrawal(address indexed bidder, uint256 window, uint256 amount)",
         "contract": Contracts.BIDDER_REGISTER,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
-                "amount": hypersync.DataType.INT64,
+                "amount": hypersync.DataType.DECIMAL128,
                 "window": hypersync.DataType.INT64,
             },
             transaction=COMMON_TRANSACTION_MAPPING,
@@ -94,9 +249,10 @@ EVENT_CONFIG = {
     "OpenedCommitmentStored": {
         "signature": "OpenedCommitmentStored(bytes32 indexed commitmentIndex, address bidder, address commiter, uint256 bid, uint64 blockNumber, bytes32 bidHash, uint64 decayStartTimeStamp, uint64 decayEndTimeStamp, string txnHash, string revertingTxHashes, bytes32 commitmentHash, bytes bidSignature, bytes commitmentSignature, uint64 dispatchTimestamp, bytes sharedSecretKey)",
         "contract": Contracts.COMMIT_STORE,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
-                "bid": hypersync.DataType.UINT64,
+                "bid": hypersync.DataType.DECIMAL128,
                 "blockNumber": hypersync.DataType.UINT64,
                 "decayStartTimeStamp": hypersync.DataType.UINT64,
                 "decayEndTimeStamp": hypersync.DataType.UINT64,
@@ -109,10 +265,11 @@ EVENT_CONFIG = {
     "FundsRetrieved": {
         "signature": "FundsRetrieved(bytes32 indexed commitmentDigest,address indexed bidder,uint256 window,uint256 amount)",
         "contract": Contracts.BIDDER_REGISTER,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
                 "window": hypersync.DataType.UINT64,
-                "amount": hypersync.DataType.UINT64,
+                "amount": hypersync.DataType.DECIMAL128,
             },
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
@@ -121,10 +278,11 @@ EVENT_CONFIG = {
     "FundsRewarded": {
         "signature": "FundsRewarded(bytes32 indexed commitmentDigest, address indexed bidder, address indexed provider, uint256 window, uint256 amount)",
         "contract": Contracts.BIDDER_REGISTER,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
                 "window": hypersync.DataType.UINT64,
-                "amount": hypersync.DataType.UINT64,
+                "amount": hypersync.DataType.DECIMAL128,
             },
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
@@ -133,8 +291,9 @@ EVENT_CONFIG = {
     "FundsSlashed": {
         "signature": "FundsSlashed(address indexed provider, uint256 amount)",
         "contract": Contracts.PROVIDER_REGISTRY,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -142,8 +301,9 @@ EVENT_CONFIG = {
     "FundsDeposited": {
         "signature": "FundsDeposited(address indexed provider, uint256 amount)",
         "contract": Contracts.PROVIDER_REGISTRY,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -151,8 +311,9 @@ EVENT_CONFIG = {
     "Withdraw": {
         "signature": "Withdraw(address indexed provider, uint256 amount)",
         "contract": Contracts.PROVIDER_REGISTRY,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -160,8 +321,9 @@ EVENT_CONFIG = {
     "ProviderRegistered": {
         "signature": "ProviderRegistered(address indexed provider, uint256 stakedAmount, bytes blsPublicKey)",
         "contract": Contracts.PROVIDER_REGISTRY,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"stakedAmount": hypersync.DataType.UINT64},
+            decoded_log={"stakedAmount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -169,6 +331,7 @@ EVENT_CONFIG = {
     "UnopenedCommitmentStored": {
         "signature": "UnopenedCommitmentStored(bytes32 indexed commitmentIndex,address committer,bytes32 commitmentDigest,bytes commitmentSignature,uint64 dispatchTimestamp)",
         "contract": Contracts.COMMIT_STORE,
+        "columns": EVENT_SLIM_COLUMNS,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={"dispatchTimestamp": hypersync.DataType.UINT64},
             transaction=COMMON_TRANSACTION_MAPPING,
@@ -180,7 +343,7 @@ EVENT_CONFIG = {
         "signature": "Staked(address indexed msgSender, address indexed withdrawalAddress, bytes valBLSPubKey, uint256 amount)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -190,8 +353,8 @@ EVENT_CONFIG = {
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
             decoded_log={
-                "amount": hypersync.DataType.UINT64,
-                "newBalance": hypersync.DataType.UINT64,
+                "amount": hypersync.DataType.DECIMAL128,
+                "newBalance": hypersync.DataType.DECIMAL128,
             },
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
@@ -201,7 +364,7 @@ EVENT_CONFIG = {
         "signature": "Unstaked(address indexed msgSender, address indexed withdrawalAddress, bytes valBLSPubKey, uint256 amount)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -210,7 +373,7 @@ EVENT_CONFIG = {
         "signature": "StakeWithdrawn(address indexed msgSender, address indexed withdrawalAddress, bytes valBLSPubKey, uint256 amount)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -219,7 +382,7 @@ EVENT_CONFIG = {
         "signature": "Slashed(address indexed msgSender, address indexed slashReceiver, address indexed withdrawalAddress, bytes valBLSPubKey, uint256 amount)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"amount": hypersync.DataType.UINT64},
+            decoded_log={"amount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -228,7 +391,7 @@ EVENT_CONFIG = {
         "signature": "MinStakeSet(address indexed msgSender, uint256 newMinStake)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"newMinStake": hypersync.DataType.UINT64},
+            decoded_log={"newMinStake": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -237,7 +400,7 @@ EVENT_CONFIG = {
         "signature": "SlashAmountSet(address indexed msgSender, uint256 newSlashAmount)",
         "contract": Contracts.VALIDATOR_REGISTRY,
         "column_mapping": hypersync.ColumnMapping(
-            decoded_log={"newSlashAmount": hypersync.DataType.UINT64},
+            decoded_log={"newSlashAmount": hypersync.DataType.DECIMAL128},
             transaction=COMMON_TRANSACTION_MAPPING,
             block=COMMMON_BLOCK_MAPPING,
         ),
@@ -281,31 +444,267 @@ EVENT_CONFIG = {
     },
 }
 
-
-def timer(func: Callable[..., Awaitable[None]]) -> Callable[..., Awaitable[None]]:
+# Precompiled registry of the configured events, used for all event lookups. Register new events at runtime with
+# `EVENT_REGISTRY.register(...)`.
+EVENT_REGISTRY = EventRegistry.from_config(
+    EVENT_CONFIG,
+    default_column_mapping=hypersync.ColumnMapping(
+        transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
+    ),
+)
+
+# Stream settings of multi-event queries. Logs are decoded per event after routing, so only transaction and block
+# columns are mapped by Hypersync
+EVENTS_STREAM_CONFIG = hypersync.StreamConfig(
+    hex_output=hypersync.HexOutput.PREFIXED,
+    column_mapping=hypersync.ColumnMapping(
+        transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
+    ),
+)
+
+
+def timer(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
     """
-    A decorator to measure and print the execution time of an asynchronous function.
+    A decorator recording the metrics of a query method and passing them to the client's `listeners`.
+
+    The execution time of successful queries is logged at debug level. The wrapped method accepts a `print_time`
+    keyword argument, False by default, which logs it at info level instead.
 
     Args:
-        func (Callable[..., Awaitable[None]]): The asynchronous function to measure.
+        func (Callable[..., Awaitable]): The asynchronous query method to measure.
 
     Returns:
-        Callable[..., Awaitable[None]]: The wrapped function with timing functionality.
+        Callable[..., Awaitable]: The wrapped method.
     """
 
-    async def wrapper(*args, **kwargs):
-        print_time = kwargs.pop("print_time", True)
-        start_time = time.time()
-        result = await func(*args, **kwargs)
-        end_time = time.time()
-        if print_time:
-            print(f"{func.__name__} query finished in {
-                  end_time - start_time:.2f} seconds.")
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        print_time = kwargs.pop("print_time", False)
+        metrics = QueryMetrics(func.__name__, parent=current_metrics())
+        token = CURRENT_METRICS.set(metrics)
+        start_time = time.perf_counter()
+        try:
+            result = await func(self, *args, **kwargs)
+        except Exception as e:
+            metrics.error = repr(e)
+            raise
+        finally:
+            metrics.duration = time.perf_counter() - start_time
+            CURRENT_METRICS.reset(token)
+            notify(self.listeners, metrics)
+        level = logging.INFO if print_time else logging.DEBUG
+        logger.log(level, "%s query finished in %.2f seconds", func.__name__, metrics.duration)
         return result
 
     return wrapper
 
 
+# Result formats of queries: Polars DataFrames, or Arrow tables built without a Polars conversion
+OUTPUT_FORMATS = ("polars", "arrow")
+
+
+def check_output(output: str, lazy: bool = False) -> None:
+    """
+    Validate the requested result format of a query.
+
+    Args:
+        output (str): The result format, one of `OUTPUT_FORMATS`.
+        lazy (bool): Whether a LazyFrame was requested.
+
+    Raises:
+        ValueError: If the format is unknown, or a lazy Arrow result is requested.
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output}")
+    if lazy and output == "arrow":
+        raise ValueError("Lazy results require Polars output")
+
+
+def to_output(
+    result: Optional[pl.DataFrame | pl.LazyFrame | pa.Table], output: str = "polars", lazy: bool = False
+) -> Optional[pl.DataFrame | pl.LazyFrame | pa.Table]:
+    """
+    Convert a result merged eagerly in Polars, e.g. by sharding or caching, to the requested format.
+
+    Args:
+        result (Optional[pl.DataFrame | pl.LazyFrame | pa.Table]): The result.
+        output (str): The result format, one of `OUTPUT_FORMATS`.
+        lazy (bool): Whether to return a LazyFrame.
+
+    Returns:
+        Optional[pl.DataFrame | pl.LazyFrame | pa.Table]: The result in the requested format.
+    """
+    if not isinstance(result, pl.DataFrame):
+        return result
+    if output == "arrow":
+        return result.to_arrow()
+    return result.lazy() if lazy else result
+
+
+# Transaction, block and log fields holding prefixed hex hashes, addresses or byte strings
+HEX_FIELDS = (
+    "hash",
+    "block_hash",
+    "parent_hash",
+    "transaction_hash",
+    "from",
+    "to",
+    "contract_address",
+    "address",
+    "miner",
+    "input",
+    "data",
+    "topic0",
+    "topic1",
+    "topic2",
+    "topic3",
+    "r",
+    "s",
+    "sighash",
+    "source_hash",
+    "logs_bloom",
+    "extra_data",
+    "mix_hash",
+    "sha3_uncles",
+    "state_root",
+    "transactions_root",
+    "receipts_root",
+    "withdrawals_root",
+    "parent_beacon_block_root",
+)
+
+
+def hex_columns(spec: Optional[EventSpec] = None) -> List[str]:
+    """
+    List the columns of a result holding prefixed hex byte values, which `binary` output returns as raw bytes.
+
+    Args:
+        spec (Optional[EventSpec]): The queried event, optional. Its address and bytes parameters are included.
+
+    Returns:
+        List[str]: The column names, including the "_block" suffixed names of block fields clashing with transaction
+            fields.
+    """
+    columns = list(HEX_FIELDS) + [f"{c}_block" for c in HEX_FIELDS]
+    if spec is not None:
+        columns += [
+            p.name for p in spec.params
+            if p.type == "address"
+            or (p.type.startswith("bytes") and not p.type.endswith("]"))
+            or (p.indexed and is_dynamic(p.type))
+        ]
+    return columns
+
+
+def to_binary(
+    result: Optional[pl.DataFrame | pl.LazyFrame | pa.Table], columns: List[str]
+) -> Optional[pl.DataFrame | pl.LazyFrame | pa.Table]:
+    """
+    Convert the prefixed hex string columns of a result to raw bytes, halving their size.
+
+    Arrow tables are converted in Arrow, without going through Polars.
+
+    Args:
+        result (Optional[pl.DataFrame | pl.LazyFrame | pa.Table]): The result.
+        columns (List[str]): The columns to convert, see `hex_columns`. Missing and non-string columns are skipped.
+
+    Returns:
+        Optional[pl.DataFrame | pl.LazyFrame | pa.Table]: The result with binary columns.
+    """
+    if result is None:
+        return None
+    if isinstance(result, pa.Table):
+        for name in columns:
+            if name in result.column_names and result.schema.field(name).type in (pa.string(), pa.large_string()):
+                binary = hex_to_binary(result[name])
+                result = result.set_column(result.column_names.index(name), name, binary)
+        return result
+    schema = result.collect_schema() if isinstance(result, pl.LazyFrame) else result.schema
+    return result.with_columns(
+        hex_to_bytes(name) for name in columns if schema.get(name) == pl.String
+    )
+
+
+def drop_columns(
+    result: pl.DataFrame | pl.LazyFrame | pa.Table, columns: List[str]
+) -> pl.DataFrame | pl.LazyFrame | pa.Table:
+    """Drop the columns of a result that it has."""
+    if isinstance(result, pa.Table):
+        return result.drop_columns([c for c in columns if c in result.column_names])
+    return result.drop(columns, strict=False)
+
+
+def select_keys(table: pa.Table, columns: List[str]) -> pa.Table:
+    """Select the columns of an Arrow table that it has, so only they are converted."""
+    return table.select([c for c in columns if c in table.column_names])
+
+
+def select_columns(df: pl.DataFrame | pl.LazyFrame, columns: List[str]) -> List[str]:
+    """
+    Select the requested columns present in a DataFrame, in request order, always keeping the join keys.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): The DataFrame to select from.
+        columns (List[str]): The requested columns.
+
+    Returns:
+        List[str]: The column names to select.
+    """
+    names = df.collect_schema().names()
+    keys = [c for c in ("hash", "block_number") if c in names]
+    return list(dict.fromkeys(keys + [c for c in columns if c in names]))
+
+
+@dataclass
+class SubscriptionUpdate:
+    """
+    A batch of new event rows, or a rollback notice, yielded by `Hypersync.subscribe`.
+
+    Attributes:
+        events (dict[str, pl.DataFrame]): The new rows of each event that had any, keyed by event name.
+        next_block (int): The block the subscription continues from.
+        rollback_block (Optional[int]): Set when a reorg was detected. Rows previously yielded with a block number at
+            or above it are no longer canonical and are yielded again, if still present, by the following updates.
+    """
+
+    events: dict[str, pl.DataFrame]
+    next_block: int
+    rollback_block: Optional[int] = None
+
+
+def is_reorg(previous: Optional[hypersync.RollbackGuard], guard: Optional[hypersync.RollbackGuard]) -> bool:
+    """
+    Whether a response no longer extends the chain of the previous response.
+
+    Args:
+        previous (Optional[hypersync.RollbackGuard]): The rollback guard of the previous response.
+        guard (Optional[hypersync.RollbackGuard]): The rollback guard of the new response.
+
+    Returns:
+        bool: True if the parent of the new response's first block isn't the previous response's last block.
+    """
+    if previous is None or guard is None:
+        return False
+    return guard.first_block_number == previous.block_number + 1 and guard.first_parent_hash != previous.hash
+
+
+def crosses_gap(previous: Optional[hypersync.RollbackGuard], guard: Optional[hypersync.RollbackGuard]) -> bool:
+    """
+    Whether a response starts after a gap since the previous response, so `is_reorg` can't compare their hashes.
+
+    Args:
+        previous (Optional[hypersync.RollbackGuard]): The rollback guard of the previous response.
+        guard (Optional[hypersync.RollbackGuard]): The rollback guard of the new response.
+
+    Returns:
+        bool: True if blocks between the previous response's last block and the new response's first block were
+            received without a rollback guard.
+    """
+    if previous is None or guard is None:
+        return False
+    return guard.first_block_number > previous.block_number + 1
+
+
 @dataclass
 class Hypersync:
     """
@@ -313,24 +712,150 @@ class Hypersync:
 
     Attributes:
         url (str): The URL of the Hypersync service.
-        client (hypersync.HypersyncClient): The Hypersync client instance, initialized in __post_init__.
+        client (hypersync.HypersyncClient): The Hypersync client instance, taken from `pool` in __post_init__.
+        cache (Optional[EventCache]): An on-disk cache of event query results, optional. When set, event queries
+            only fetch the block ranges that are not cached yet.
+        registry (EventRegistry): The events available to event queries. Defaults to `EVENT_REGISTRY`.
+        height_ttl (float): How long in seconds a fetched chain height is reused by `get_height`. 0 disables caching,
+            though concurrent callers still share one in-flight request.
+        tx_index (Optional[TxIndex]): A local index of transaction hashes to block numbers, optional. When set, it is
+            filled from query results and `search_txs` only queries the blocks of indexed transactions.
+        block_index (Optional[BlockIndex]): A local index of block timestamps, base fees and gas used, optional.
+            When set, transaction and event queries in the blocks it covers take these columns from the index
+            instead of fetching them, and queries accept `from_time` and `to_time`. An index reaching the start of a
+            query is extended to its end first.
+        settings (ClientSettings): The client timeouts, retries and tokens. Instances with the same URL and settings
+            share one client and its warm connections.
+        batch_size (Optional[int]): The number of blocks requested per Hypersync request, optional. Defaults to the
+            server's choice.
+        pool (ClientPool): The pool the client is taken from. Defaults to the process-wide `CLIENT_POOL`.
+        retry (RetryPolicy): The retries of transient transport failures of collections, streams and subscriptions.
+            Collections and streams continue from the last received page.
+        checkpoint_dir (Optional[str]): A directory persisting the progress of collections, optional. A collection
+            interrupted by a crash or restart continues from its last received page when it is run again. Streams,
+            sinks and subscriptions are not checkpointed.
+        save_dir (str): The directory `save_data` writes to: collections to its "data" directory and blocks to its
+            "blocks_data.parquet" file. Defaults to the working directory.
+        listeners (List[Callable[[QueryMetrics], None]]): Called with the metrics of every finished query, e.g.
+            `instrumentation.prometheus_listener()`.
     """
 
     url: str
     client: hypersync.HypersyncClient = field(init=False)
+    cache: Optional[EventCache] = None
+    registry: EventRegistry = field(default_factory=lambda: EVENT_REGISTRY)
+    height_ttl: float = 1.0
+    tx_index: Optional[TxIndex] = None
+    block_index: Optional[BlockIndex] = None
+    settings: ClientSettings = field(default_factory=ClientSettings)
+    batch_size: Optional[int] = None
+    pool: ClientPool = field(default_factory=lambda: CLIENT_POOL, repr=False)
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    checkpoint_dir: Optional[str] = None
+    save_dir: str = "."
+    listeners: List[Callable[[QueryMetrics], None]] = field(default_factory=list)
+    _closed: bool = field(default=False, init=False, repr=False)
+    _height: Optional[tuple[int, float]] = field(default=None, init=False, repr=False)
+    _height_request: Optional[asyncio.Future] = field(default=None, init=False, repr=False)
+    _pinned_height: ContextVar[Optional[int]] = field(init=False, repr=False)
 
     def __post_init__(self):
         """Initialize the Hypersync client after the dataclass is instantiated."""
-        self.client = hypersync.HypersyncClient(hypersync.ClientConfig(url=self.url))
+        self.client = self.pool.acquire(self.url, self.settings)
+        self._pinned_height = ContextVar(f"pinned_height_{id(self)}", default=None)
+
+    async def __aenter__(self) -> "Hypersync":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
-    async def get_height(self) -> int:
+    async def close(self) -> None:
+        """Release the client back to the pool. Closing an instance more than once has no effect."""
+        if not self._closed:
+            self._closed = True
+            self.pool.release(self.url, self.settings)
+
+    def stream_config(self, config: hypersync.StreamConfig) -> hypersync.StreamConfig:
+        """
+        Apply the instance's `batch_size` to a stream configuration that doesn't set its own.
+
+        Args:
+            config (hypersync.StreamConfig): The configuration for the data stream.
+
+        Returns:
+            hypersync.StreamConfig: The configuration to send.
+        """
+        if self.batch_size is None or config.batch_size is not None:
+            return config
+        return dataclasses.replace(config, batch_size=self.batch_size)
+
+    async def get_height(self, max_age: Optional[float] = None) -> int:
         """
         Get the current block height from the blockchain.
 
+        Heights are cached for `height_ttl` seconds, and concurrent callers share a single in-flight request. Inside
+        `pin_height`, the pinned height is returned instead.
+
+        Args:
+            max_age (Optional[float]): The maximum age in seconds of a cached height, optional. Defaults to
+                `height_ttl`. Passing it also bypasses a pinned height, for callers that must follow the chain head.
+
+        Returns:
+            int: The current block height.
+        """
+        pinned = self._pinned_height.get()
+        if pinned is not None and max_age is None:
+            return pinned
+
+        max_age = self.height_ttl if max_age is None else max_age
+        if self._height and time.monotonic() - self._height[1] < max_age:
+            return self._height[0]
+
+        # Share the in-flight request of the current event loop, if any
+        request = self._height_request
+        if request is None or request.done() or request.get_loop() is not asyncio.get_running_loop():
+            request = asyncio.ensure_future(self.request_height())
+            self._height_request = request
+        # Shield the shared request from the cancellation of a single caller
+        return await asyncio.shield(request)
+
+    async def request_height(self) -> int:
+        """
+        Request the current block height from Hypersync, bypassing the cache, and cache it.
+
         Returns:
             int: The current block height.
         """
-        return await self.client.get_height()
+        requested_at = time.monotonic()
+        height = await self.client.get_height()
+        self._height = (height, requested_at)
+        return height
+
+    @asynccontextmanager
+    async def pin_height(self, height: Optional[int] = None) -> AsyncIterator[int]:
+        """
+        Pin the chain height used by queries inside the context, so a batch of queries sees one consistent snapshot.
+
+        The pin applies to the current task and the tasks it starts, e.g. with `asyncio.gather`.
+
+        Args:
+            height (Optional[int]): The height to pin, optional. Defaults to the current height.
+
+        Yields:
+            int: The pinned height.
+        """
+        height = height if height is not None else await self.get_height(max_age=0)
+        token = self._pinned_height.set(height)
+        try:
+            yield height
+        finally:
+            self._pinned_height.reset(token)
+
+    def blocks_data_path(self) -> str:
+        """The file `get_blocks` saves blocks to with `save_data`, creating `save_dir` if needed."""
+        os.makedirs(self.save_dir, exist_ok=True)
+        return os.path.join(self.save_dir, "blocks_data.parquet")
 
     def create_query(
         self,
@@ -339,6 +864,7 @@ class Hypersync:
         logs: List[hypersync.LogSelection],
         transactions: Optional[List[hypersync.TransactionSelection]] = None,
         blocks: Optional[List[hypersync.BlockSelection]] = None,
+        field_selection: Optional[hypersync.FieldSelection] = None,
     ) -> hypersync.Query:
         """
         Create a Hypersync query object for querying blockchain data.
@@ -348,6 +874,8 @@ class Hypersync:
             to_block (int): The ending block number for the query.
             logs (List[hypersync.LogSelection]): A list of log selections to filter the query.
             transactions (Optional[List[hypersync.TransactionSelection]]): Optional transaction selections for the query.
+            blocks (Optional[List[hypersync.BlockSelection]]): Optional block selections for the query.
+            field_selection (Optional[hypersync.FieldSelection]): Fields to request, optional. Defaults to every field.
 
         Returns:
             hypersync.Query: The constructed query object.
@@ -358,11 +886,7 @@ class Hypersync:
             logs=logs,
             transactions=transactions or [],
             blocks=blocks or [],
-            field_selection=hypersync.FieldSelection(
-                log=[e.value for e in hypersync.LogField],
-                transaction=[e.value for e in hypersync.TransactionField],
-                block=[e.value for e in hypersync.BlockField],
-            ),
+            field_selection=field_selection or create_field_selection(),
         )
 
     async def collect_data(
@@ -371,7 +895,10 @@ class Hypersync:
         config: hypersync.StreamConfig,
         save_data: bool,
         tx_data: bool = False,
-    ) -> Optional[pl.DataFrame]:
+        columns: Optional[List[str]] = None,
+        lazy: bool = False,
+        output: str = "polars",
+    ) -> Optional[pl.DataFrame | pl.LazyFrame | pa.Table]:
         """
         Collect data using the Hypersync client and return it as a Polars DataFrame or save it as a parquet file.
 
@@ -380,112 +907,452 @@ class Hypersync:
             config (hypersync.StreamConfig): The configuration for the data stream.
             save_data (bool): Whether to save the data as a parquet file.
             tx_data (bool): Whether to include transaction data in the result.
+            columns (Optional[List[str]]): The transaction and block columns to return, optional.
+            lazy (bool): Whether to return a LazyFrame with the joins left unevaluated.
+            output (str): The result format, "polars" or "arrow".
 
         Returns:
-            Optional[pl.DataFrame]: The collected data as a Polars DataFrame, or None if no data is returned.
+            Optional[pl.DataFrame | pl.LazyFrame | pa.Table]: The collected data as a Polars DataFrame, LazyFrame
+                if `lazy` is set, or Arrow table for Arrow output, or None if no data is returned.
         """
         if save_data:
-            return await self.client.collect_parquet("data", query, config)
-        else:
-            data = await self.client.collect_arrow(query, config)
-            decoded_logs_df = pl.from_arrow(data.data.decoded_logs)
-            logs_df = pl.from_arrow(data.data.logs)
-            transactions_df = pl.from_arrow(data.data.transactions)
-            blocks_df = pl.from_arrow(data.data.blocks)
-
-            txs_blocks_df = transactions_df.join(
-                blocks_df.select(
-                    "number",
-                    "timestamp",
-                    "base_fee_per_gas",
-                    "gas_used",
-                    "parent_beacon_block_root",
-                ).rename({"number": "block_number"}),
+            return await self.client.collect_parquet(
+                os.path.join(self.save_dir, "data"), query, self.stream_config(config)
+            )
+
+        data = await self.collect_pages(query, config)
+        if output == "arrow":
+            return self.build_table(data, tx_data=tx_data, columns=columns)
+        return self.build_frame(data, tx_data=tx_data, columns=columns, lazy=lazy)
+
+    async def collect_pages(self, query: hypersync.Query, config: hypersync.StreamConfig) -> CollectedData:
+        """
+        Collect a query page by page, resuming from the last received page when the stream fails.
+
+        Pages are received through `stream_pages`, which retries transient failures at the cursor while keeping the
+        pages received so far. With `checkpoint_dir` set, pages and the cursor are also persisted, so running the same
+        query again after a crash only fetches the remaining blocks.
+
+        Args:
+            query (hypersync.Query): The query object to execute.
+            config (hypersync.StreamConfig): The configuration for the data stream.
+
+        Returns:
+            CollectedData: The tables of all pages, in block order.
+
+        Raises:
+            Exception: A failure that isn't transient, or the last transient failure once `retry.max_retries`
+                consecutive attempts have failed.
+        """
+        config = self.stream_config(config)
+        checkpoint = None
+        if self.checkpoint_dir:
+            # Collections of different ranges keep separate checkpoints, so finishing one can't clear another's
+            key = checkpoint_key(query, config)
+            checkpoint = CollectionCheckpoint(os.path.join(self.checkpoint_dir, key))
+        cursor, pages = checkpoint.load(query.from_block) if checkpoint else (query.from_block, [])
+
+        async for response in self.stream_pages(dataclasses.replace(query, from_block=cursor), config):
+            pages.append(response.data)
+            if checkpoint:
+                checkpoint.save_page(len(pages) - 1, response.data, response.next_block)
+
+        if checkpoint:
+            checkpoint.clear()
+        return concat_pages(pages)
+
+    async def stream_pages(
+        self, query: hypersync.Query, config: hypersync.StreamConfig
+    ) -> AsyncIterator[hypersync.ArrowResponse]:
+        """
+        Stream the response pages of a query, restarting the stream at the cursor when it fails transiently.
+
+        The cursor follows the `next_block` of each received page, so no page is yielded twice. Transient transport
+        failures, see `resume.is_transient`, are retried according to `retry`. Any other failure is raised at once.
+
+        Args:
+            query (hypersync.Query): The query object to execute.
+            config (hypersync.StreamConfig): The configuration for the data stream.
+
+        Yields:
+            hypersync.ArrowResponse: The response pages, in block order.
+
+        Raises:
+            Exception: A failure that isn't transient, or the last transient failure once `retry.max_retries`
+                consecutive attempts have failed.
+        """
+        config = self.stream_config(config)
+        cursor = query.from_block
+        attempt = 0
+        while query.to_block is None or cursor < query.to_block:
+            try:
+                record_range(cursor, query.to_block)
+                receiver = await self.client.stream_arrow(dataclasses.replace(query, from_block=cursor), config)
+                try:
+                    while True:
+                        with measure("network"):
+                            response = await receiver.recv()
+                        if response is None:
+                            break
+                        record_response(response.data)
+                        cursor = response.next_block
+                        attempt = 0
+                        yield response
+                finally:
+                    await receiver.close()
+                break
+            except Exception as error:
+                await self.backoff(error, attempt)
+                attempt += 1
+
+    async def backoff(self, error: Exception, attempt: int) -> None:
+        """
+        Wait before retrying a failed call, or raise the failure if it can't be retried.
+
+        Args:
+            error (Exception): The failure.
+            attempt (int): The number of consecutive failed attempts before this one.
+
+        Raises:
+            Exception: The failure, if it isn't transient or `retry.max_retries` consecutive attempts have failed.
+        """
+        if not is_transient(error) or attempt >= self.retry.max_retries:
+            raise error
+        count("retries")
+        await asyncio.sleep(self.retry.delay(attempt))
+
+    async def retrying(self, call: Callable[[], Awaitable]):
+        """
+        Await a call, retrying transient failures according to `retry` like `stream_pages`.
+
+        Args:
+            call (Callable[[], Awaitable]): Makes the awaitable of one attempt.
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            Exception: A failure that isn't transient, or the last transient failure once `retry.max_retries`
+                consecutive attempts have failed.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as error:
+                await self.backoff(error, attempt)
+                attempt += 1
+
+    async def get_block_hash(self, block_number: int) -> Optional[str]:
+        """
+        Look up the current hash of a block, retrying transient failures.
+
+        Args:
+            block_number (int): The block.
+
+        Returns:
+            Optional[str]: The prefixed hex hash of the block, or None if it isn't indexed.
+        """
+        query = self.create_query(
+            from_block=block_number,
+            to_block=block_number + 1,
+            logs=[],
+            blocks=[hypersync.BlockSelection()],
+            field_selection=create_field_selection(["hash"], blocks_only=True),
+        )
+        config = self.stream_config(hypersync.StreamConfig(hex_output=hypersync.HexOutput.PREFIXED))
+        response = await self.retrying(lambda: self.client.collect_arrow(query, config))
+        blocks = response.data.blocks
+        if blocks is None or "hash" not in blocks.column_names or not blocks.num_rows:
+            return None
+        return blocks.column("hash")[0].as_py()
+
+    def build_frame(
+        self,
+        data: hypersync.ArrowResponseData,
+        tx_data: bool = False,
+        columns: Optional[List[str]] = None,
+        lazy: bool = False,
+    ) -> Optional[pl.DataFrame | pl.LazyFrame]:
+        """
+        Build a Polars DataFrame from the Arrow tables of a Hypersync response.
+
+        Decoded logs are joined to their transaction and block columns when `tx_data` is set. Responses without
+        logs return the joined transaction and block data instead.
+
+        With `lazy`, the joins and column selections are returned as a LazyFrame, so filters and selections applied
+        by the caller are pushed down and only the surviving rows and columns are joined.
+
+        Args:
+            data (hypersync.ArrowResponseData): The Arrow tables of a collected or streamed response.
+            tx_data (bool): Whether to include transaction data in the result.
+            columns (Optional[List[str]]): The transaction and block columns to return, optional. Defaults to
+                `EVENT_TX_COLUMNS` for event logs and `TX_BLOCK_COLUMNS` otherwise.
+            lazy (bool): Whether to return a LazyFrame with the joins left unevaluated.
+
+        Returns:
+            Optional[pl.DataFrame | pl.LazyFrame]: The data as a Polars DataFrame, or LazyFrame if `lazy` is set,
+                or None if the response is empty.
+        """
+        with measure("decode"):
+            decoded_logs_df = pl.from_arrow(data.decoded_logs)
+            logs_df = pl.from_arrow(data.logs)
+            transactions_df = pl.from_arrow(data.transactions)
+            blocks_df = pl.from_arrow(data.blocks)
+            self.index_transactions(transactions_df, logs_df)
+
+        if lazy:
+            # Emptiness can only be checked before the joins are deferred
+            if (decoded_logs_df.is_empty() or logs_df.is_empty()) and transactions_df.is_empty():
+                return None
+            transactions_df, blocks_df = transactions_df.lazy(), blocks_df.lazy()
+
+        with measure("join"):
+            return self.join_logs(
+                decoded_logs_df,
+                logs_df,
+                self.join_blocks(transactions_df, blocks_df),
+                tx_data=tx_data,
+                columns=columns,
+            )
+
+    def build_table(
+        self,
+        data: hypersync.ArrowResponseData,
+        tx_data: bool = False,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[pa.Table]:
+        """
+        Build an Arrow table from the Arrow tables of a Hypersync response, without converting them to Polars.
+
+        The result matches `build_frame`, with the joins done in Arrow compute. The transaction and block columns are
+        gathered onto the logs, whose columns are returned without a copy. With a transaction index, only the hash and
+        block number columns are converted to Polars to update it.
+
+        Args:
+            data (hypersync.ArrowResponseData): The Arrow tables of a collected or streamed response.
+            tx_data (bool): Whether to include transaction data in the result.
+            columns (Optional[List[str]]): The transaction and block columns to return, optional. Defaults to
+                `EVENT_TX_COLUMNS` for event logs and `TX_BLOCK_COLUMNS` otherwise.
+
+        Returns:
+            Optional[pa.Table]: The data as an Arrow table, or None if the response is empty.
+        """
+        if self.tx_index is not None:
+            with measure("decode"):
+                self.index_transactions(
+                    pl.from_arrow(select_keys(data.transactions, ["hash", "block_number"])),
+                    pl.from_arrow(select_keys(data.logs, ["transaction_hash", "block_number"])),
+                )
+        with measure("join"):
+            txs_blocks = join_blocks_arrow(data.transactions, data.blocks)
+            if self.block_index is not None:
+                txs_blocks = self.block_index.join(txs_blocks)
+            return join_logs_arrow(
+                data.decoded_logs,
+                data.logs,
+                txs_blocks,
+                tx_data=tx_data,
+                columns=columns or EVENT_TX_COLUMNS,
+                tx_columns=columns or TX_BLOCK_COLUMNS,
+            )
+
+    def index_transactions(self, transactions_df: pl.DataFrame, logs_df: pl.DataFrame) -> None:
+        """
+        Add the transactions of a response to the transaction index, if the client has one.
+
+        Args:
+            transactions_df (pl.DataFrame): The transactions of the response.
+            logs_df (pl.DataFrame): The raw logs of the response, keyed by "transaction_hash".
+        """
+        if self.tx_index is None:
+            return
+        self.tx_index.update(transactions_df)
+        self.tx_index.update(logs_df, hash_column="transaction_hash")
+
+    def join_blocks(
+        self, transactions_df: pl.DataFrame | pl.LazyFrame, blocks_df: pl.DataFrame | pl.LazyFrame
+    ) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Join block columns onto transactions by block number.
+
+        With a block index, the indexed columns the blocks don't have are then gathered from the index.
+
+        Args:
+            transactions_df (pl.DataFrame | pl.LazyFrame): The transactions.
+            blocks_df (pl.DataFrame | pl.LazyFrame): The blocks, keyed by "number". Must be lazy if the
+                transactions are.
+
+        Returns:
+            pl.DataFrame | pl.LazyFrame: The transactions with block columns, clashing names suffixed with "_block".
+        """
+        if "block_number" not in transactions_df.collect_schema().names():
+            return transactions_df
+        if "number" in blocks_df.collect_schema().names():
+            transactions_df = transactions_df.join(
+                blocks_df.rename({"number": "block_number"}),
                 on="block_number",
                 how="left",
                 suffix="_block",
             )
+        if self.block_index is not None:
+            transactions_df = self.block_index.join(transactions_df)
+        return transactions_df
+
+    def join_logs(
+        self,
+        decoded_logs_df: pl.DataFrame,
+        logs_df: pl.DataFrame,
+        txs_blocks_df: pl.DataFrame | pl.LazyFrame,
+        tx_data: bool = False,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[pl.DataFrame | pl.LazyFrame]:
+        """
+        Join decoded logs to the position of their log and, optionally, their transaction and block columns.
+
+        Args:
+            decoded_logs_df (pl.DataFrame): The decoded logs, row aligned with `logs_df`.
+            logs_df (pl.DataFrame): The raw logs.
+            txs_blocks_df (pl.DataFrame | pl.LazyFrame): The transactions joined to their blocks. When lazy, the
+                result is lazy too and the caller must have checked it isn't empty.
+            tx_data (bool): Whether to include transaction data in the result.
+            columns (Optional[List[str]]): The transaction and block columns to return, optional.
 
+        Returns:
+            Optional[pl.DataFrame | pl.LazyFrame]: The joined data, the transactions and blocks if there are no logs,
+                or None if everything is empty.
+        """
+        lazy = isinstance(txs_blocks_df, pl.LazyFrame)
         if decoded_logs_df.is_empty() or logs_df.is_empty():
-            # If both decoded_logs_df and logs_df are empty
-            if txs_blocks_df.is_empty():
+            if not lazy and txs_blocks_df.is_empty():
                 return None  # All three DataFrames are empty
-            else:
-                # Return txs_blocks_df if it's not empty
-                return txs_blocks_df.select(
-                    "hash",
-                    "block_number",
-                    "to",
-                    "from",
-                    "nonce",
-                    "type",
-                    "block_hash",
-                    "timestamp",
-                    "base_fee_per_gas",
-                    "gas_used_block",
-                    "parent_beacon_block_root",
-                    "max_priority_fee_per_gas",
-                    "max_fee_per_gas",
-                    "effective_gas_price",
-                    "gas_used",
-                )
+            # Return the transactions and blocks if there are no logs
+            return txs_blocks_df.select(
+                select_columns(txs_blocks_df, columns or TX_BLOCK_COLUMNS)
+            )
 
-        if tx_data:
-            result_df = (
-                decoded_logs_df.hstack(logs_df.select("transaction_hash"))
-                .rename({"transaction_hash": "hash"})
-                .join(
-                    txs_blocks_df.select(
-                        "hash",
-                        "block_number",
-                        "to",
-                        "from",
-                        "nonce",
-                        "type",
-                        "block_hash",
-                        "timestamp",
-                        "base_fee_per_gas",
-                        "gas_used_block",
-                        "max_priority_fee_per_gas",
-                        "max_fee_per_gas",
-                        "effective_gas_price",
-                        "gas_used",
-                    ),
-                    on="hash",
-                    how="left",
-                )
+        # Keep the position of each log so results can be ordered, cached and de-duplicated by block
+        decoded_logs_df = decoded_logs_df.hstack(
+            logs_df.select(
+                [c for c in ("transaction_hash", "block_number", "log_index") if c in logs_df.columns]
             )
-            return result_df
-        else:
+        ).rename({"transaction_hash": "hash"}, strict=False)
+        if lazy:
+            decoded_logs_df = decoded_logs_df.lazy()
+
+        if not tx_data:
+            return decoded_logs_df.drop("hash", strict=False)
+        if "hash" not in txs_blocks_df.collect_schema().names():
             return decoded_logs_df
 
+        return decoded_logs_df.join(
+            txs_blocks_df.select(
+                select_columns(txs_blocks_df, columns or EVENT_TX_COLUMNS)
+            ),
+            on=["hash", "block_number"],
+            how="left",
+        )
+
     async def get_block_range(
         self,
         from_block: Optional[int] = None,
         to_block: Optional[int] = None,
         block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
     ) -> dict[str, int]:
         """
         Determine the block range to be used in a query.
 
+        Times are resolved to blocks with the block index, see `block_at_time`, and take precedence over blocks.
+
         Args:
             from_block (Optional[int]): The starting block number, optional.
             to_block (Optional[int]): The ending block number, optional.
             block_range (Optional[int]): The range of blocks, optional.
+            from_time (Optional[int | datetime]): The starting time, as a Unix timestamp in seconds or a datetime,
+                optional. The range starts at the first block at or after it.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. The range ends before the first
+                block at or after it.
 
         Returns:
             dict[str, int]: A dictionary containing 'from_block' and 'to_block'.
+
+        Raises:
+            ValueError: If a time is given without a non-empty block index or before its first block, or `from_time`
+                is after `to_time`.
         """
-        to_block = to_block or await self.get_height()
+        if from_time is not None and to_time is not None and to_timestamp(from_time) > to_timestamp(to_time):
+            raise ValueError("from_time must not be after to_time")
+        if to_time is not None:
+            to_block = await self.block_at_time(to_time)
+        else:
+            to_block = to_block or await self.get_height()
+        if from_time is not None:
+            from_block = await self.block_at_time(from_time)
         from_block = from_block or (to_block - block_range if block_range else 0)
         return {"from_block": from_block, "to_block": to_block}
 
+    async def block_at_time(self, timestamp: int | datetime) -> int:
+        """
+        Find the first block at or after a time by binary search over the block index.
+
+        The index is extended to the chain height first if its last block is older than the time. It is never
+        extended backwards, so it must already start at or before the time, e.g. after
+        `update_block_index(index, from_block=...)`.
+
+        Args:
+            timestamp (int | datetime): The time, as a Unix timestamp in seconds or a datetime.
+
+        Returns:
+            int: The first block at or after the time, or the block after the index if there is none yet.
+
+        Raises:
+            ValueError: If the client has no block index, the index is empty, or the time is before its first block.
+        """
+        index = self.block_index
+        if index is None:
+            raise ValueError("Time ranges require a block index")
+        if not len(index):
+            raise ValueError("Time ranges require a block index with a start, see update_block_index(from_block=...)")
+        if index.last_timestamp is None or index.last_timestamp < to_timestamp(timestamp):
+            await self.update_block_index(index)
+        return index.block_at_time(timestamp)
+
+    async def select_fields(
+        self, columns: List[str], from_block: int, to_block: int, logs: bool = False
+    ) -> hypersync.FieldSelection:
+        """
+        Create the field selection of a query, leaving out the block columns the block index serves for its range.
+
+        A non-empty block index reaching the start of the range is extended to its end first, so an index kept for a
+        moving range stays current without a separate update.
+
+        Args:
+            columns (List[str]): The output columns to request, see `create_field_selection`.
+            from_block (int): The starting block number of the query.
+            to_block (int): The ending block number of the query.
+            logs (bool): Whether to request the log fields needed to decode events.
+
+        Returns:
+            hypersync.FieldSelection: The field selection for the query.
+        """
+        index = self.block_index
+        if index is not None and any(c in INDEXED_COLUMNS for c in columns):
+            if len(index) and index.first_block <= from_block <= index.next_block < to_block:
+                await self.update_block_index(index, to_block=to_block)
+            if index.covers(from_block, to_block):
+                # Keep the join keys when only indexed columns were requested
+                columns = [c for c in columns if c not in INDEXED_COLUMNS] or ["block_number"]
+        return create_field_selection(columns, logs=logs)
+
     def create_event_query(
         self,
         event_signature: str,
         from_block: int,
         to_block: int,
         address: Optional[str] = None,
+        field_selection: Optional[hypersync.FieldSelection] = None,
     ) -> hypersync.Query:
         """
         Create a query for a specific event based on the event signature.
@@ -495,6 +1362,7 @@ class Hypersync:
             from_block (int): The starting block number for the query.
             to_block (int): The ending block number for the query.
             address (Optional[str]): Optional address to filter the event logs.
+            field_selection (Optional[hypersync.FieldSelection]): Fields to request, optional. Defaults to every field.
 
         Returns:
             hypersync.Query: The constructed query object.
@@ -502,27 +1370,16 @@ class Hypersync:
         Raises:
             ValueError: If the event signature is not supported.
         """
-        # Find the event configuration using the signature
-        config = next(
-            (v for k, v in EVENT_CONFIG.items() if v["signature"] == event_signature),
-            None,
-        )
-        if not config:
+        # Find the precompiled event using the signature
+        spec = self.registry.by_signature(event_signature)
+        if not spec:
             raise ValueError(f"Unsupported event signature: {event_signature}")
 
-        topic0 = hypersync.signature_to_topic0(event_signature)
-        topics = [[topic0]]
-        if address:
-            topics.append([address_to_topic(address.lower())])
-
         return self.create_query(
             from_block=from_block,
             to_block=to_block,
-            logs=[
-                hypersync.LogSelection(
-                    address=[config["contract"].value], topics=topics
-                )
-            ],
+            logs=[spec.select_logs(address)],
+            field_selection=field_selection,
         )
 
     @timer
@@ -532,11 +1389,20 @@ class Hypersync:
         from_block: Optional[int] = None,
         to_block: Optional[int] = None,
         block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
         save_data: bool = False,
-        print_time: bool = True,
+        print_time: bool = False,
         address: Optional[str] = None,
         tx_data: bool = True,
-    ) -> Optional[pl.DataFrame]:
+        columns: Optional[List[str]] = None,
+        shards: Optional[int] = None,
+        max_concurrency: int = 4,
+        lazy: bool = False,
+        output: str = "polars",
+        sink: Optional[ParquetSink] = None,
+        binary: bool = False,
+    ) -> Optional[pl.DataFrame | pl.LazyFrame | pa.Table | List[dict]]:
         """
         Execute a query for a specific event by its name and collect the data.
 
@@ -571,53 +1437,516 @@ class Hypersync:
             from_block (Optional[int]): The starting block number, optional.
             to_block (Optional[int]): The ending block number, optional.
             block_range (Optional[int]): The range of blocks to query, optional.
+            from_time (Optional[int | datetime]): The starting time, optional. Requires a block index, see
+                `get_block_range`.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. Requires a block index.
             save_data (bool): Whether to save the data as a parquet file.
-            print_time (bool): Whether to print the execution time of the query.
+            print_time (bool): Whether to log the execution time of the query at info rather than debug level.
+                Timings are always passed to `listeners`.
             address (Optional[str]): Optional address to filter the event logs.
-            tx_data (bool): Whether to include transaction data in the result.
+            tx_data (bool): Whether to include transaction data in the result. Without it, only the decoded event
+                columns are returned.
+            columns (Optional[List[str]]): The transaction and block columns to join to the event logs, optional.
+                Defaults to the event's registered columns, or `EVENT_TX_COLUMNS`. Only these fields
+                and the join keys are requested from Hypersync.
+            shards (Optional[int]): Split the block range into this many chunks fetched concurrently, optional.
+                The chunk size adapts to observed latency and row counts, so more shards than `max_concurrency`
+                lets later chunks settle on a suitable size.
+            max_concurrency (int): The maximum number of chunks, or of ranges missing from the cache, fetched at once.
+            lazy (bool): Whether to return a LazyFrame with the transaction and block joins left unevaluated, so
+                later filters and selections are pushed down. Sharded and cached results are merged eagerly and
+                returned as a LazyFrame over the merged data.
+            output (str): The result format. "polars" returns Polars frames, "arrow" a `pyarrow.Table` built and
+                joined in Arrow compute without a Polars conversion. Sharded and cached results are merged in Polars
+                and converted.
+            sink (Optional[ParquetSink]): Stream the results page by page into this sink, under the event name,
+                instead of returning them, optional.
+            binary (bool): Whether to return hashes, addresses and byte values as raw bytes instead of prefixed hex
+                strings, see `hex_columns`.
 
         Returns:
-            Optional[pl.DataFrame]: The collected data as a Polars DataFrame, or None if no data is returned.
+            Optional[pl.DataFrame | pl.LazyFrame | pa.Table | List[dict]]: The collected data as a Polars DataFrame,
+                LazyFrame if `lazy` is set, or Arrow table for Arrow output. With a sink, the manifest entries of the
+                written files.
 
         Raises:
-            ValueError: If the event name is not supported or no data is returned.
+            ValueError: If the event name is not supported, a column is unknown, sharding is combined with
+                save_data or a sink, the output format is unsupported, a time range is given without a block index,
+                or no data is returned.
         """
-        # Retrieve the event configuration using the event name
-        event_config = EVENT_CONFIG.get(event_name)
-        if not event_config:
+        check_output(output, lazy)
+
+        # Retrieve the precompiled event using the event name
+        spec = self.registry.get(event_name)
+        if not spec:
             raise ValueError(f"Unsupported event name: {event_name}")
 
         # Determine the block range for the query
-        block_range_dict = await self.get_block_range(from_block, to_block, block_range)
-        event_signature = event_config["signature"]
-
-        # Create the query object for the specified event
-        query = self.create_event_query(
-            event_signature,
-            block_range_dict["from_block"],
-            block_range_dict["to_block"],
-            address,
-        )
-
-        # Retrieve the column mapping for the event, if available
-        column_mapping = event_config.get("column_mapping", hypersync.ColumnMapping())
+        block_range_dict = await self.get_block_range(from_block, to_block, block_range, from_time, to_time)
+
+        # Request only the fields of the selected columns, keeping every field when saving the raw tables
+        field_selection = None
+        if not save_data or columns is not None:
+            columns = columns if columns is not None else event_tx_columns([spec])
+            if save_data:
+                field_selection = create_field_selection(columns if tx_data else [], logs=True)
+            else:
+                field_selection = await self.select_fields(columns if tx_data else [], logs=True, **block_range_dict)
 
         # Configure the stream settings for the data collection
         config = hypersync.StreamConfig(
             hex_output=hypersync.HexOutput.PREFIXED,
-            event_signature=event_signature,
-            column_mapping=column_mapping,
+            event_signature=spec.signature,
+            column_mapping=spec.column_mapping,
         )
 
-        # Collect the data based on the query and configuration
-        result = await self.collect_data(query, config, save_data, tx_data=tx_data)
+        if sink is not None:
+            if save_data or shards:
+                raise ValueError("Sinks cannot be combined with save_data or sharding")
+            query = self.create_query(
+                from_block=block_range_dict["from_block"],
+                to_block=block_range_dict["to_block"],
+                logs=[spec.select_logs(address)],
+                field_selection=field_selection,
+            )
+            return await self.write_stream(
+                sink, event_name, query, config,
+                lambda data: self.build_frame(data, tx_data=tx_data, columns=columns),
+            )
+
+        async def fetch(start: int, end: int) -> Optional[pl.DataFrame]:
+            # Create the query object for the specified event
+            query = self.create_query(
+                from_block=start,
+                to_block=end,
+                logs=[spec.select_logs(address)],
+                field_selection=field_selection,
+            )
+            # Collect the data based on the query and configuration. Chunks are merged eagerly by sharding and caching
+            direct = not shards and not self.cache
+            return await self.collect_data(
+                query,
+                config,
+                save_data,
+                tx_data=tx_data,
+                columns=columns,
+                lazy=lazy and direct,
+                output=output if direct else "polars",
+            )
+
+        async def fetch_range(start: int, end: int) -> Optional[pl.DataFrame]:
+            if shards:
+                if save_data:
+                    raise ValueError("Sharded queries cannot save data")
+                return await run_sharded(fetch, ShardPlanner(start, end, shards), max_concurrency)
+            return await fetch(start, end)
+
+        if self.cache and not save_data:
+            # Only fetch the block ranges missing from the cache
+            result = await self.cache.fetch(
+                self.cache.key(
+                    event_name, spec.contract, address, tx_data, columns, spec.signature, spec.column_mapping
+                ),
+                block_range_dict["from_block"],
+                block_range_dict["to_block"],
+                await self.get_height(),
+                fetch_range,
+                max_concurrency,
+            )
+        else:
+            result = await fetch_range(block_range_dict["from_block"], block_range_dict["to_block"])
 
         # Handle the case where no data is returned
         if result is None:
             raise ValueError(f"No data returned for event name: {event_name} from blocks {
                              block_range_dict['from_block']} to {block_range_dict['to_block']}")
 
-        return result
+        if not tx_data:
+            # The log positions are only kept to order and cache the rows
+            result = drop_columns(result, ["block_number", "log_index"])
+        result = to_output(result, output, lazy)
+        return to_binary(result, hex_columns(spec)) if binary else result
+
+    @timer
+    async def execute_events_query(
+        self,
+        event_names: List[str],
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
+        print_time: bool = False,
+        tx_data: bool = True,
+        columns: Optional[List[str]] = None,
+        binary: bool = False,
+    ) -> dict[str, Optional[pl.DataFrame]]:
+        """
+        Execute a single query for several events and collect the data of each event.
+
+        All events are fetched in one scan of the block range with a shared transaction and block fetch. Logs are
+        routed to their event by contract and topic0 and decoded locally, so the results match `execute_event_query`
+        for each event.
+
+        Args:
+            event_names (List[str]): The names of the events to query. See `execute_event_query` for available events.
+            from_block (Optional[int]): The starting block number, optional.
+            to_block (Optional[int]): The ending block number, optional.
+            block_range (Optional[int]): The range of blocks to query, optional.
+            from_time (Optional[int | datetime]): The starting time, optional. Requires a block index, see
+                `get_block_range`.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. Requires a block index.
+            print_time (bool): Whether to log the execution time of the query at info rather than debug level.
+                Timings are always passed to `listeners`.
+            tx_data (bool): Whether to include transaction data in the results.
+            columns (Optional[List[str]]): The transaction and block columns to join to the event logs, optional.
+                Defaults to the union of the events' registered columns, see `event_tx_columns`.
+            binary (bool): Whether to return hashes, addresses and byte values as raw bytes, see
+                `execute_event_query`.
+
+        Returns:
+            dict[str, Optional[pl.DataFrame]]: The data of each event, or None for events without logs in the range.
+
+        Raises:
+            ValueError: If an event name is not supported, or a time range is given without a block index.
+        """
+        specs = self.get_event_specs(event_names)
+        block_range_dict = await self.get_block_range(from_block, to_block, block_range, from_time, to_time)
+        columns = columns if columns is not None else event_tx_columns(list(specs.values()))
+
+        query = self.create_events_query(
+            list(specs.values()),
+            block_range_dict["from_block"],
+            block_range_dict["to_block"],
+            await self.select_fields(columns if tx_data else [], logs=True, **block_range_dict),
+        )
+        data = await self.collect_pages(query, EVENTS_STREAM_CONFIG)
+        frames = self.build_event_frames(data, specs, tx_data=tx_data, columns=columns)
+        if binary:
+            frames = {name: to_binary(df, hex_columns(specs[name])) for name, df in frames.items()}
+        return frames
+
+    def get_event_specs(self, event_names: List[str]) -> dict[str, EventSpec]:
+        """
+        Look up registered events by name.
+
+        Args:
+            event_names (List[str]): The names of the events.
+
+        Returns:
+            dict[str, EventSpec]: The events keyed by name, in request order.
+
+        Raises:
+            ValueError: If an event name is not supported.
+        """
+        specs = {}
+        for event_name in event_names:
+            spec = self.registry.get(event_name)
+            if not spec:
+                raise ValueError(f"Unsupported event name: {event_name}")
+            specs[event_name] = spec
+        return specs
+
+    def create_events_query(
+        self,
+        specs: List[EventSpec],
+        from_block: int,
+        to_block: int,
+        field_selection: Optional[hypersync.FieldSelection] = None,
+    ) -> hypersync.Query:
+        """
+        Create a single query for the logs of several events.
+
+        Args:
+            specs (List[EventSpec]): The events to query.
+            from_block (int): The starting block number for the query.
+            to_block (int): The ending block number for the query.
+            field_selection (Optional[hypersync.FieldSelection]): Fields to request, optional. Defaults to every field.
+
+        Returns:
+            hypersync.Query: The constructed query object, with one log selection per contract.
+        """
+        # One log selection per contract, matching any of its events' topic0
+        topics_by_contract: dict[str, list[str]] = {}
+        for spec in specs:
+            topics_by_contract.setdefault(spec.contract, []).append(spec.topic0)
+
+        return self.create_query(
+            from_block=from_block,
+            to_block=to_block,
+            logs=[
+                hypersync.LogSelection(address=[contract], topics=[list(dict.fromkeys(topics))])
+                for contract, topics in topics_by_contract.items()
+            ],
+            field_selection=field_selection,
+        )
+
+    def build_event_frames(
+        self,
+        data: hypersync.ArrowResponseData,
+        specs: dict[str, EventSpec],
+        tx_data: bool = True,
+        columns: Optional[List[str]] = None,
+    ) -> dict[str, Optional[pl.DataFrame]]:
+        """
+        Route the raw logs of a multi-event response to their events, then decode and join each event's logs.
+
+        Args:
+            data (hypersync.ArrowResponseData): The Arrow tables of a response collected with `EVENTS_STREAM_CONFIG`.
+            specs (dict[str, EventSpec]): The queried events keyed by name.
+            tx_data (bool): Whether to include transaction data in the results.
+            columns (Optional[List[str]]): The transaction and block columns to join to the event logs, optional.
+
+        Returns:
+            dict[str, Optional[pl.DataFrame]]: The data of each event, or None for events without logs.
+        """
+        with measure("decode"):
+            logs_df = pl.from_arrow(data.logs)
+            transactions_df = pl.from_arrow(data.transactions)
+            blocks_df = pl.from_arrow(data.blocks)
+            self.index_transactions(transactions_df, logs_df)
+        with measure("join"):
+            txs_blocks_df = self.join_blocks(transactions_df, blocks_df)
+        logs_by_event = (
+            logs_df.partition_by("address", "topic0", as_dict=True)
+            if not logs_df.is_empty()
+            else {}
+        )
+
+        results = {}
+        for event_name, spec in specs.items():
+            event_logs_df = logs_by_event.get((spec.contract, spec.topic0))
+            if event_logs_df is None:
+                results[event_name] = None
+                continue
+
+            with measure("decode"):
+                decoded_logs_df = spec.decode(event_logs_df)
+            with measure("join"):
+                results[event_name] = self.join_logs(
+                    decoded_logs_df, event_logs_df, txs_blocks_df, tx_data=tx_data, columns=columns
+                )
+
+        return results
+
+    async def stream_event(
+        self,
+        event_name: str,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
+        address: Optional[str] = None,
+        tx_data: bool = True,
+        batch_size: int = 100_000,
+        concurrency: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        output: str = "polars",
+    ) -> AsyncIterator[pl.DataFrame | pa.Table]:
+        """
+        Stream a specific event by its name, yielding Polars DataFrames as each response page arrives.
+
+        Unlike `execute_event_query`, the block range is never materialized in memory at once. Each page is
+        decoded and joined to its transaction and block data on its own, and split into batches of at most
+        `batch_size` rows, so memory stays flat regardless of the size of the range. With Arrow output, pages are
+        built with `build_table` and yielded as Arrow tables, see `SyncHypersync.stream_event_reader` for a
+        `pyarrow.RecordBatchReader` over them.
+
+        Args:
+            event_name (str): The name of the event to query. See `execute_event_query` for available events.
+            from_block (Optional[int]): The starting block number, optional.
+            to_block (Optional[int]): The ending block number, optional.
+            block_range (Optional[int]): The range of blocks to query, optional.
+            from_time (Optional[int | datetime]): The starting time, optional. Requires a block index, see
+                `get_block_range`.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. Requires a block index.
+            address (Optional[str]): Optional address to filter the event logs.
+            tx_data (bool): Whether to include transaction data in the result.
+            batch_size (int): The maximum number of rows in each yielded DataFrame.
+            concurrency (Optional[int]): The number of pages Hypersync fetches ahead of the consumer, optional.
+            columns (Optional[List[str]]): The transaction and block columns to join to the event logs, optional.
+            output (str): The batch format, "polars" or "arrow".
+
+        Yields:
+            pl.DataFrame | pa.Table: Batches of the event data in block order.
+
+        Raises:
+            ValueError: If the event name or output format is not supported, or a time range is given without a
+                block index.
+        """
+        check_output(output)
+        spec = self.registry.get(event_name)
+        if not spec:
+            raise ValueError(f"Unsupported event name: {event_name}")
+
+        block_range_dict = await self.get_block_range(from_block, to_block, block_range, from_time, to_time)
+        columns = columns if columns is not None else event_tx_columns([spec])
+
+        query = self.create_query(
+            from_block=block_range_dict["from_block"],
+            to_block=block_range_dict["to_block"],
+            logs=[spec.select_logs(address)],
+            field_selection=create_field_selection(columns if tx_data else [], logs=True),
+        )
+
+        config = hypersync.StreamConfig(
+            hex_output=hypersync.HexOutput.PREFIXED,
+            event_signature=spec.signature,
+            column_mapping=spec.column_mapping,
+            max_num_logs=batch_size,
+            concurrency=concurrency,
+        )
+
+        build = self.build_table if output == "arrow" else self.build_frame
+        async for df in self.stream_frames(query, config, lambda data: build(data, tx_data=tx_data, columns=columns)):
+            for offset in range(0, len(df), batch_size):
+                yield df.slice(offset, batch_size)
+
+    async def stream_frames(
+        self,
+        query: hypersync.Query,
+        config: hypersync.StreamConfig,
+        build: Callable[[hypersync.ArrowResponseData], Optional[pl.DataFrame | pa.Table]],
+    ) -> AsyncIterator[pl.DataFrame | pa.Table]:
+        """
+        Stream a query, yielding a Polars DataFrame or Arrow table built from each response page as it arrives.
+
+        Transient failures are retried from the last received page, see `stream_pages`. Streams are not checkpointed,
+        as their pages are handed to the caller rather than collected, so `checkpoint_dir` doesn't apply.
+
+        Args:
+            query (hypersync.Query): The query object to execute.
+            config (hypersync.StreamConfig): The configuration for the data stream.
+            build (Callable[[hypersync.ArrowResponseData], Optional[pl.DataFrame | pa.Table]]): Builds the
+                DataFrame or table of a page, e.g. `build_frame` or `build_table`.
+
+        Yields:
+            pl.DataFrame | pa.Table: The non-empty DataFrame or table of each page, in block order.
+        """
+        async for response in self.stream_pages(query, config):
+            df = build(response.data)
+            if df is not None and len(df):
+                yield df
+
+    async def write_stream(
+        self,
+        sink: ParquetSink,
+        dataset: str,
+        query: hypersync.Query,
+        config: hypersync.StreamConfig,
+        build: Callable[[hypersync.ArrowResponseData], Optional[pl.DataFrame]],
+    ) -> List[dict]:
+        """
+        Stream a query into a Parquet sink page by page, so memory stays flat regardless of the size of the range.
+
+        Args:
+            sink (ParquetSink): The sink to write to.
+            dataset (str): The name of the dataset in the sink.
+            query (hypersync.Query): The query object to execute.
+            config (hypersync.StreamConfig): The configuration for the data stream.
+            build (Callable[[hypersync.ArrowResponseData], Optional[pl.DataFrame]]): Builds the DataFrame of a page.
+
+        Returns:
+            List[dict]: The manifest entries of the written files.
+        """
+        entries = []
+        async for df in self.stream_frames(query, config, build):
+            with measure("write"):
+                entries.extend(sink.write(dataset, df))
+        return entries
+
+    async def subscribe(
+        self,
+        event_names: List[str],
+        from_block: Optional[int] = None,
+        tx_data: bool = True,
+        columns: Optional[List[str]] = None,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 2.0,
+        reorg_depth: int = 64,
+    ) -> AsyncIterator[SubscriptionUpdate]:
+        """
+        Follow the chain head, yielding new rows of several events as their blocks are indexed.
+
+        A cursor is kept at the next unseen block, so each poll only fetches the blocks indexed since the last one.
+        While the chain head hasn't moved, polls back off exponentially from `poll_interval` to `max_poll_interval`.
+        Rows are de-duplicated by (block_number, log_index). When a response doesn't extend the previously seen chain,
+        an update with `rollback_block` set is yielded and the last `reorg_depth` blocks are fetched again. A response
+        starting after blocks received without a rollback guard is checked by looking up the current hash of the last
+        guarded block. Transient failures of polls are retried according to `retry`.
+
+        Args:
+            event_names (List[str]): The names of the events to follow. See `execute_event_query` for available events.
+            from_block (Optional[int]): The block to start from, optional. Defaults to the current height, so only
+                new events are yielded.
+            tx_data (bool): Whether to include transaction data in the results.
+            columns (Optional[List[str]]): The transaction and block columns to join to the event logs, optional.
+                Defaults to the union of the events' registered columns, see `event_tx_columns`.
+            poll_interval (float): The initial delay in seconds between polls at the chain head.
+            max_poll_interval (float): The maximum delay in seconds between polls at the chain head.
+            reorg_depth (int): The number of blocks fetched again after a reorg.
+
+        Yields:
+            SubscriptionUpdate: The new rows of each event, or a rollback notice.
+
+        Raises:
+            ValueError: If an event name is not supported.
+        """
+        specs = self.get_event_specs(event_names)
+        columns = columns if columns is not None else event_tx_columns(list(specs.values()))
+        field_selection = create_field_selection(columns if tx_data else [], logs=True)
+
+        start_block = from_block if from_block is not None else await self.retrying(lambda: self.get_height(max_age=0))
+        cursor = start_block
+        guard = None
+        seen = pl.DataFrame(schema={"block_number": pl.UInt64, "log_index": pl.UInt64})
+        delay = poll_interval
+        config = self.stream_config(EVENTS_STREAM_CONFIG)
+
+        while True:
+            height = await self.retrying(lambda: self.get_height(max_age=poll_interval))
+            if height < cursor:
+                # Nothing new at the chain head yet
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+                continue
+            delay = poll_interval
+
+            query = self.create_events_query(list(specs.values()), cursor, height + 1, field_selection)
+            response = await self.retrying(lambda: self.client.collect_arrow(query, config))
+
+            reorged = is_reorg(guard, response.rollback_guard)
+            if not reorged and crosses_gap(guard, response.rollback_guard):
+                # The parent hashes of the blocks in between were never seen, so check the last guarded block instead
+                reorged = await self.get_block_hash(guard.block_number) != guard.hash
+            if reorged:
+                cursor = max(start_block, cursor - reorg_depth)
+                guard = None
+                seen = seen.filter(pl.col("block_number") < cursor)
+                yield SubscriptionUpdate(events={}, next_block=cursor, rollback_block=cursor)
+                continue
+
+            events = {}
+            for event_name, df in self.build_event_frames(
+                response.data, specs, tx_data=tx_data, columns=columns
+            ).items():
+                if df is None:
+                    continue
+                keys = seen.schema
+                df = df.join(seen.cast({k: df.schema[k] for k in keys}), on=list(keys), how="anti")
+                if df.is_empty():
+                    continue
+                seen = pl.concat([seen, df.select(pl.col(k).cast(t) for k, t in keys.items())])
+                events[event_name] = df
+
+            cursor = max(cursor, response.next_block)
+            guard = response.rollback_guard or guard
+            # Positions below the reorg window can't be fetched again
+            seen = seen.filter(pl.col("block_number") >= cursor - reorg_depth)
+
+            if events:
+                yield SubscriptionUpdate(events=events, next_block=cursor)
 
     @timer
     async def get_blocks_txs(
@@ -625,10 +1954,19 @@ class Hypersync:
         from_block: Optional[int] = None,
         to_block: Optional[int] = None,
         block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
         save_data: bool = False,
-        print_time: bool = True,
+        print_time: bool = False,
         blocks_only=False,
-    ) -> Optional[pl.DataFrame]:
+        columns: Optional[List[str]] = None,
+        shards: Optional[int] = None,
+        max_concurrency: int = 4,
+        lazy: bool = False,
+        output: str = "polars",
+        sink: Optional[ParquetSink] = None,
+        binary: bool = False,
+    ) -> Optional[pl.DataFrame | pl.LazyFrame | pa.Table | List[dict]]:
         """
         Query for blocks and transactions within a specified block range and optionally save results.
 
@@ -636,71 +1974,356 @@ class Hypersync:
             from_block (Optional[int]): The starting block number, optional.
             to_block (Optional[int]): The ending block number, optional.
             block_range (Optional[int]): The range of blocks to query, optional.
+            from_time (Optional[int | datetime]): The starting time, optional. Requires a block index, see
+                `get_block_range`.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. Requires a block index.
             save_data (bool): Whether to save the data as a parquet file.
-            print_time (bool): Whether to print the execution time of the query.
+            print_time (bool): Whether to log the execution time of the query at info rather than debug level.
+                Timings are always passed to `listeners`.
+            columns (Optional[List[str]]): The transaction and block columns to request, optional. Defaults to
+                `TX_BLOCK_COLUMNS`, or every field when saving data.
+            shards (Optional[int]): Split the block range into this many chunks fetched concurrently, optional.
+            max_concurrency (int): The maximum number of chunks fetched at once when sharding.
+            lazy (bool): Whether to return a LazyFrame with the block join left unevaluated. Sharded results are
+                merged eagerly and returned as a LazyFrame over the merged data.
+            output (str): The result format, "polars" or "arrow". See `execute_event_query`.
+            sink (Optional[ParquetSink]): Stream the results page by page into this sink, under "transactions", instead
+                of returning them, optional.
+            binary (bool): Whether to return hashes, addresses and byte values as raw bytes instead of prefixed hex
+                strings, see `hex_columns`.
 
         Returns:
-            Optional[pl.DataFrame]: The collected blocks and transactions data as a Polars DataFrame, or None if no data is returned.
+            Optional[pl.DataFrame | pl.LazyFrame | pa.Table | List[dict]]: The collected blocks and transactions data
+                as a Polars DataFrame, LazyFrame if `lazy` is set, or Arrow table for Arrow output, or None if no data
+                is returned. With a sink, the manifest entries of the written files.
+
+        Raises:
+            ValueError: If sharding is combined with save_data or a sink, the output format is unsupported, or a time
+                range is given without a block index.
         """
-        block_range_dict = await self.get_block_range(from_block, to_block, block_range)
+        check_output(output, lazy)
+        block_range_dict = await self.get_block_range(from_block, to_block, block_range, from_time, to_time)
+
+        field_selection = None
+        if not save_data and not blocks_only:
+            field_selection = await self.select_fields(
+                columns if columns is not None else TX_BLOCK_COLUMNS, **block_range_dict
+            )
+        elif columns is not None:
+            field_selection = create_field_selection(columns, blocks_only=blocks_only)
 
-        if blocks_only:
+        config = hypersync.StreamConfig(
+            hex_output=hypersync.HexOutput.PREFIXED,
+            column_mapping=hypersync.ColumnMapping(
+                transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
+            ),
+        )
+
+        if sink is not None:
+            if save_data or shards:
+                raise ValueError("Sinks cannot be combined with save_data or sharding")
             query = self.create_query(
                 from_block=block_range_dict["from_block"],
                 to_block=block_range_dict["to_block"],
                 logs=[],
-                transactions=[],
+                transactions=[] if blocks_only else [hypersync.TransactionSelection()],
+                field_selection=field_selection,
             )
-        else:
+            return await self.write_stream(
+                sink, "transactions", query, config, lambda data: self.build_frame(data, columns=columns)
+            )
+
+        async def fetch(start: int, end: int) -> Optional[pl.DataFrame]:
             query = self.create_query(
-                from_block=block_range_dict["from_block"],
-                to_block=block_range_dict["to_block"],
+                from_block=start,
+                to_block=end,
                 logs=[],
-                transactions=[hypersync.TransactionSelection()],
+                transactions=[] if blocks_only else [hypersync.TransactionSelection()],
+                field_selection=field_selection,
+            )
+            return await self.collect_data(
+                query,
+                config,
+                save_data,
+                columns=columns,
+                lazy=lazy and not shards,
+                output="polars" if shards else output,
             )
 
-        config = hypersync.StreamConfig(
-            hex_output=hypersync.HexOutput.PREFIXED,
-            column_mapping=hypersync.ColumnMapping(
-                transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
-            ),
-        )
-        return await self.collect_data(query, config, save_data)
+        if shards:
+            if save_data:
+                raise ValueError("Sharded queries cannot save data")
+            result = await run_sharded(
+                fetch,
+                ShardPlanner(block_range_dict["from_block"], block_range_dict["to_block"], shards),
+                max_concurrency,
+            )
+            result = to_output(result, output, lazy)
+        else:
+            result = await fetch(block_range_dict["from_block"], block_range_dict["to_block"])
+        return to_binary(result, hex_columns()) if binary else result
 
     @timer
     async def search_txs(
-        self, txs: str | list[str], save_data: bool = False, print_time: bool = True
+        self,
+        txs: str | list[str],
+        save_data: bool = False,
+        print_time: bool = False,
+        columns: Optional[List[str]] = None,
+        max_gap: int = 1_000,
+        max_concurrency: int = 4,
     ) -> Optional[pl.DataFrame]:
         """
         Query for specific transactions or a list of transactions
 
+        With a transaction index, only the block ranges holding indexed transactions are queried, grouping blocks at
+        most `max_gap` apart into one range. Transactions missing from the index, or from their indexed block, are
+        searched for from block 0 to the chain head.
+
         Args:
-            save_data (bool): Whether to save the data as a parquet file.
-            print_time (bool): Whether to print the execution time of the query.
+            txs (str | list[str]): The transaction hash or hashes to search for.
+            save_data (bool): Whether to save the data as a parquet file. Saving always scans the whole chain.
+            print_time (bool): Whether to log the execution time of the query at info rather than debug level.
+                Timings are always passed to `listeners`.
+            columns (Optional[List[str]]): The transaction and block columns to request, optional. Defaults to
+                `TX_BLOCK_COLUMNS`, or every field when saving data.
+            max_gap (int): The largest gap between indexed blocks queried in the same range.
+            max_concurrency (int): The maximum number of indexed block ranges queried at once.
 
         Returns:
             Optional[pl.DataFrame]: The collected blocks and transactions data as a Polars DataFrame, or None if no data is returned.
+
+        Raises:
+            ValueError: If a hash isn't a prefixed hex 32 byte hash.
         """
         # Ensure txs is a list
         if isinstance(txs, str):
             txs = [txs]  # Convert single string to a list
+        check_tx_hashes(txs)
+        txs = [tx.lower() for tx in txs]
 
-        block_range_dict = await self.get_block_range(from_block=None)
-
-        query = self.create_query(
-            from_block=0,
-            to_block=block_range_dict["to_block"],
-            logs=[],
-            transactions=[hypersync.TransactionSelection(hash=txs)],
+        field_selection = (
+            None if save_data and columns is None
+            else create_field_selection(columns or TX_BLOCK_COLUMNS)
         )
-
         config = hypersync.StreamConfig(
             hex_output=hypersync.HexOutput.PREFIXED,
             column_mapping=hypersync.ColumnMapping(
                 transaction=COMMON_TRANSACTION_MAPPING, block=COMMMON_BLOCK_MAPPING
             ),
         )
-        return await self.collect_data(query, config, save_data)
+
+        async def fetch(start: int, end: int, hashes: List[str]) -> Optional[pl.DataFrame]:
+            query = self.create_query(
+                from_block=start,
+                to_block=end,
+                logs=[],
+                transactions=[hypersync.TransactionSelection(hash=hashes)],
+                field_selection=field_selection,
+            )
+            return await self.collect_data(
+                query, config, save_data, columns=columns or TX_BLOCK_COLUMNS
+            )
+
+        async def scan(hashes: List[str]) -> Optional[pl.DataFrame]:
+            block_range_dict = await self.get_block_range(from_block=None)
+            return await fetch(0, block_range_dict["to_block"], hashes)
+
+        if self.tx_index is None or save_data:
+            return await scan(txs)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_located(start: int, end: int, hashes: List[str]) -> Optional[pl.DataFrame]:
+            async with semaphore:
+                return await fetch(start, end, hashes)
+
+        located = self.tx_index.lookup(txs)
+        frames = await asyncio.gather(
+            *(fetch_located(start, end, hashes) for start, end, hashes in group_block_ranges(located, max_gap))
+        )
+        frames = [df for df in frames if df is not None]
+
+        # Fall back to a full scan for transactions that weren't found where the index located them
+        found = set(pl.concat(frames, how="diagonal_relaxed")["hash"].to_list()) if frames else set()
+        misses = [tx for tx in dict.fromkeys(txs) if tx not in found]
+        if misses:
+            missed_df = await scan(misses)
+            if missed_df is not None:
+                frames.append(missed_df)
+
+        return pl.concat(frames, how="diagonal_relaxed") if frames else None
+
+    async def backfill_tx_index(
+        self,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        block_range: Optional[int] = None,
+        shards: Optional[int] = None,
+        max_concurrency: int = 4,
+    ) -> int:
+        """
+        Fill the transaction index with every transaction of a block range, and save it if it has a path.
+
+        Only transaction hashes and block numbers are requested.
+
+        Args:
+            from_block (Optional[int]): The starting block number, optional.
+            to_block (Optional[int]): The ending block number, optional.
+            block_range (Optional[int]): The range of blocks to index, optional.
+            shards (Optional[int]): Split the block range into this many chunks fetched concurrently, optional.
+            max_concurrency (int): The maximum number of chunks fetched at once when sharding.
+
+        Returns:
+            int: The number of indexed transactions.
+
+        Raises:
+            ValueError: If the client has no transaction index.
+        """
+        if self.tx_index is None:
+            raise ValueError("Backfilling requires a transaction index")
+
+        await self.get_blocks_txs(
+            from_block=from_block,
+            to_block=to_block,
+            block_range=block_range,
+            print_time=False,
+            columns=["hash"],
+            shards=shards,
+            max_concurrency=max_concurrency,
+        )
+        if self.tx_index.path:
+            self.tx_index.save()
+        return len(self.tx_index)
+
+    async def update_commitment_book(self, book: CommitmentBook, to_block: Optional[int] = None) -> int:
+        """
+        Ingest the commitment events since the book's next block, and save the book if it has a path.
+
+        The three commitment events are fetched in one scan of the new blocks only.
+
+        Args:
+            book (CommitmentBook): The book to update.
+            to_block (Optional[int]): The ending block number, optional. Defaults to the block after the chain height,
+                so the latest block is included.
+
+        Returns:
+            int: The number of ingested events.
+        """
+        to_block = to_block or await self.get_height() + 1
+        if to_block <= book.next_block:
+            return 0
+        events = await self.execute_events_query(
+            list(COMMITMENT_EVENTS), from_block=book.next_block, to_block=to_block, print_time=False, tx_data=False
+        )
+        ingested = book.ingest(events, next_block=to_block)
+        if book.path:
+            book.save()
+        return ingested
+
+    async def update_bidder_ledger(self, ledger: BidderLedger, to_block: Optional[int] = None) -> int:
+        """
+        Ingest the bidder registry events since the ledger's next block, and save the ledger if it has a path.
+
+        The deposit, withdrawal, retrieval and reward events are fetched in one scan of the new blocks only.
+
+        Args:
+            ledger (BidderLedger): The ledger to update.
+            to_block (Optional[int]): The ending block number, optional. Defaults to the block after the chain height,
+                so the latest block is included.
+
+        Returns:
+            int: The number of ingested events.
+        """
+        to_block = to_block or await self.get_height() + 1
+        if to_block <= ledger.next_block:
+            return 0
+        events = await self.execute_events_query(
+            list(LEDGER_EVENTS), from_block=ledger.next_block, to_block=to_block, print_time=False, tx_data=False
+        )
+        ingested = ledger.ingest(events, next_block=to_block)
+        if ledger.path:
+            ledger.save()
+        return ingested
+
+    async def update_provider_state(self, state: ProviderState, to_block: Optional[int] = None) -> int:
+        """
+        Ingest the provider registry events since the state's next block, and save the state if it has a path.
+
+        The registration, deposit, withdrawal and slashing events are fetched in one scan of the new blocks only.
+
+        Args:
+            state (ProviderState): The state to update.
+            to_block (Optional[int]): The ending block number, optional. Defaults to the block after the chain height,
+                so the latest block is included.
+
+        Returns:
+            int: The number of ingested events.
+        """
+        to_block = to_block or await self.get_height() + 1
+        if to_block <= state.next_block:
+            return 0
+        events = await self.execute_events_query(
+            list(PROVIDER_EVENTS), from_block=state.next_block, to_block=to_block, print_time=False, tx_data=False
+        )
+        ingested = state.ingest(events, next_block=to_block)
+        if state.path:
+            state.save()
+        return ingested
+
+    async def update_validator_index(self, index: ValidatorIndex, to_block: Optional[int] = None) -> int:
+        """
+        Ingest the validator registry events since the index's next block, and save the index if it has a path.
+
+        The staking, unstaking, withdrawal and slashing events are fetched in one scan of the new blocks only.
+
+        Args:
+            index (ValidatorIndex): The index to update.
+            to_block (Optional[int]): The ending block number, optional. Defaults to the block after the chain height,
+                so the latest block is included.
+
+        Returns:
+            int: The number of ingested events.
+        """
+        to_block = to_block or await self.get_height() + 1
+        if to_block <= index.next_block:
+            return 0
+        events = await self.execute_events_query(
+            list(VALIDATOR_EVENTS), from_block=index.next_block, to_block=to_block, print_time=False, tx_data=False
+        )
+        ingested = index.ingest(events, next_block=to_block)
+        if index.path:
+            index.save()
+        return ingested
+
+    async def update_block_index(
+        self, index: BlockIndex, from_block: Optional[int] = None, to_block: Optional[int] = None
+    ) -> int:
+        """
+        Append the blocks since the index's next block, and save the index if it has a path.
+
+        Only the number, timestamp, base fee and gas used of each block are requested.
+
+        Args:
+            index (BlockIndex): The index to update.
+            from_block (Optional[int]): The first block of an empty index, optional. Defaults to block 0.
+            to_block (Optional[int]): The ending block number, optional. Defaults to the block after the chain height,
+                so the latest block is included.
+
+        Returns:
+            int: The number of appended blocks.
+        """
+        to_block = to_block or await self.get_height() + 1
+        start = index.next_block if len(index) else (from_block or 0)
+        if to_block <= start:
+            return 0
+        blocks = await self.get_blocks(
+            from_block=start, to_block=to_block, print_time=False, columns=list(INDEX_SCHEMA), output="arrow"
+        )
+        ingested = index.ingest(blocks) if blocks is not None else 0
+        if ingested and index.path:
+            index.save()
+        return ingested
 
     @timer
     async def get_blocks(
@@ -708,9 +2331,15 @@ class Hypersync:
         from_block: Optional[int] = None,
         to_block: Optional[int] = None,
         block_range: Optional[int] = None,
+        from_time: Optional[int | datetime] = None,
+        to_time: Optional[int | datetime] = None,
         save_data: bool = False,
-        print_time: bool = True,
-    ) -> Optional[pl.DataFrame]:
+        print_time: bool = False,
+        columns: Optional[List[str]] = None,
+        output: str = "polars",
+        sink: Optional[ParquetSink] = None,
+        binary: bool = False,
+    ) -> Optional[pl.DataFrame | pa.Table | List[dict]]:
         """
         Query for blocks within a specified block range and optionally save results.
 
@@ -718,14 +2347,31 @@ class Hypersync:
             from_block (Optional[int]): The starting block number, optional.
             to_block (Optional[int]): The ending block number, optional.
             block_range (Optional[int]): The range of blocks to query, optional.
+            from_time (Optional[int | datetime]): The starting time, optional. Requires a block index, see
+                `get_block_range`.
+            to_time (Optional[int | datetime]): The ending time, exclusive, optional. Requires a block index.
             save_data (bool): Whether to save the data as a parquet file.
-            print_time (bool): Whether to print the execution time of the query.
+            print_time (bool): Whether to log the execution time of the query at info rather than debug level.
+                Timings are always passed to `listeners`.
+            columns (Optional[List[str]]): The block columns to request, optional. Defaults to every block field.
+            output (str): The result format. "arrow" returns Hypersync's Arrow table of blocks as is.
+            sink (Optional[ParquetSink]): Stream the blocks page by page into this sink, under "blocks", instead of
+                collecting them in memory, optional.
+            binary (bool): Whether to return hashes and byte values as raw bytes instead of prefixed hex strings, see
+                `hex_columns`.
 
         Returns:
-            Optional[pl.DataFrame]: The collected block data as a Polars DataFrame, or None if no data is returned.
+            Optional[pl.DataFrame | pa.Table | List[dict]]: The collected block data as a Polars DataFrame, or Arrow
+                table for Arrow output, or None if no data is returned. With a sink, the manifest entries of the
+                written files.
+
+        Raises:
+            ValueError: If the output format is unsupported, or a time range is given without a block index.
         """
+        check_output(output)
+
         # Get the block range to query
-        block_range_dict = await self.get_block_range(from_block, to_block, block_range)
+        block_range_dict = await self.get_block_range(from_block, to_block, block_range, from_time, to_time)
 
         # Create a query for blocks only
         query = self.create_query(
@@ -734,6 +2380,10 @@ class Hypersync:
             logs=[],
             transactions=[],
             blocks=[hypersync.BlockSelection()],
+            field_selection=(
+                None if columns is None
+                else create_field_selection(columns, blocks_only=True)
+            ),
         )
 
         # Configure the stream settings for blocks
@@ -742,12 +2392,29 @@ class Hypersync:
             column_mapping=hypersync.ColumnMapping(block=COMMMON_BLOCK_MAPPING),
         )
 
+        if sink is not None:
+            return await self.write_stream(
+                sink, "blocks", query, config, lambda data: pl.from_arrow(data.blocks)
+            )
+
         # Collect block data
-        data = await self.client.collect_arrow(query, config)
-        blocks_df = pl.from_arrow(data.data.blocks)
+        data = await self.collect_pages(query, config)
+        if output == "arrow":
+            blocks = data.blocks
+            if save_data and blocks.num_rows:
+                with measure("write"):
+                    pq.write_table(blocks, self.blocks_data_path())
+            if not blocks.num_rows:
+                return None
+            return to_binary(blocks, hex_columns()) if binary else blocks
+
+        blocks_df = pl.from_arrow(data.blocks)
 
         # Save data as parquet file if required
         if save_data and not blocks_df.is_empty():
-            blocks_df.write_parquet("blocks_data.parquet")
+            with measure("write"):
+                blocks_df.write_parquet(self.blocks_data_path())
 
-        return blocks_df if not blocks_df.is_empty() else None
+        if blocks_df.is_empty():
+            return None
+        return to_binary(blocks_df, hex_columns()) if binary else blocks_df
@@ -0,0 +1,228 @@
+import time
+import warnings
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+# Phases of a query. Network time covers waiting for Hypersync responses, including Hypersync's own decoding
+PHASES = ("network", "decode", "join", "write")
+
+
+@dataclass
+class QueryMetrics:
+    """
+    The span of one public query method call, e.g. `execute_event_query`.
+
+    Phase times and counters are summed over everything the query does, including concurrent shard requests, so phase
+    times can add up to more than `duration`.
+
+    Attributes:
+        name (str): The name of the query method.
+        started_at (float): The wall clock start time, in seconds since the epoch.
+        duration (float): The elapsed time in seconds, set when the query finishes.
+        phases (dict[str, float]): The seconds spent in each phase, see `PHASES`.
+        rows (dict[str, int]): The rows received per response table, e.g. "logs" or "transactions".
+        bytes_received (int): The size of the received Arrow tables in bytes.
+        from_block (Optional[int]): The first block queried, optional.
+        to_block (Optional[int]): The end of the queried blocks, exclusive, optional.
+        requests (int): The number of Hypersync requests or streams started.
+        retries (int): The number of retried requests.
+        cache_hit_blocks (int): The number of blocks served from the event cache.
+        cache_miss_blocks (int): The number of blocks fetched because they were missing from the event cache.
+        error (Optional[str]): The error the query failed with, optional.
+        parent (Optional[QueryMetrics]): The query this one was called from, optional.
+    """
+
+    name: str
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    rows: dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    from_block: Optional[int] = None
+    to_block: Optional[int] = None
+    requests: int = 0
+    retries: int = 0
+    cache_hit_blocks: int = 0
+    cache_miss_blocks: int = 0
+    error: Optional[str] = None
+    parent: Optional["QueryMetrics"] = field(default=None, repr=False)
+
+    @property
+    def block_range(self) -> Optional[int]:
+        """The number of blocks queried, if known."""
+        if self.from_block is None or self.to_block is None:
+            return None
+        return self.to_block - self.from_block
+
+
+# The metrics of the query running in the current task, inherited by the tasks it starts
+CURRENT_METRICS: ContextVar[Optional[QueryMetrics]] = ContextVar("current_metrics", default=None)
+
+
+def current_metrics() -> Optional[QueryMetrics]:
+    """The metrics of the running query, or None outside of a query."""
+    return CURRENT_METRICS.get()
+
+
+@contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """
+    Add the time spent in the block to a phase of the running query. Does nothing outside of a query.
+
+    Args:
+        phase (str): The phase, see `PHASES`.
+    """
+    metrics = CURRENT_METRICS.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def record_response(data) -> None:
+    """
+    Count the rows and bytes of a received response page in the running query.
+
+    Args:
+        data (hypersync.ArrowResponseData): The data of the page.
+    """
+    metrics = CURRENT_METRICS.get()
+    if metrics is None:
+        return
+    for name in ("logs", "transactions", "blocks"):
+        table = getattr(data, name, None)
+        if table is not None:
+            metrics.rows[name] = metrics.rows.get(name, 0) + table.num_rows
+            metrics.bytes_received += table.nbytes
+
+
+def record_range(from_block: int, to_block: Optional[int]) -> None:
+    """Widen the block range of the running query to cover a requested range."""
+    metrics = CURRENT_METRICS.get()
+    if metrics is None:
+        return
+    metrics.requests += 1
+    metrics.from_block = from_block if metrics.from_block is None else min(metrics.from_block, from_block)
+    if to_block is not None:
+        metrics.to_block = to_block if metrics.to_block is None else max(metrics.to_block, to_block)
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    Add to a counter of the running query, e.g. "retries" or "cache_hit_blocks".
+
+    Args:
+        name (str): The counter attribute of `QueryMetrics`.
+        value (int): The amount to add.
+    """
+    metrics = CURRENT_METRICS.get()
+    if metrics is not None:
+        setattr(metrics, name, getattr(metrics, name) + value)
+
+
+def notify(listeners: List[Callable[[QueryMetrics], None]], metrics: QueryMetrics) -> None:
+    """
+    Pass finished metrics to listeners. A failing listener is reported as a warning and doesn't fail the query.
+
+    Args:
+        listeners (List[Callable[[QueryMetrics], None]]): The listeners.
+        metrics (QueryMetrics): The metrics of the finished query.
+    """
+    for listener in listeners:
+        try:
+            listener(metrics)
+        except Exception as e:
+            warnings.warn(f"Query metrics listener {listener!r} failed: {e}", RuntimeWarning)
+
+
+def opentelemetry_listener(tracer=None) -> Callable[[QueryMetrics], None]:
+    """
+    Create a listener recording each query as an OpenTelemetry span, with its metrics as span attributes.
+
+    Requires the optional `opentelemetry-api` package.
+
+    Args:
+        tracer (Optional[opentelemetry.trace.Tracer]): The tracer to record spans with, optional. Defaults to the
+            tracer of this package from the global tracer provider.
+
+    Returns:
+        Callable[[QueryMetrics], None]: The listener.
+    """
+    from opentelemetry import trace
+
+    tracer = tracer or trace.get_tracer("mev_commit_sdk_py")
+
+    def listener(metrics: QueryMetrics) -> None:
+        start_ns = int(metrics.started_at * 1e9)
+        span = tracer.start_span(f"hypersync.{metrics.name}", start_time=start_ns)
+        attributes = {
+            "hypersync.bytes_received": metrics.bytes_received,
+            "hypersync.requests": metrics.requests,
+            "hypersync.retries": metrics.retries,
+            "hypersync.cache_hit_blocks": metrics.cache_hit_blocks,
+            "hypersync.cache_miss_blocks": metrics.cache_miss_blocks,
+            **{f"hypersync.{phase}_seconds": seconds for phase, seconds in metrics.phases.items()},
+            **{f"hypersync.rows.{table}": rows for table, rows in metrics.rows.items()},
+        }
+        if metrics.from_block is not None:
+            attributes["hypersync.from_block"] = metrics.from_block
+        if metrics.to_block is not None:
+            attributes["hypersync.to_block"] = metrics.to_block
+        span.set_attributes(attributes)
+        if metrics.error:
+            span.set_status(trace.Status(trace.StatusCode.ERROR, metrics.error))
+        span.end(end_time=start_ns + int(metrics.duration * 1e9))
+
+    return listener
+
+
+def prometheus_listener(registry=None, namespace: str = "hypersync") -> Callable[[QueryMetrics], None]:
+    """
+    Create a listener exporting query metrics as Prometheus histograms and counters labelled by query name.
+
+    Requires the optional `prometheus_client` package. The metrics are registered on creation, so create the listener
+    once per registry.
+
+    Args:
+        registry (Optional[prometheus_client.CollectorRegistry]): The registry of the metrics, optional. Defaults to
+            the global registry.
+        namespace (str): The prefix of the metric names.
+
+    Returns:
+        Callable[[QueryMetrics], None]: The listener.
+    """
+    import prometheus_client
+
+    kwargs = {"namespace": namespace, "registry": registry or prometheus_client.REGISTRY}
+    duration = prometheus_client.Histogram("query_seconds", "Query duration", ["query"], **kwargs)
+    phases = prometheus_client.Histogram("query_phase_seconds", "Time per query phase", ["query", "phase"], **kwargs)
+    rows = prometheus_client.Counter("rows_received", "Rows received per table", ["query", "table"], **kwargs)
+    received = prometheus_client.Counter("bytes_received", "Arrow bytes received", ["query"], **kwargs)
+    blocks = prometheus_client.Histogram("query_blocks", "Blocks per query", ["query"], **kwargs)
+    retries = prometheus_client.Counter("retries", "Retried requests", ["query"], **kwargs)
+    cache_blocks = prometheus_client.Counter("cache_blocks", "Event cache blocks", ["query", "result"], **kwargs)
+    errors = prometheus_client.Counter("query_errors", "Failed queries", ["query"], **kwargs)
+
+    def listener(metrics: QueryMetrics) -> None:
+        duration.labels(metrics.name).observe(metrics.duration)
+        for phase, seconds in metrics.phases.items():
+            phases.labels(metrics.name, phase).observe(seconds)
+        for table, count in metrics.rows.items():
+            rows.labels(metrics.name, table).inc(count)
+        received.labels(metrics.name).inc(metrics.bytes_received)
+        if metrics.block_range is not None:
+            blocks.labels(metrics.name).observe(metrics.block_range)
+        retries.labels(metrics.name).inc(metrics.retries)
+        cache_blocks.labels(metrics.name, "hit").inc(metrics.cache_hit_blocks)
+        cache_blocks.labels(metrics.name, "miss").inc(metrics.cache_miss_blocks)
+        if metrics.error:
+            errors.labels(metrics.name).inc()
+
+    return listener
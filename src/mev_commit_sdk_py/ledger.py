@@ -0,0 +1,243 @@
+import os
+import pyarrow.parquet as pq
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# The bidder registry events of the ledger, with their amount and window parameters and the flow they record.
+# Retrieved and rewarded funds both leave the bidder's deposit for the window
+LEDGER_FLOWS = {
+    "BidderRegistered": ("depositedAmount", "windowNumber", "deposited"),
+    "BidderWithdrawal": ("amount", "window", "withdrawn"),
+    "FundsRetrieved": ("amount", "window", "retrieved"),
+    "FundsRewarded": ("amount", "window", "rewarded"),
+}
+LEDGER_EVENTS = tuple(LEDGER_FLOWS)
+FLOWS = tuple(flow for _, _, flow in LEDGER_FLOWS.values())
+
+# Schema of the ingested flows, one row per event in block order
+FLOW_SCHEMA = {
+    "bidder": pl.String,
+    "window": pl.UInt64,
+    "block_number": pl.UInt64,
+    "log_index": pl.UInt64,
+    "flow": pl.String,
+    "amount": pl.Decimal(38, 0),
+}
+
+# Schema of the balances, one row per bidder and window
+BALANCE_SCHEMA = {
+    "bidder": pl.String,
+    "window": pl.UInt64,
+    **{flow: pl.Decimal(38, 0) for flow in FLOWS},
+    "locked": pl.Decimal(38, 0),
+}
+
+
+def aggregate_flows(flows: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Sum flows into the balance of each bidder and window.
+
+    Args:
+        flows (pl.DataFrame | pl.LazyFrame): Rows in `FLOW_SCHEMA`.
+
+    Returns:
+        pl.LazyFrame: The balances in `BALANCE_SCHEMA`, sorted by bidder and window.
+    """
+    return (
+        flows.lazy()
+        .group_by("bidder", "window")
+        .agg(pl.col("amount").filter(pl.col("flow") == flow).sum().alias(flow) for flow in FLOWS)
+        .with_columns(locked=pl.col("deposited") - pl.col("withdrawn") - pl.col("retrieved") - pl.col("rewarded"))
+        .sort("bidder", "window")
+    )
+
+
+@dataclass
+class BidderLedger:
+    """
+    The deposits of every bidder per window, maintained incrementally from bidder registry events.
+
+    Each event is kept as a flow of one bidder and window, and the running balance of each pair is updated with a
+    group-by over the new flows only. Balances as of an earlier block are summed from the flows up to that block, for
+    all bidders at once. The locked balance of a window is its deposits minus its withdrawals and the funds retrieved
+    and rewarded from it.
+
+    Events must be ingested in block order. Events below `next_block` are skipped as already ingested, so overlapping
+    refreshes are harmless.
+
+    Attributes:
+        path (Optional[str]): The Parquet file persisting the flows, optional. Loaded on creation if it exists.
+        next_block (int): The first block not ingested yet.
+    """
+
+    path: Optional[str] = None
+    next_block: int = 0
+    _flows: pl.DataFrame = field(init=False, repr=False)
+    _pending: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _balances: pl.DataFrame = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the persisted flows, if any."""
+        if self.path and os.path.exists(self.path):
+            table = pq.read_table(self.path)
+            self.next_block = int(table.schema.metadata[b"next_block"])
+            self._flows = pl.from_arrow(table)
+        else:
+            self._flows = pl.DataFrame(schema=FLOW_SCHEMA)
+        self._balances = aggregate_flows(self._flows).collect()
+
+    def ingest(self, events: dict[str, Optional[pl.DataFrame]], next_block: Optional[int] = None) -> int:
+        """
+        Apply new bidder registry events to the ledger.
+
+        Args:
+            events (dict[str, Optional[pl.DataFrame]]): The rows of each event, e.g. the result of
+                `Hypersync.execute_events_query` or the events of a subscription update. Rows need the event
+                parameters and "block_number", and are ordered by "log_index" if present. Other events are ignored.
+            next_block (Optional[int]): The first block not covered by the events, optional. Defaults to the block
+                after the last event.
+
+        Returns:
+            int: The number of applied events.
+        """
+        frames = []
+        for event_name, (amount, window, flow) in LEDGER_FLOWS.items():
+            df = events.get(event_name)
+            if df is None or df.is_empty():
+                continue
+            log_index = pl.col("log_index") if "log_index" in df.columns else pl.lit(0)
+            frames.append(
+                df.filter(pl.col("block_number") >= self.next_block).select(
+                    pl.col("bidder").str.to_lowercase(),
+                    pl.col(window).cast(pl.UInt64).alias("window"),
+                    pl.col("block_number").cast(pl.UInt64),
+                    log_index.cast(pl.UInt64).alias("log_index"),
+                    pl.lit(flow).alias("flow"),
+                    pl.col(amount).cast(pl.Decimal(38, 0)).alias("amount"),
+                )
+            )
+        new = pl.concat(frames).sort("block_number", "log_index") if frames else pl.DataFrame(schema=FLOW_SCHEMA)
+
+        if not new.is_empty():
+            self._pending.append(new)
+            self._balances = (
+                pl.concat([self._balances.lazy(), aggregate_flows(new)])
+                .group_by("bidder", "window")
+                .agg(pl.col(*FLOWS, "locked").sum())
+                .sort("bidder", "window")
+                .collect()
+            )
+            self.next_block = max(self.next_block, new["block_number"][-1] + 1)
+        if next_block is not None:
+            self.next_block = max(self.next_block, next_block)
+        return new.height
+
+    def apply(self, update) -> int:
+        """
+        Apply an update of `Hypersync.subscribe`, rolling the ledger back on reorgs.
+
+        Args:
+            update (SubscriptionUpdate): The update of a subscription including the bidder registry events.
+
+        Returns:
+            int: The number of applied events.
+        """
+        if update.rollback_block is not None:
+            self.rollback(update.rollback_block)
+            return 0
+        return self.ingest(update.events, update.next_block)
+
+    def rollback(self, block_number: int) -> None:
+        """
+        Undo every event at or above a block, e.g. after a reorg, so the blocks can be ingested again.
+
+        Args:
+            block_number (int): The first block to undo.
+        """
+        flows = self.flows
+        self._flows = flows.head(flows["block_number"].search_sorted(block_number, side="left"))
+        self._balances = aggregate_flows(self._flows).collect()
+        self.next_block = min(self.next_block, block_number)
+
+    @property
+    def flows(self) -> pl.DataFrame:
+        """Every ingested event in `FLOW_SCHEMA`, in block order."""
+        if self._pending:
+            self._flows = pl.concat([self._flows, *self._pending], rechunk=True)
+            self._pending = []
+        return self._flows
+
+    def balances(
+        self,
+        block_number: Optional[int] = None,
+        windows: Optional[int | List[int]] = None,
+        bidders: Optional[str | List[str]] = None,
+    ) -> pl.DataFrame:
+        """
+        Get the balance of every bidder per window as of a block.
+
+        The running balances are returned as is for the latest block. Earlier blocks sum the flows up to the block.
+
+        Args:
+            block_number (Optional[int]): The block, inclusive, optional. Defaults to the last ingested block.
+            windows (Optional[int | List[int]]): Only return these windows, optional.
+            bidders (Optional[str | List[str]]): Only return these bidders, optional.
+
+        Returns:
+            pl.DataFrame: The balances in `BALANCE_SCHEMA`, sorted by bidder and window.
+        """
+        if block_number is None or block_number >= self.next_block - 1:
+            balances = self._balances.lazy()
+        else:
+            flows = self.flows
+            balances = aggregate_flows(flows.head(flows["block_number"].search_sorted(block_number, side="right")))
+
+        if windows is not None:
+            windows = [windows] if isinstance(windows, int) else windows
+            balances = balances.filter(pl.col("window").is_in(windows))
+        if bidders is not None:
+            bidders = [bidders] if isinstance(bidders, str) else bidders
+            balances = balances.filter(pl.col("bidder").is_in([b.lower() for b in bidders]))
+        return balances.collect().cast(BALANCE_SCHEMA)
+
+    def locked(self, block_number: Optional[int] = None, windows: Optional[int | List[int]] = None) -> pl.DataFrame:
+        """
+        Get the locked funds of every bidder with funds still locked as of a block.
+
+        Args:
+            block_number (Optional[int]): The block, inclusive, optional. Defaults to the last ingested block.
+            windows (Optional[int | List[int]]): Only count these windows, optional.
+
+        Returns:
+            pl.DataFrame: The "bidder", the number of "windows" with locked funds and the total "locked" amount.
+        """
+        return (
+            self.balances(block_number, windows)
+            .filter(pl.col("locked") > 0)
+            .group_by("bidder")
+            .agg(pl.len().alias("windows"), pl.col("locked").sum())
+            .sort("bidder")
+        )
+
+    def save(self) -> None:
+        """
+        Persist the flows and the next block to `path`, atomically replacing the previous file.
+
+        Raises:
+            ValueError: If the ledger has no path.
+        """
+        if not self.path:
+            raise ValueError("Bidder ledger has no path to save to")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = self.flows.to_arrow()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), "next_block": str(self.next_block)})
+        tmp_path = f"{self.path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return self.flows.height
@@ -0,0 +1,110 @@
+import threading
+import hypersync
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """
+    Transport settings of a Hypersync client. Hypersync instances with the same URL and settings share one client.
+
+    Attributes:
+        bearer_token (Optional[str]): The bearer token sent with every request, optional.
+        api_token (Optional[str]): The legacy API token, optional.
+        http_req_timeout_millis (Optional[int]): The timeout of each HTTP request in milliseconds, optional.
+        max_num_retries (Optional[int]): The number of retries of a failed request, optional.
+        retry_backoff_ms (Optional[int]): The backoff added between retries in milliseconds, optional.
+        retry_base_ms (Optional[int]): The initial retry delay in milliseconds, optional.
+        retry_ceiling_ms (Optional[int]): The maximum retry delay in milliseconds, optional.
+        proactive_rate_limit_sleep (Optional[bool]): Whether to wait for the rate limit window before sending
+            requests that would exceed it, optional.
+    """
+
+    bearer_token: Optional[str] = field(default=None, repr=False)
+    api_token: Optional[str] = field(default=None, repr=False)
+    http_req_timeout_millis: Optional[int] = None
+    max_num_retries: Optional[int] = None
+    retry_backoff_ms: Optional[int] = None
+    retry_base_ms: Optional[int] = None
+    retry_ceiling_ms: Optional[int] = None
+    proactive_rate_limit_sleep: Optional[bool] = None
+
+    def client_config(self, url: str) -> hypersync.ClientConfig:
+        """
+        Build the Hypersync client configuration of these settings.
+
+        Args:
+            url (str): The URL of the Hypersync service.
+
+        Returns:
+            hypersync.ClientConfig: The client configuration.
+        """
+        return hypersync.ClientConfig(
+            url=url,
+            bearer_token=self.bearer_token,
+            api_token=self.api_token,
+            http_req_timeout_millis=self.http_req_timeout_millis,
+            max_num_retries=self.max_num_retries,
+            retry_backoff_ms=self.retry_backoff_ms,
+            retry_base_ms=self.retry_base_ms,
+            retry_ceiling_ms=self.retry_ceiling_ms,
+            proactive_rate_limit_sleep=self.proactive_rate_limit_sleep,
+        )
+
+
+@dataclass
+class ClientPool:
+    """
+    A reference counted pool of Hypersync clients keyed by URL and settings.
+
+    Each client keeps its own HTTP connection pool, so sharing clients lets short-lived `Hypersync` instances reuse
+    warm connections instead of paying connection setup and TLS handshakes again. A client is dropped from the pool
+    once every instance using it is closed.
+    """
+
+    _clients: dict[tuple[str, ClientSettings], list] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def acquire(self, url: str, settings: ClientSettings) -> hypersync.HypersyncClient:
+        """
+        Get the shared client of a URL and settings, creating it if needed.
+
+        Args:
+            url (str): The URL of the Hypersync service.
+            settings (ClientSettings): The client settings.
+
+        Returns:
+            hypersync.HypersyncClient: The shared client.
+        """
+        with self._lock:
+            entry = self._clients.get((url, settings))
+            if entry is None:
+                entry = [hypersync.HypersyncClient(settings.client_config(url)), 0]
+                self._clients[(url, settings)] = entry
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, url: str, settings: ClientSettings) -> None:
+        """
+        Release a client acquired with `acquire`, dropping it from the pool once it is no longer used.
+
+        Args:
+            url (str): The URL of the Hypersync service.
+            settings (ClientSettings): The client settings.
+        """
+        with self._lock:
+            entry = self._clients.get((url, settings))
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._clients[(url, settings)]
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# The pool shared by Hypersync instances by default
+CLIENT_POOL = ClientPool()
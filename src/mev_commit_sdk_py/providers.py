@@ -0,0 +1,316 @@
+import os
+import pyarrow.parquet as pq
+import polars as pl
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# The provider registry events of the state, with their amount parameter and the total they add to
+PROVIDER_FLOWS = {
+    "ProviderRegistered": ("stakedAmount", "staked"),
+    "FundsDeposited": ("amount", "deposited"),
+    "Withdraw": ("amount", "withdrawn"),
+    "FundsSlashed": ("amount", "slashed"),
+}
+PROVIDER_EVENTS = tuple(PROVIDER_FLOWS)
+TOTALS = tuple(total for _, total in PROVIDER_FLOWS.values())
+
+# Schema of the deltas, the summed events of each provider per block in block order
+DELTA_SCHEMA = {
+    "provider": pl.String,
+    "block_number": pl.UInt64,
+    **{total: pl.Decimal(38, 0) for total in TOTALS},
+    "slashes": pl.UInt32,
+}
+
+# Schema of the provider totals, one row per provider
+PROVIDER_SCHEMA = {
+    "provider": pl.String,
+    **{total: pl.Decimal(38, 0) for total in TOTALS},
+    "slashes": pl.UInt32,
+    "stake": pl.Decimal(38, 0),
+    "last_block": pl.UInt64,
+}
+
+
+def sum_deltas(frames: List[pl.DataFrame | pl.LazyFrame]) -> pl.DataFrame:
+    """
+    Sum deltas or provider totals into provider totals.
+
+    Args:
+        frames (List[pl.DataFrame | pl.LazyFrame]): Frames in `DELTA_SCHEMA` or `PROVIDER_SCHEMA`.
+
+    Returns:
+        pl.DataFrame: The totals in `PROVIDER_SCHEMA`, sorted by provider.
+    """
+    frames = [
+        frame.lazy().select(
+            "provider",
+            *TOTALS,
+            "slashes",
+            pl.col("last_block" if "last_block" in frame.collect_schema() else "block_number").alias("last_block"),
+        )
+        for frame in frames
+    ]
+    return (
+        pl.concat(frames)
+        .group_by("provider")
+        .agg(pl.col(*TOTALS, "slashes").sum(), pl.col("last_block").max())
+        .with_columns(
+            stake=pl.col("staked") + pl.col("deposited") - pl.col("withdrawn") - pl.col("slashed")
+        )
+        .sort("provider")
+        .collect()
+        .cast(PROVIDER_SCHEMA)
+        .select(list(PROVIDER_SCHEMA))
+    )
+
+
+@dataclass
+class ProviderState:
+    """
+    The stake and slashing totals of every provider, maintained incrementally from provider registry events.
+
+    Events are summed into deltas per provider and block, and the running totals are updated from the new deltas
+    only, so refreshing leaderboards and alerts doesn't scan the full history. Every `checkpoint_interval` blocks the
+    totals are checkpointed, so a snapshot as of an earlier block only sums the deltas since the checkpoint before it.
+
+    The stake of a provider is its registration stake and deposits minus its withdrawals and slashed funds.
+
+    Events must be ingested in block order. Events below `next_block` are skipped as already ingested, so overlapping
+    refreshes are harmless.
+
+    Attributes:
+        path (Optional[str]): The Parquet file persisting the deltas, optional. Loaded on creation if it exists.
+        checkpoint_interval (int): The number of blocks between checkpoints of the totals.
+        next_block (int): The first block not ingested yet.
+    """
+
+    path: Optional[str] = None
+    checkpoint_interval: int = 100_000
+    next_block: int = 0
+    _deltas: pl.DataFrame = field(init=False, repr=False)
+    _pending: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _totals: pl.DataFrame = field(init=False, repr=False)
+    _checkpoint_blocks: List[int] = field(default_factory=list, init=False, repr=False)
+    _checkpoints: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the persisted deltas, if any, and rebuild the totals and checkpoints from them."""
+        if self.checkpoint_interval <= 0:
+            raise ValueError("checkpoint_interval must be positive")
+        self._deltas = pl.DataFrame(schema=DELTA_SCHEMA)
+        self._totals = pl.DataFrame(schema=PROVIDER_SCHEMA)
+        if self.path and os.path.exists(self.path):
+            table = pq.read_table(self.path)
+            next_block = int(table.schema.metadata[b"next_block"])
+            self.replay(pl.from_arrow(table), next_block)
+
+    def replay(self, deltas: pl.DataFrame, next_block: int) -> None:
+        """Rebuild the state from deltas in block order, one checkpoint interval at a time."""
+        self.next_block = 0
+        self._deltas = deltas.clear()
+        self._totals = pl.DataFrame(schema=PROVIDER_SCHEMA)
+        self._pending = []
+        self._checkpoint_blocks = []
+        self._checkpoints = []
+        end = 0
+        while end < next_block:
+            end = min(next_block, (end // self.checkpoint_interval + 1) * self.checkpoint_interval)
+            chunk = deltas.filter(pl.col("block_number").is_between(self.next_block, end, closed="left"))
+            self.add_deltas(chunk, end)
+
+    def ingest(self, events: dict[str, Optional[pl.DataFrame]], next_block: Optional[int] = None) -> int:
+        """
+        Apply new provider registry events to the state.
+
+        Args:
+            events (dict[str, Optional[pl.DataFrame]]): The rows of each event, e.g. the result of
+                `Hypersync.execute_events_query` or the events of a subscription update. Rows need the event
+                parameters and "block_number". Other events are ignored.
+            next_block (Optional[int]): The first block not covered by the events, optional. Defaults to the block
+                after the last event.
+
+        Returns:
+            int: The number of applied events.
+        """
+        frames = []
+        for event_name, (amount, total) in PROVIDER_FLOWS.items():
+            df = events.get(event_name)
+            if df is None or df.is_empty():
+                continue
+            frames.append(
+                df.filter(pl.col("block_number") >= self.next_block).select(
+                    pl.col("provider").str.to_lowercase(),
+                    pl.col("block_number").cast(pl.UInt64),
+                    *(
+                        (pl.col(amount) if name == total else pl.lit(0)).cast(pl.Decimal(38, 0)).alias(name)
+                        for name in TOTALS
+                    ),
+                    pl.lit(1 if total == "slashed" else 0, dtype=pl.UInt32).alias("slashes"),
+                )
+            )
+        rows = pl.concat(frames) if frames else pl.DataFrame(schema=DELTA_SCHEMA)
+        deltas = (
+            rows.group_by("provider", "block_number")
+            .agg(pl.col(*TOTALS, "slashes").sum())
+            .sort("block_number", "provider")
+            .cast(DELTA_SCHEMA)
+        )
+        end = deltas["block_number"][-1] + 1 if not deltas.is_empty() else self.next_block
+        self.add_deltas(deltas, max(end, next_block or 0))
+        return rows.height
+
+    def add_deltas(self, deltas: pl.DataFrame, next_block: int) -> None:
+        """
+        Add deltas to the running totals, checkpointing the totals at each interval boundary they cross.
+
+        Args:
+            deltas (pl.DataFrame): New deltas in `DELTA_SCHEMA`, in block order, from the state's next block on.
+            next_block (int): The first block not covered by the deltas.
+        """
+        next_block = max(self.next_block, next_block)
+        boundary = (self.next_block // self.checkpoint_interval + 1) * self.checkpoint_interval
+        start = 0
+        while boundary <= next_block:
+            # The totals of the blocks below the boundary
+            end = deltas["block_number"].search_sorted(boundary, side="left")
+            self.add_totals(deltas.slice(start, end - start))
+            self._checkpoint_blocks.append(boundary)
+            self._checkpoints.append(self._totals)
+            start = end
+            boundary += self.checkpoint_interval
+        self.add_totals(deltas.slice(start))
+        if not deltas.is_empty():
+            self._pending.append(deltas)
+        self.next_block = next_block
+
+    def add_totals(self, deltas: pl.DataFrame) -> None:
+        """Add deltas to the running totals."""
+        if not deltas.is_empty():
+            self._totals = sum_deltas([self._totals, deltas])
+
+    def apply(self, update) -> int:
+        """
+        Apply an update of `Hypersync.subscribe`, rolling the state back on reorgs.
+
+        Args:
+            update (SubscriptionUpdate): The update of a subscription including the provider registry events.
+
+        Returns:
+            int: The number of applied events.
+        """
+        if update.rollback_block is not None:
+            self.rollback(update.rollback_block)
+            return 0
+        return self.ingest(update.events, update.next_block)
+
+    def rollback(self, block_number: int) -> None:
+        """
+        Undo every event at or above a block, e.g. after a reorg, so the blocks can be ingested again.
+
+        Args:
+            block_number (int): The first block to undo.
+        """
+        if block_number >= self.next_block:
+            return
+        deltas = self.deltas
+        self._deltas = deltas.head(deltas["block_number"].search_sorted(block_number, side="left"))
+        kept = bisect_right(self._checkpoint_blocks, block_number)
+        del self._checkpoint_blocks[kept:]
+        del self._checkpoints[kept:]
+        self._totals = self.snapshot(block_number - 1)
+        self.next_block = block_number
+
+    @property
+    def deltas(self) -> pl.DataFrame:
+        """Every delta in `DELTA_SCHEMA`, in block order."""
+        if self._pending:
+            self._deltas = pl.concat([self._deltas, *self._pending], rechunk=True)
+            self._pending = []
+        return self._deltas
+
+    @property
+    def totals(self) -> pl.DataFrame:
+        """The running totals of every provider in `PROVIDER_SCHEMA`, as of the last ingested block."""
+        return self._totals
+
+    def snapshot(self, block_number: Optional[int] = None) -> pl.DataFrame:
+        """
+        Get the totals of every provider as of a block.
+
+        Only the deltas since the last checkpoint at or below the block are summed.
+
+        Args:
+            block_number (Optional[int]): The block, inclusive, optional. Defaults to the last ingested block.
+
+        Returns:
+            pl.DataFrame: The totals in `PROVIDER_SCHEMA`, sorted by provider. Providers without events up to the
+                block are left out.
+        """
+        if block_number is None or block_number >= self.next_block - 1:
+            return self._totals
+        if block_number < 0:
+            return pl.DataFrame(schema=PROVIDER_SCHEMA)
+        checkpoint = bisect_right(self._checkpoint_blocks, block_number + 1) - 1
+        base = self._checkpoints[checkpoint] if checkpoint >= 0 else pl.DataFrame(schema=PROVIDER_SCHEMA)
+        start_block = self._checkpoint_blocks[checkpoint] if checkpoint >= 0 else 0
+        blocks = self.deltas["block_number"]
+        start = blocks.search_sorted(start_block, side="left")
+        end = blocks.search_sorted(block_number, side="right")
+        return sum_deltas([base, self.deltas.slice(start, end - start)])
+
+    def get(self, provider: str, block_number: Optional[int] = None) -> Optional[dict]:
+        """
+        Look up the totals of a provider.
+
+        Args:
+            provider (str): The address of the provider.
+            block_number (Optional[int]): The block, inclusive, optional. Defaults to the last ingested block.
+
+        Returns:
+            Optional[dict]: The row of the provider in `PROVIDER_SCHEMA`, or None without events up to the block.
+        """
+        rows = self.snapshot(block_number).filter(pl.col("provider") == provider.lower())
+        return rows.row(0, named=True) if rows.height else None
+
+    def leaderboard(self, by: str = "slashed", n: int = 10, block_number: Optional[int] = None) -> pl.DataFrame:
+        """
+        Rank providers by a total.
+
+        Args:
+            by (str): The column to rank by, e.g. "slashed", "slashes" or "stake".
+            n (int): The number of providers to return.
+            block_number (Optional[int]): The block, inclusive, optional. Defaults to the last ingested block.
+
+        Returns:
+            pl.DataFrame: The top providers in `PROVIDER_SCHEMA`, in descending order.
+
+        Raises:
+            ValueError: If the column isn't a total.
+        """
+        if by not in PROVIDER_SCHEMA or by == "provider":
+            raise ValueError(f"Unsupported leaderboard column: {by}")
+        return self.snapshot(block_number).sort(by, "provider", descending=[True, False]).head(n)
+
+    def save(self) -> None:
+        """
+        Persist the deltas and the next block to `path`, atomically replacing the previous file.
+
+        Raises:
+            ValueError: If the state has no path.
+        """
+        if not self.path:
+            raise ValueError("Provider state has no path to save to")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = self.deltas.to_arrow()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), "next_block": str(self.next_block)})
+        tmp_path = f"{self.path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return self._totals.height
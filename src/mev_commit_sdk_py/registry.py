@@ -0,0 +1,234 @@
+import threading
+import hypersync
+import polars as pl
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterator, List, Optional, Mapping
+from mev_commit_sdk_py.decoding import EventParam, decode_logs, parse_event_signature
+from mev_commit_sdk_py.helpers import address_to_topic
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    """
+    An immutable, precompiled event definition.
+
+    The topic0 hash, parsed parameters and log selection are computed once when the event is registered, so queries
+    and log decoding don't redo that work on every call.
+
+    Attributes:
+        name (str): The name of the event.
+        signature (str): The event signature.
+        contract (str): The lowercase address of the contract emitting the event.
+        column_mapping (hypersync.ColumnMapping): The column mapping applied to the event's query results.
+        columns (Optional[tuple[str, ...]]): The default transaction and block columns joined to the event, optional.
+        topic0 (str): The topic0 hash of the signature.
+        params (tuple[EventParam, ...]): The parsed parameters of the signature.
+        log_selection (hypersync.LogSelection): The log selection of the event without an address filter. Shared
+            between queries, so it must not be mutated.
+    """
+
+    name: str
+    signature: str
+    contract: str
+    column_mapping: hypersync.ColumnMapping
+    columns: Optional[tuple[str, ...]] = None
+    topic0: str = field(init=False)
+    params: tuple[EventParam, ...] = field(init=False)
+    log_selection: hypersync.LogSelection = field(init=False, compare=False)
+
+    def __post_init__(self):
+        """Precompute the topic0 hash, parameters and log selection of the event."""
+        topic0 = hypersync.signature_to_topic0(self.signature)
+        object.__setattr__(self, "topic0", topic0)
+        object.__setattr__(self, "params", tuple(parse_event_signature(self.signature)))
+        object.__setattr__(
+            self,
+            "log_selection",
+            hypersync.LogSelection(address=[self.contract], topics=[[topic0]]),
+        )
+
+    def select_logs(self, address: Optional[str] = None) -> hypersync.LogSelection:
+        """
+        Get the log selection of the event, optionally filtered on the first indexed address.
+
+        Args:
+            address (Optional[str]): Optional address to filter the event logs.
+
+        Returns:
+            hypersync.LogSelection: The log selection.
+        """
+        if not address:
+            return self.log_selection
+        return hypersync.LogSelection(
+            address=[self.contract],
+            topics=[[self.topic0], [address_to_topic(address.lower())]],
+        )
+
+    def decode(self, logs_df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Decode raw logs of this event with its column mapping.
+
+        Args:
+            logs_df (pl.DataFrame): The raw logs of the event, with prefixed hex topics and data.
+
+        Returns:
+            pl.DataFrame: The decoded logs, one column per event parameter.
+        """
+        return decode_logs(
+            logs_df, self.signature, self.column_mapping.decoded_log, params=list(self.params)
+        )
+
+
+class EventRegistry:
+    """
+    A registry of events indexed by name, signature and topic0.
+
+    Lookups are constant time dictionary reads. Registration copies and swaps the indexes under a lock, so events can
+    be added at runtime while other threads or tasks keep reading a consistent snapshot.
+
+    Attributes:
+        default_column_mapping (hypersync.ColumnMapping): The column mapping of events registered without one.
+    """
+
+    def __init__(
+        self,
+        specs: List[EventSpec] = (),
+        default_column_mapping: Optional[hypersync.ColumnMapping] = None,
+    ):
+        self.default_column_mapping = default_column_mapping or hypersync.ColumnMapping()
+        self._lock = threading.Lock()
+        self._by_name: Mapping[str, EventSpec] = MappingProxyType({})
+        self._by_signature: Mapping[str, EventSpec] = MappingProxyType({})
+        self._by_topic0: Mapping[str, tuple[EventSpec, ...]] = MappingProxyType({})
+        for spec in specs:
+            self.add(spec)
+
+    @classmethod
+    def from_config(
+        cls,
+        config: dict[str, dict],
+        default_column_mapping: Optional[hypersync.ColumnMapping] = None,
+    ) -> "EventRegistry":
+        """
+        Build a registry from an EVENT_CONFIG style dictionary.
+
+        Args:
+            config (dict[str, dict]): Event configurations keyed by event name, with "signature", "contract" and
+                optional "column_mapping" and "columns" entries.
+            default_column_mapping (Optional[hypersync.ColumnMapping]): The column mapping of events without one.
+
+        Returns:
+            EventRegistry: The registry.
+        """
+        registry = cls(default_column_mapping=default_column_mapping)
+        for name, event_config in config.items():
+            registry.register(
+                name,
+                event_config["signature"],
+                event_config["contract"],
+                column_mapping=event_config.get("column_mapping"),
+                columns=event_config.get("columns"),
+            )
+        return registry
+
+    def register(
+        self,
+        name: str,
+        signature: str,
+        contract,
+        column_mapping: Optional[hypersync.ColumnMapping] = None,
+        columns: Optional[List[str]] = None,
+        replace: bool = False,
+    ) -> EventSpec:
+        """
+        Register an event.
+
+        Args:
+            name (str): The name of the event.
+            signature (str): The event signature.
+            contract (Contracts | str): The contract emitting the event, as a `Contracts` member or an address.
+            column_mapping (Optional[hypersync.ColumnMapping]): The column mapping of the event, optional. Defaults to
+                the registry's default column mapping.
+            columns (Optional[List[str]]): The default transaction and block columns joined to the event, optional.
+            replace (bool): Whether to replace an event already registered under the same name.
+
+        Returns:
+            EventSpec: The registered event.
+
+        Raises:
+            ValueError: If the event name is already registered and `replace` is not set, or the signature is invalid.
+        """
+        spec = EventSpec(
+            name=name,
+            signature=signature,
+            contract=getattr(contract, "value", contract).lower(),
+            column_mapping=column_mapping or self.default_column_mapping,
+            columns=tuple(columns) if columns is not None else None,
+        )
+        return self.add(spec, replace=replace)
+
+    def add(self, spec: EventSpec, replace: bool = False) -> EventSpec:
+        """
+        Add a precompiled event to the registry.
+
+        Args:
+            spec (EventSpec): The event to add.
+            replace (bool): Whether to replace an event already registered under the same name.
+
+        Returns:
+            EventSpec: The added event.
+
+        Raises:
+            ValueError: If the event name is already registered and `replace` is not set.
+        """
+        with self._lock:
+            by_name = dict(self._by_name)
+            if spec.name in by_name and not replace:
+                raise ValueError(f"Event already registered: {spec.name}")
+            by_name[spec.name] = spec
+
+            # Rebuild the secondary indexes from the names so replaced events drop out
+            by_signature, by_topic0 = {}, {}
+            for registered in by_name.values():
+                by_signature.setdefault(registered.signature, registered)
+                by_topic0.setdefault(registered.topic0, []).append(registered)
+
+            self._by_name = MappingProxyType(by_name)
+            self._by_signature = MappingProxyType(by_signature)
+            self._by_topic0 = MappingProxyType({k: tuple(v) for k, v in by_topic0.items()})
+        return spec
+
+    def get(self, name: str) -> Optional[EventSpec]:
+        """Get an event by name, or None if it isn't registered."""
+        return self._by_name.get(name)
+
+    def by_signature(self, signature: str) -> Optional[EventSpec]:
+        """Get an event by signature, or None if it isn't registered."""
+        return self._by_signature.get(signature)
+
+    def by_topic0(self, topic0: str, contract: Optional[str] = None) -> tuple[EventSpec, ...]:
+        """
+        Get the events of a topic0 hash, for decoding raw logs.
+
+        Args:
+            topic0 (str): The prefixed, lowercase topic0 hash.
+            contract (Optional[str]): Only return events emitted by this contract address, optional.
+
+        Returns:
+            tuple[EventSpec, ...]: The matching events, empty if there are none.
+        """
+        specs = self._by_topic0.get(topic0, ())
+        if contract is not None:
+            specs = tuple(spec for spec in specs if spec.contract == contract.lower())
+        return specs
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[EventSpec]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import pyarrow as pa
+
+from dataclasses import dataclass
+from typing import List
+
+# The tables of a Hypersync Arrow response kept by collections
+RESPONSE_TABLES = ("logs", "transactions", "blocks", "decoded_logs")
+
+# Markers of transport failures in exception messages. The Hypersync client raises them as plain exceptions
+TRANSIENT_MESSAGES = (
+    "connection",
+    "timed out",
+    "timeout",
+    "error sending request",
+    "broken pipe",
+    "service unavailable",
+    "bad gateway",
+    "too many requests",
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check whether a failure is a transient transport error worth retrying.
+
+    Connection and timeout errors are transient. The generic exceptions raised by the Hypersync client are only
+    transient when their message names a transport failure, so bad queries and decoding bugs fail immediately.
+
+    Args:
+        error (BaseException): The failure.
+
+    Returns:
+        bool: Whether the failure is transient.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error) not in (Exception, RuntimeError, ValueError):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_MESSAGES)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries of transient failures with jittered exponential backoff.
+
+    Attributes:
+        max_retries (int): The number of consecutive failed attempts retried before giving up. Each received page
+            resets the count.
+        base_delay (float): The delay ceiling in seconds of the first retry, doubled on each following retry.
+        max_delay (float): The largest delay ceiling in seconds.
+    """
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """
+        Draw the delay before a retry, uniformly up to the exponential ceiling so concurrent retries spread out.
+
+        Args:
+            attempt (int): The number of the retry, starting at 0.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+@dataclass
+class CollectedData:
+    """The tables of a collection, concatenated from its response pages in block order."""
+
+    logs: pa.Table
+    transactions: pa.Table
+    blocks: pa.Table
+    decoded_logs: pa.Table
+
+
+def concat_pages(pages: List) -> CollectedData:
+    """
+    Concatenate the data of response pages.
+
+    Args:
+        pages (List[hypersync.ArrowResponseData]): The data of each page, in block order.
+
+    Returns:
+        CollectedData: The concatenated tables. Pages without rows are skipped, so their schema doesn't have to match.
+    """
+    tables = {}
+    for name in RESPONSE_TABLES:
+        parts = [getattr(page, name) for page in pages]
+        non_empty = [t for t in parts if t.num_rows > 0]
+        if non_empty:
+            tables[name] = pa.concat_tables(non_empty, promote_options="default")
+        else:
+            tables[name] = parts[0] if parts else pa.table({})
+    return CollectedData(**tables)
+
+
+def checkpoint_key(*parts) -> str:
+    """Derive a stable checkpoint name from the representation of a query and its stream configuration."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class CollectionCheckpoint:
+    """
+    The on-disk progress of one collection: its received pages and the cursor to continue from.
+
+    Pages are stored as Arrow IPC files, so resumed collections get back exactly the tables they received. The cursor
+    is written after its page, so a crash can only lose the page being written.
+
+    Attributes:
+        directory (str): The directory of the checkpoint.
+    """
+
+    directory: str
+
+    @property
+    def state_path(self) -> str:
+        """The path of the cursor file."""
+        return os.path.join(self.directory, "cursor.json")
+
+    def load(self, from_block: int) -> tuple[int, List[CollectedData]]:
+        """
+        Load the cursor and the pages received so far.
+
+        Args:
+            from_block (int): The first block of the collection, used when there is no checkpoint yet.
+
+        Returns:
+            tuple[int, List[CollectedData]]: The block to continue from and the received pages.
+        """
+        if not os.path.exists(self.state_path):
+            return from_block, []
+        with open(self.state_path) as f:
+            state = json.load(f)
+
+        pages = []
+        for page in range(state["pages"]):
+            tables = {}
+            for name in RESPONSE_TABLES:
+                with pa.memory_map(self.page_path(page, name)) as source:
+                    tables[name] = pa.ipc.open_file(source).read_all()
+            pages.append(CollectedData(**tables))
+        return state["next_block"], pages
+
+    def page_path(self, page: int, name: str) -> str:
+        """The path of a table of a page."""
+        return os.path.join(self.directory, f"page-{page:06d}", f"{name}.arrow")
+
+    def save_page(self, page: int, data, next_block: int) -> None:
+        """
+        Persist a received page and advance the cursor past it.
+
+        Args:
+            page (int): The number of the page.
+            data (hypersync.ArrowResponseData): The data of the page.
+            next_block (int): The block to continue from after the page.
+        """
+        os.makedirs(os.path.dirname(self.page_path(page, "logs")), exist_ok=True)
+        for name in RESPONSE_TABLES:
+            table = getattr(data, name)
+            with pa.OSFile(self.page_path(page, name), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"next_block": next_block, "pages": page + 1}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint once its collection is complete."""
+        shutil.rmtree(self.directory, ignore_errors=True)
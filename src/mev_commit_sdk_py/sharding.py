@@ -0,0 +1,134 @@
+import asyncio
+import math
+import time
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Awaitable
+
+
+@dataclass
+class ShardPlanner:
+    """
+    Splits a block range into chunks, adapting the chunk size to the latency and row count of completed chunks.
+
+    The range starts out split into `shards` equal chunks. Each completed chunk rescales the size of the chunks handed
+    out afterwards towards `target_seconds` and `target_rows`, so using more shards than the concurrency limit lets
+    later waves settle on a chunk size that suits the density of the range.
+
+    Attributes:
+        from_block (int): The first block of the range.
+        to_block (int): The end of the range, exclusive.
+        shards (int): The number of chunks the range is initially split into.
+        target_seconds (float): The response latency to aim each chunk at.
+        target_rows (int): The number of rows to aim each chunk at.
+        min_chunk_size (int): The smallest chunk size the planner adapts down to.
+        max_chunk_size (Optional[int]): The largest chunk size the planner adapts up to, optional.
+    """
+
+    from_block: int
+    to_block: int
+    shards: int
+    target_seconds: float = 5.0
+    target_rows: int = 250_000
+    min_chunk_size: int = 1_000
+    max_chunk_size: Optional[int] = None
+    chunk_size: int = field(init=False)
+    cursor: int = field(init=False)
+
+    def __post_init__(self):
+        """Initialize the chunk size and cursor from the range and shard count."""
+        if self.shards < 1:
+            raise ValueError(f"shards must be at least 1, got {self.shards}")
+        self.chunk_size = max(math.ceil((self.to_block - self.from_block) / self.shards), 1)
+        self.cursor = self.from_block
+
+    def next_range(self) -> Optional[tuple[int, int]]:
+        """
+        Hand out the next chunk of the range.
+
+        Returns:
+            Optional[tuple[int, int]]: The start and exclusive end block of the chunk, or None once the range is covered.
+        """
+        if self.cursor >= self.to_block:
+            return None
+        start = self.cursor
+        self.cursor = min(start + self.chunk_size, self.to_block)
+        return start, self.cursor
+
+    def observe(self, blocks: int, seconds: float, rows: int):
+        """
+        Rescale the chunk size from a completed chunk.
+
+        Args:
+            blocks (int): The number of blocks in the chunk.
+            seconds (float): The time the chunk took to fetch.
+            rows (int): The number of rows the chunk returned.
+        """
+        scale = self.target_seconds / max(seconds, 1e-3)
+        if rows:
+            scale = min(scale, self.target_rows / rows)
+        # Limit each step so a single outlier doesn't swing the chunk size
+        scale = min(max(scale, 0.5), 2.0)
+
+        chunk_size = max(int(blocks * scale), self.min_chunk_size)
+        if self.max_chunk_size:
+            chunk_size = min(chunk_size, self.max_chunk_size)
+        self.chunk_size = chunk_size
+
+
+async def run_sharded(
+    fetch: Callable[[int, int], Awaitable[Optional[pl.DataFrame]]],
+    planner: ShardPlanner,
+    max_concurrency: int = 4,
+) -> Optional[pl.DataFrame]:
+    """
+    Fetch the chunks of a planned block range concurrently and concatenate the results in block order.
+
+    A new chunk is only planned once a slot under the semaphore frees up, so its size reflects the chunks completed so
+    far.
+
+    Args:
+        fetch (Callable[[int, int], Awaitable[Optional[pl.DataFrame]]]): Fetches the data of a start and exclusive end
+            block.
+        planner (ShardPlanner): The planner splitting the block range.
+        max_concurrency (int): The maximum number of chunks fetched at once.
+
+    Returns:
+        Optional[pl.DataFrame]: The concatenated data, or None if no chunk returned data.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: dict[int, Optional[pl.DataFrame]] = {}
+
+    async def fetch_chunk(start: int, end: int):
+        try:
+            start_time = time.perf_counter()
+            df = await fetch(start, end)
+            planner.observe(end - start, time.perf_counter() - start_time, 0 if df is None else df.height)
+            results[start] = df
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        while True:
+            await semaphore.acquire()
+            block_range = planner.next_range()
+            if block_range is None:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(fetch_chunk(*block_range)))
+            # Surface failures early instead of planning more chunks
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    raise task.exception()
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    frames = [results[start] for start in sorted(results) if results[start] is not None]
+    if not frames:
+        return None
+    return pl.concat(frames, how="diagonal_relaxed")
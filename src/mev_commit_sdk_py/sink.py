@@ -0,0 +1,222 @@
+import json
+import os
+import shutil
+import uuid
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Supported partitionings of sink datasets
+PARTITIONINGS = ("block_range", "day", None)
+
+
+@dataclass
+class ParquetSink:
+    """
+    A partitioned Parquet dataset that query results are written to batch by batch.
+
+    Each dataset (an event name, "transactions" or "blocks") is written under `path/<dataset>/` in Hive-style
+    partition directories, e.g. `block_range=000000100000/` or `day=2024-10-01/`, so it can be read back with
+    partition pruning and predicate pushdown via `scan`. Every written file is recorded in `path/manifest.jsonl` with
+    its row count and block range, one JSON line per file appended as it is written, so recording a page doesn't
+    rewrite the files before it. File names hold their block range and a random suffix, so several sinks can write
+    to the same path.
+
+    Attributes:
+        path (str): The root directory of the sink.
+        partition_by (Optional[str]): "block_range" to partition by blocks, "day" to partition by the UTC day of the
+            "timestamp" column, or None for a single partition.
+        partition_size (int): The number of blocks in each "block_range" partition.
+        compression (str): The Parquet compression codec, e.g. "zstd", "snappy", "lz4" or "uncompressed".
+        compression_level (Optional[int]): The compression level, optional.
+        row_group_size (Optional[int]): The maximum number of rows in each Parquet row group, optional.
+        mode (str): "overwrite" to replace a dataset's previous files on its first write, or "append" to keep them.
+    """
+
+    path: str
+    partition_by: Optional[str] = "block_range"
+    partition_size: int = 100_000
+    compression: str = "zstd"
+    compression_level: Optional[int] = None
+    row_group_size: Optional[int] = None
+    mode: str = "overwrite"
+    _opened: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self):
+        """Validate the sink settings."""
+        if self.partition_by not in PARTITIONINGS:
+            raise ValueError(f"Unsupported partitioning: {self.partition_by}")
+        if self.mode not in ("overwrite", "append"):
+            raise ValueError(f"Unsupported sink mode: {self.mode}")
+
+    @property
+    def manifest_path(self) -> str:
+        """The path of the manifest file."""
+        return os.path.join(self.path, "manifest.jsonl")
+
+    def load_manifest(self) -> dict:
+        """
+        Load the manifest of the sink.
+
+        Returns:
+            dict: The manifest, with the written "files". A line left incomplete by an interrupted write is skipped.
+        """
+        files = []
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                for line in f:
+                    try:
+                        files.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        return {"files": files}
+
+    def append_manifest(self, entries: List[dict]):
+        """
+        Append the entries of written files to the manifest.
+
+        Args:
+            entries (List[dict]): The manifest entries.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.manifest_path, "a") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+
+    def save_manifest(self, manifest: dict):
+        """
+        Atomically rewrite the manifest of the sink.
+
+        Args:
+            manifest (dict): The manifest to write.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.manifest_path + ".tmp", "w") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in manifest["files"]))
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def open(self, dataset: str):
+        """
+        Prepare a dataset for its first write, removing its previous files in overwrite mode.
+
+        The manifest is only rewritten here, once per dataset and sink, to drop the removed files.
+
+        Args:
+            dataset (str): The name of the dataset.
+        """
+        if dataset in self._opened:
+            return
+        self._opened.add(dataset)
+        if self.mode == "overwrite":
+            shutil.rmtree(os.path.join(self.path, dataset), ignore_errors=True)
+            manifest = self.load_manifest()
+            kept = [f for f in manifest["files"] if f["dataset"] != dataset]
+            if len(kept) != len(manifest["files"]):
+                self.save_manifest({"files": kept})
+
+    def partition_key(self, df: pl.DataFrame) -> Optional[pl.Expr]:
+        """
+        Build the partition directory name of each row.
+
+        Args:
+            df (pl.DataFrame): The rows to partition.
+
+        Returns:
+            Optional[pl.Expr]: The partition directory of each row, or None without partitioning.
+
+        Raises:
+            ValueError: If the partitioning column is missing.
+        """
+        if self.partition_by is None:
+            return None
+        if self.partition_by == "day":
+            if "timestamp" not in df.columns:
+                raise ValueError("Day partitioning requires a timestamp column")
+            day = pl.from_epoch(pl.col("timestamp").cast(pl.Int64), time_unit="s").dt.strftime("%Y-%m-%d")
+            return "day=" + day
+
+        block_column = block_column_of(df)
+        if block_column is None:
+            raise ValueError("Block range partitioning requires a block number column")
+        start = pl.col(block_column).cast(pl.Int64) // self.partition_size * self.partition_size
+        return "block_range=" + start.cast(pl.String).str.zfill(12)
+
+    def write(self, dataset: str, df: Optional[pl.DataFrame]) -> List[dict]:
+        """
+        Write a batch of rows to a dataset, one new file per partition it touches, and record them in the manifest.
+
+        Args:
+            dataset (str): The name of the dataset, e.g. an event name.
+            df (Optional[pl.DataFrame]): The rows to write. Ignored if None or empty.
+
+        Returns:
+            List[dict]: The manifest entries of the written files.
+
+        Raises:
+            ValueError: If the partitioning column is missing.
+        """
+        if df is None or df.is_empty():
+            return []
+
+        self.open(dataset)
+        key = self.partition_key(df)
+        partitions = (
+            df.with_columns(key.alias("__partition")).partition_by("__partition", as_dict=True)
+            if key is not None
+            else {(None,): df}
+        )
+
+        entries = []
+        for (partition,), partition_df in partitions.items():
+            partition_df = partition_df.drop("__partition", strict=False)
+            directory = os.path.join(dataset, partition) if partition else dataset
+            os.makedirs(os.path.join(self.path, directory), exist_ok=True)
+
+            block_column = block_column_of(partition_df)
+            min_block = partition_df[block_column].min() if block_column else None
+            max_block = partition_df[block_column].max() if block_column else None
+            blocks = f"{min_block:012d}-{max_block:012d}-" if block_column else ""
+            relative_path = os.path.join(directory, f"part-{blocks}{uuid.uuid4().hex[:12]}.parquet")
+            partition_df.write_parquet(
+                os.path.join(self.path, relative_path),
+                compression=self.compression,
+                compression_level=self.compression_level,
+                row_group_size=self.row_group_size,
+            )
+            entries.append({
+                "dataset": dataset,
+                "path": relative_path,
+                "partition": partition,
+                "rows": partition_df.height,
+                "min_block": min_block,
+                "max_block": max_block,
+            })
+
+        self.append_manifest(entries)
+        return entries
+
+    def scan(self, dataset: str) -> pl.LazyFrame:
+        """
+        Read a dataset back lazily, with its partition column and predicate pushdown.
+
+        Args:
+            dataset (str): The name of the dataset.
+
+        Returns:
+            pl.LazyFrame: The rows of the dataset.
+
+        Raises:
+            ValueError: If the dataset has no files.
+        """
+        files = [f["path"] for f in self.load_manifest()["files"] if f["dataset"] == dataset]
+        if not files:
+            raise ValueError(f"No files written for dataset: {dataset}")
+        return pl.scan_parquet(
+            [os.path.join(self.path, f) for f in files],
+            hive_partitioning=self.partition_by is not None,
+        )
+
+
+def block_column_of(df: pl.DataFrame) -> Optional[str]:
+    """The block number column of a batch: "block_number" for logs and transactions, "number" for blocks."""
+    return next((c for c in ("block_number", "number") if c in df.columns), None)
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import polars as pl
+import pyarrow as pa
+
+from typing import Any, Awaitable, Iterable, Iterator, List, Optional
+from mev_commit_sdk_py.hypersync_client import Hypersync
+
+
+class SyncHypersync:
+    """
+    A blocking facade over `Hypersync`, for notebooks, scripts and synchronous services.
+
+    All queries run on one event loop in a background thread, which lives as long as the facade. Unlike wrapping each
+    call in `asyncio.run`, the client, its warm connections and its cached chain height are reused across calls, and
+    it works where an event loop is already running, e.g. in Jupyter.
+
+    Attributes:
+        client (Hypersync): The asynchronous client the queries run on.
+    """
+
+    def __init__(self, url: Optional[str] = None, client: Optional[Hypersync] = None, **kwargs):
+        """
+        Start the background event loop.
+
+        Args:
+            url (Optional[str]): The URL of the Hypersync service, optional if `client` is given.
+            client (Optional[Hypersync]): An existing client to wrap, optional.
+            **kwargs: Further `Hypersync` attributes when creating the client, e.g. `cache` or `settings`.
+
+        Raises:
+            ValueError: If neither a URL nor a client is given.
+        """
+        if client is None:
+            if url is None:
+                raise ValueError("SyncHypersync requires a url or a client")
+            client = Hypersync(url=url, **kwargs)
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="hypersync-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, awaitable: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            awaitable (Awaitable): The coroutine, e.g. `sync.client.execute_event_query(...)`.
+            timeout (Optional[float]): The maximum number of seconds to wait, optional.
+
+        Returns:
+            Any: The result of the coroutine.
+
+        Raises:
+            RuntimeError: If the facade is closed, or called from a coroutine running on its own loop.
+        """
+        if self._loop.is_closed() or threading.current_thread() is self._thread:
+            # Close the coroutine, so it isn't reported as never awaited
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            if self._loop.is_closed():
+                raise RuntimeError("SyncHypersync is closed")
+            raise RuntimeError("SyncHypersync can't block on its own event loop")
+        return asyncio.run_coroutine_threadsafe(self._as_coroutine(awaitable), self._loop).result(timeout)
+
+    @staticmethod
+    async def _as_coroutine(awaitable: Awaitable) -> Any:
+        return await awaitable
+
+    def batch(
+        self,
+        queries: Iterable[Awaitable],
+        return_exceptions: bool = False,
+        pin_height: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Run many queries concurrently on the background loop.
+
+        Args:
+            queries (Iterable[Awaitable]): The queries, as coroutines of the async client, e.g.
+                `[sync.client.execute_event_query('FundsSlashed', print_time=False), ...]`.
+            return_exceptions (bool): Whether to return the exceptions of failed queries in place of their results,
+                instead of raising the first one.
+            pin_height (bool): Whether to run all queries against the same chain height snapshot.
+            timeout (Optional[float]): The maximum number of seconds to wait, optional.
+
+        Returns:
+            List[Any]: The result of each query, in order.
+        """
+        queries = list(queries)
+
+        async def gather() -> List[Any]:
+            if not pin_height:
+                return await asyncio.gather(*queries, return_exceptions=return_exceptions)
+            async with self.client.pin_height():
+                return await asyncio.gather(*queries, return_exceptions=return_exceptions)
+
+        return self.run(gather(), timeout)
+
+    def execute_event_query(self, *args, **kwargs) -> Any:
+        """Blocking `Hypersync.execute_event_query`."""
+        return self.run(self.client.execute_event_query(*args, **kwargs))
+
+    def execute_events_query(self, *args, **kwargs) -> dict[str, Optional[pl.DataFrame]]:
+        """Blocking `Hypersync.execute_events_query`."""
+        return self.run(self.client.execute_events_query(*args, **kwargs))
+
+    def get_blocks_txs(self, *args, **kwargs) -> Any:
+        """Blocking `Hypersync.get_blocks_txs`."""
+        return self.run(self.client.get_blocks_txs(*args, **kwargs))
+
+    def search_txs(self, *args, **kwargs) -> Optional[pl.DataFrame]:
+        """Blocking `Hypersync.search_txs`."""
+        return self.run(self.client.search_txs(*args, **kwargs))
+
+    def get_blocks(self, *args, **kwargs) -> Any:
+        """Blocking `Hypersync.get_blocks`."""
+        return self.run(self.client.get_blocks(*args, **kwargs))
+
+    def backfill_tx_index(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.backfill_tx_index`."""
+        return self.run(self.client.backfill_tx_index(*args, **kwargs))
+
+    def update_commitment_book(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.update_commitment_book`."""
+        return self.run(self.client.update_commitment_book(*args, **kwargs))
+
+    def update_bidder_ledger(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.update_bidder_ledger`."""
+        return self.run(self.client.update_bidder_ledger(*args, **kwargs))
+
+    def update_provider_state(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.update_provider_state`."""
+        return self.run(self.client.update_provider_state(*args, **kwargs))
+
+    def update_validator_index(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.update_validator_index`."""
+        return self.run(self.client.update_validator_index(*args, **kwargs))
+
+    def update_block_index(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.update_block_index`."""
+        return self.run(self.client.update_block_index(*args, **kwargs))
+
+    def get_height(self, *args, **kwargs) -> int:
+        """Blocking `Hypersync.get_height`."""
+        return self.run(self.client.get_height(*args, **kwargs))
+
+    def stream_event(self, *args, **kwargs) -> Iterator[pl.DataFrame]:
+        """
+        Blocking `Hypersync.stream_event`, yielding each batch as it arrives.
+
+        Closing the iterator early, e.g. by breaking out of a loop, closes the underlying stream.
+        """
+        return self._iterate(self.client.stream_event(*args, **kwargs))
+
+    def stream_event_reader(self, *args, **kwargs) -> pa.RecordBatchReader:
+        """
+        Blocking `Hypersync.stream_event` with Arrow output, as a `pyarrow.RecordBatchReader` for Arrow-native
+        consumers such as DuckDB.
+
+        Pages are fetched as the reader is consumed. The schema is taken from the first batch, so it is fetched on
+        creation, and a range without events gives an empty reader without columns.
+        """
+        tables = self.stream_event(*args, output="arrow", **kwargs)
+        first = next(tables, None)
+        if first is None:
+            return pa.RecordBatchReader.from_batches(pa.schema([]), iter(()))
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            yield from first.to_batches()
+            for table in tables:
+                yield from table.cast(first.schema).to_batches()
+
+        return pa.RecordBatchReader.from_batches(first.schema, batches())
+
+    def subscribe(self, *args, **kwargs) -> Iterator[Any]:
+        """Blocking `Hypersync.subscribe`, yielding each update as it arrives."""
+        return self._iterate(self.client.subscribe(*args, **kwargs))
+
+    def _iterate(self, iterator) -> Iterator[Any]:
+        """Drive an async iterator on the background loop, one item per step."""
+        try:
+            while True:
+                try:
+                    yield self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._loop.is_closed():
+                self.run(iterator.aclose())
+
+    def close(self) -> None:
+        """Release the client and stop the background loop. Closing more than once has no effect."""
+        if self._loop.is_closed():
+            return
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "SyncHypersync":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,595 @@
+import bisect
+import decimal
+import hashlib
+import os
+import hypersync
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import List, Optional
+from hypersync import DataType
+from mev_commit_sdk_py.decoding import is_dynamic, parse_event_signature
+from mev_commit_sdk_py.hypersync_client import EVENT_REGISTRY, Hypersync
+from mev_commit_sdk_py.pool import ClientPool
+from mev_commit_sdk_py.registry import EventRegistry, EventSpec
+
+# Fields Hypersync returns as native unsigned integers. Other integer fields are hex quantities unless mapped
+NATIVE_INTEGER_FIELDS = {"number", "block_number", "transaction_index", "log_index"}
+
+# Arrow types of the column mappings
+MAPPED_TYPES = {
+    DataType.UINT64: pa.uint64(),
+    DataType.UINT32: pa.uint32(),
+    DataType.INT64: pa.int64(),
+    DataType.INT32: pa.int32(),
+    DataType.FLOAT64: pa.float64(),
+    DataType.FLOAT32: pa.float32(),
+    DataType.DECIMAL128: pa.decimal128(38, 0),
+    DataType.DECIMAL256: pa.decimal256(76, 0),
+    DataType.INTSTR: pa.string(),
+}
+
+
+def synthetic_hash(*parts) -> str:
+    """Derive a deterministic prefixed 32 byte hash from arbitrary values."""
+    return "0x" + hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def encode_word(abi_type: str, value) -> str:
+    """
+    ABI encode a static value as an unprefixed 64 character hex word.
+
+    Args:
+        abi_type (str): The ABI type of the value.
+        value: The value: an int for integer types, a bool, or a prefixed hex string for addresses and fixed bytes.
+
+    Returns:
+        str: The encoded word.
+    """
+    if abi_type == "address":
+        return value.lower().removeprefix("0x").rjust(64, "0")
+    if abi_type == "bool":
+        return format(int(bool(value)), "064x")
+    if abi_type.startswith(("uint", "int")):
+        return format(value % (1 << 256), "064x")
+    if abi_type.startswith("bytes"):
+        return value.lower().removeprefix("0x").ljust(64, "0")
+    raise ValueError(f"Unsupported static ABI type: {abi_type}")
+
+
+def expected_value(abi_type: str, indexed: bool, value, data_type: Optional[DataType] = None):
+    """
+    The value Hypersync's decoder returns for an emitted event parameter, with prefixed hex output.
+
+    Args:
+        abi_type (str): The ABI type of the parameter.
+        indexed (bool): Whether the parameter is indexed.
+        value: The emitted value, as given to `encode_log`.
+        data_type (Optional[DataType]): The column mapping of the parameter, optional.
+
+    Returns:
+        The decoded value: the topic for indexed dynamic values, the mapped type for mapped integers, and prefixed hex
+        for addresses, byte values and unmapped integers.
+    """
+    if indexed and is_dynamic(abi_type):
+        return value.lower()
+    if abi_type == "address":
+        return value.lower()
+    if abi_type in ("bool", "string"):
+        return value
+    if abi_type.startswith("bytes"):
+        return value.lower()
+    if data_type == DataType.DECIMAL128:
+        return decimal.Decimal(value)
+    if data_type == DataType.INTSTR:
+        return str(value)
+    if data_type in (DataType.FLOAT64, DataType.FLOAT32):
+        return float(value)
+    if data_type is not None:
+        return value
+    return "0x" + format(value % (1 << 256), "064x")
+
+
+def encode_log(spec: EventSpec, values: dict) -> dict:
+    """
+    ABI encode the topics and data of an event log.
+
+    Args:
+        spec (EventSpec): The event.
+        values (dict): The value of each event parameter. Indexed dynamic values are given as their prefixed hex topic,
+            and `bytes` values as prefixed hex.
+
+    Returns:
+        dict: The "address", "topic0".."topic3" and "data" fields of the log.
+
+    Raises:
+        ValueError: If a parameter is missing or has an unsupported type.
+    """
+    log = {"address": spec.contract, "topic0": spec.topic0, "topic1": None, "topic2": None, "topic3": None}
+    head, tail, topic = [], [], 1
+    data_params = [p for p in spec.params if not p.indexed]
+    for param in spec.params:
+        if param.name not in values:
+            raise ValueError(f"Missing value for parameter {param.name} of event {spec.name}")
+        value = values[param.name]
+        if param.indexed:
+            log[f"topic{topic}"] = value if is_dynamic(param.type) else "0x" + encode_word(param.type, value)
+            topic += 1
+        elif param.type in ("bytes", "string"):
+            content = value.encode().hex() if param.type == "string" else value.removeprefix("0x")
+            offset = 32 * len(data_params) + len("".join(tail)) // 2
+            head.append(format(offset, "064x"))
+            padded = content.ljust(-(-len(content) // 64) * 64, "0")
+            tail.append(format(len(content) // 2, "064x") + padded)
+        elif is_dynamic(param.type):
+            raise ValueError(f"Unsupported event parameter type {param.type} of event {spec.name}")
+        else:
+            head.append(encode_word(param.type, value))
+    log["data"] = "0x" + "".join(head) + "".join(tail)
+    return log
+
+
+@dataclass
+class SyntheticChain:
+    """
+    An in-memory chain of blocks, transactions and event logs, served by `FakeHypersyncClient`.
+
+    Hashes are derived deterministically from block numbers and the fork count, so the same sequence of calls always
+    builds the same chain.
+
+    Attributes:
+        registry (EventRegistry): The events that can be emitted by name.
+        genesis_timestamp (int): The timestamp of block 0.
+        block_time (int): The seconds between blocks.
+        blocks (List[dict]): The blocks, indexed by number.
+        transactions (List[dict]): The transactions in block order.
+        logs (List[dict]): The logs in block order.
+        values (dict[tuple[int, int], dict]): The emitted parameter values of each log by (block_number, log_index),
+            which the fake client decodes logs to without parsing their data.
+    """
+
+    registry: EventRegistry = field(default_factory=lambda: EVENT_REGISTRY)
+    genesis_timestamp: int = 1_700_000_000
+    block_time: int = 1
+    blocks: List[dict] = field(default_factory=list)
+    transactions: List[dict] = field(default_factory=list)
+    logs: List[dict] = field(default_factory=list)
+    values: dict[tuple[int, int], dict] = field(default_factory=dict)
+    _fork: int = field(default=0, init=False, repr=False)
+    _tx_by_hash: dict[str, dict] = field(default_factory=dict, init=False, repr=False)
+    _tx_counts: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _log_counts: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def height(self) -> int:
+        """The number of blocks, which is also the exclusive end of the chain."""
+        return len(self.blocks)
+
+    def mine(self, count: int = 1) -> int:
+        """
+        Append empty blocks to the chain.
+
+        Args:
+            count (int): The number of blocks to append.
+
+        Returns:
+            int: The number of the last block.
+        """
+        for _ in range(count):
+            number = len(self.blocks)
+            self.blocks.append({
+                "number": number,
+                "hash": synthetic_hash("block", number, self._fork),
+                "parent_hash": self.blocks[-1]["hash"] if self.blocks else "0x" + "00" * 32,
+                "timestamp": self.genesis_timestamp + number * self.block_time,
+                "miner": "0x" + "00" * 19 + "01",
+                "gas_limit": 30_000_000,
+                "gas_used": 0,
+                "base_fee_per_gas": 7,
+            })
+        return len(self.blocks) - 1
+
+    def add_transaction(self, block_number: Optional[int] = None, hash: Optional[str] = None, **fields) -> str:
+        """
+        Add a transaction to a block.
+
+        Args:
+            block_number (Optional[int]): The block of the transaction, optional. Defaults to a newly mined block.
+            hash (Optional[str]): The prefixed hex hash of the transaction, optional. Derived when not given.
+            **fields: Transaction fields overriding the defaults, e.g. `value` or `from_` (for "from").
+
+        Returns:
+            str: The hash of the transaction.
+        """
+        if block_number is None:
+            block_number = self.mine()
+        while block_number >= len(self.blocks):
+            self.mine()
+
+        index = self._tx_counts.get(block_number, 0)
+        self._tx_counts[block_number] = index + 1
+        tx = {
+            "hash": hash or synthetic_hash("tx", block_number, index, self._fork),
+            "block_number": block_number,
+            "block_hash": self.blocks[block_number]["hash"],
+            "transaction_index": index,
+            "from": "0x" + "00" * 19 + "aa",
+            "to": "0x" + "00" * 19 + "bb",
+            "value": 0,
+            "gas": 21_000,
+            "gas_price": 10**9,
+            "gas_used": 21_000,
+            "nonce": index,
+            "input": "0x",
+            "status": 1,
+        }
+        tx.update({k.removesuffix("_"): v for k, v in fields.items()})
+        self._tx_by_hash[tx["hash"]] = tx
+        # Keep block order, without sorting when appending to the last block
+        bisect.insort(self.transactions, tx, key=lambda t: (t["block_number"], t["transaction_index"]))
+        return tx["hash"]
+
+    def emit(
+        self,
+        event: str | EventSpec,
+        values: dict,
+        block_number: Optional[int] = None,
+        transaction_hash: Optional[str] = None,
+    ) -> dict:
+        """
+        Emit an event log, in a new transaction unless one is given.
+
+        Args:
+            event (str | EventSpec): The event, or the name of a registered event.
+            values (dict): The value of each event parameter. See `encode_log`.
+            block_number (Optional[int]): The block of the log, optional. Defaults to a newly mined block.
+            transaction_hash (Optional[str]): The transaction emitting the log, optional. Must be in `block_number`.
+
+        Returns:
+            dict: The log.
+
+        Raises:
+            ValueError: If the event isn't registered or a value is invalid.
+        """
+        spec = self.registry.get(event) if isinstance(event, str) else event
+        if spec is None:
+            raise ValueError(f"Unsupported event name: {event}")
+        if transaction_hash is None:
+            transaction_hash = self.add_transaction(block_number, to=spec.contract)
+        tx = self._tx_by_hash[transaction_hash]
+        log_index = self._log_counts.get(tx["block_number"], 0)
+        self._log_counts[tx["block_number"]] = log_index + 1
+
+        log = {
+            "block_number": tx["block_number"],
+            "block_hash": tx["block_hash"],
+            "transaction_hash": tx["hash"],
+            "transaction_index": tx["transaction_index"],
+            "log_index": log_index,
+            "removed": False,
+            **encode_log(spec, values),
+        }
+        bisect.insort(self.logs, log, key=lambda log: (log["block_number"], log["log_index"]))
+        self.values[log["block_number"], log_index] = dict(values)
+        return log
+
+    def reorg(self, block_number: int) -> None:
+        """
+        Drop the blocks from `block_number` on, with their transactions and logs. Blocks mined afterwards get new
+        hashes, so the fork is visible to rollback guards.
+
+        Args:
+            block_number (int): The first dropped block.
+        """
+        self.blocks = self.blocks[:block_number]
+        self.transactions = [tx for tx in self.transactions if tx["block_number"] < block_number]
+        self.logs = [log for log in self.logs if log["block_number"] < block_number]
+        self.values = {key: values for key, values in self.values.items() if key[0] < block_number}
+        self._tx_by_hash = {tx["hash"]: tx for tx in self.transactions}
+        self._tx_counts = {n: c for n, c in self._tx_counts.items() if n < block_number}
+        self._log_counts = {n: c for n, c in self._log_counts.items() if n < block_number}
+        self._fork += 1
+
+
+class FakeReceiver:
+    """Serves the response pages of a `FakeHypersyncClient.stream_arrow` call, recording whether it was closed."""
+
+    def __init__(self, pages: List[hypersync.ArrowResponse]):
+        self.pages = list(pages)
+        self.closed = False
+
+    async def recv(self) -> Optional[hypersync.ArrowResponse]:
+        return self.pages.pop(0) if self.pages else None
+
+    async def close(self) -> None:
+        self.pages = []
+        self.closed = True
+
+
+@dataclass
+class ReplayClient:
+    """
+    A stand-in for `hypersync.HypersyncClient` streaming the same response pages for every query.
+
+    Unlike `FakeHypersyncClient`, the pages aren't derived from a chain, so tests can serve responses a chain can't
+    produce, such as empty pages or hand-built tables.
+
+    Attributes:
+        pages (List[hypersync.ArrowResponse]): The pages of every stream.
+        queries (List[hypersync.Query]): Every query received, for assertions.
+        receivers (List[FakeReceiver]): The receiver of every stream, for assertions.
+    """
+
+    pages: List[hypersync.ArrowResponse]
+    queries: List[hypersync.Query] = field(default_factory=list)
+    receivers: List[FakeReceiver] = field(default_factory=list)
+
+    async def stream_arrow(self, query: hypersync.Query, config: hypersync.StreamConfig) -> FakeReceiver:
+        self.queries.append(query)
+        self.receivers.append(FakeReceiver(self.pages))
+        return self.receivers[-1]
+
+
+@dataclass
+class FakeHypersyncClient:
+    """
+    A stand-in for `hypersync.HypersyncClient` answering queries from a `SyntheticChain`, without network access.
+
+    Queries are evaluated like Hypersync does: log and transaction selections filter the chain, the transactions of
+    selected logs and the blocks of selected data are joined in, and only the selected fields are returned with the
+    column mapping of the stream configuration applied. Events of the configuration's `event_signature` are decoded
+    into `decoded_logs` from the values they were emitted with, typed like Hypersync's decoder output, so results are
+    checked against the emitted values rather than against the SDK's own decoder.
+
+    Attributes:
+        chain (SyntheticChain): The chain to serve.
+        page_size (int): The number of blocks in each streamed response page.
+        queries (List[hypersync.Query]): Every query received, for assertions.
+    """
+
+    chain: SyntheticChain
+    page_size: int = 1_000
+    queries: List[hypersync.Query] = field(default_factory=list)
+
+    async def get_height(self) -> int:
+        # Like Hypersync, the height is the number of the last block, not the exclusive end of the chain
+        return self.chain.height - 1
+
+    async def get_arrow(self, query: hypersync.Query) -> hypersync.ArrowResponse:
+        self.queries.append(query)
+        end = self.end_block(query)
+        return self.response(query, None, query.from_block, min(end, query.from_block + self.page_size))
+
+    async def collect_arrow(self, query: hypersync.Query, config: hypersync.StreamConfig) -> hypersync.ArrowResponse:
+        self.queries.append(query)
+        return self.response(query, config, query.from_block, self.end_block(query))
+
+    async def stream_arrow(self, query: hypersync.Query, config: hypersync.StreamConfig) -> FakeReceiver:
+        self.queries.append(query)
+        end = self.end_block(query)
+        starts = range(query.from_block, end, self.page_size)
+        return FakeReceiver([self.response(query, config, s, min(s + self.page_size, end)) for s in starts])
+
+    async def collect_parquet(self, path: str, query: hypersync.Query, config: hypersync.StreamConfig) -> None:
+        data = (await self.collect_arrow(query, config)).data
+        os.makedirs(path, exist_ok=True)
+        for name in ("logs", "transactions", "blocks", "decoded_logs"):
+            pq.write_table(getattr(data, name), os.path.join(path, f"{name}.parquet"))
+
+    def end_block(self, query: hypersync.Query) -> int:
+        """The exclusive end of a query on the chain."""
+        return self.chain.height if query.to_block is None else min(query.to_block, self.chain.height)
+
+    def response(
+        self,
+        query: hypersync.Query,
+        config: Optional[hypersync.StreamConfig],
+        start: int,
+        end: int,
+    ) -> hypersync.ArrowResponse:
+        """
+        Answer a query over the blocks [start, end).
+
+        Args:
+            query (hypersync.Query): The query.
+            config (Optional[hypersync.StreamConfig]): The stream configuration, optional.
+            start (int): The first block of the page.
+            end (int): The end of the page, exclusive.
+
+        Returns:
+            hypersync.ArrowResponse: The response page.
+        """
+        in_range = lambda row: start <= row["block_number"] < end
+        logs = [
+            log for log in self.chain.logs
+            if in_range(log) and any(matches_log(selection, log) for selection in query.logs or [])
+        ]
+        log_txs = {log["transaction_hash"] for log in logs}
+        transactions = [
+            tx for tx in self.chain.transactions
+            if in_range(tx) and (
+                tx["hash"] in log_txs
+                or any(matches_transaction(selection, tx) for selection in query.transactions or [])
+            )
+        ]
+        block_numbers = {row["block_number"] for row in logs + transactions}
+        blocks = [
+            block for block in self.chain.blocks[start:end]
+            if block["number"] in block_numbers
+            or query.include_all_blocks
+            or any(matches_block(selection, block) for selection in query.blocks or [])
+        ]
+
+        mapping = (config.column_mapping if config else None) or hypersync.ColumnMapping()
+        selection = query.field_selection
+        data = hypersync.ArrowResponseData()
+        data.logs = to_table(logs, selection.log or [], mapping.log)
+        data.transactions = to_table(transactions, selection.transaction or [], mapping.transaction)
+        data.blocks = to_table(blocks, selection.block or [], mapping.block)
+        data.traces = pa.table({})
+        data.decoded_logs = self.decode(logs, config)
+
+        response = hypersync.ArrowResponse()
+        response.data = data
+        response.next_block = end
+        response.archive_height = self.chain.height - 1
+        response.total_execution_time = 0
+        response.rollback_guard = None
+        if end > start:
+            guard = hypersync.RollbackGuard()
+            guard.block_number = end - 1
+            guard.hash = self.chain.blocks[end - 1]["hash"]
+            guard.timestamp = self.chain.blocks[end - 1]["timestamp"]
+            guard.first_block_number = start
+            guard.first_parent_hash = self.chain.blocks[start]["parent_hash"]
+            response.rollback_guard = guard
+        return response
+
+    def decode(self, logs: List[dict], config: Optional[hypersync.StreamConfig]) -> pa.Table:
+        """Decode the logs of the configuration's event signature, row aligned with the logs."""
+        if config is None or not config.event_signature or not logs:
+            return pa.table({})
+        topic0 = hypersync.signature_to_topic0(config.event_signature)
+        mapping = (config.column_mapping.decoded_log if config.column_mapping else None) or {}
+        columns = {}
+        for param in parse_event_signature(config.event_signature):
+            data_type = mapping.get(param.name)
+            values = [
+                expected_value(
+                    param.type, param.indexed, self.chain.values[log["block_number"], log["log_index"]][param.name],
+                    data_type,
+                )
+                if log["topic0"] == topic0 else None
+                for log in logs
+            ]
+            if data_type is not None and not param.type.startswith(("bytes", "address", "bool", "string")):
+                columns[param.name] = pa.array(values, MAPPED_TYPES[data_type])
+            else:
+                columns[param.name] = pa.array(values, pa.bool_() if param.type == "bool" else pa.string())
+        return pa.table(columns)
+
+
+def matches_log(selection: hypersync.LogSelection, log: dict) -> bool:
+    """Whether a log matches a log selection."""
+    if selection.address and log["address"].lower() not in {a.lower() for a in selection.address}:
+        return False
+    for i, topics in enumerate(selection.topics or []):
+        if topics and (log[f"topic{i}"] or "").lower() not in {t.lower() for t in topics}:
+            return False
+    return True
+
+
+def matches_transaction(selection: hypersync.TransactionSelection, tx: dict) -> bool:
+    """Whether a transaction matches a transaction selection."""
+    for name, values in (("hash", selection.hash), ("from", selection.from_), ("to", selection.to)):
+        if values and (tx.get(name) or "").lower() not in {v.lower() for v in values}:
+            return False
+    return True
+
+
+def matches_block(selection: hypersync.BlockSelection, block: dict) -> bool:
+    """Whether a block matches a block selection."""
+    for name, values in (("hash", selection.hash), ("miner", selection.miner)):
+        if values and block[name].lower() not in {v.lower() for v in values}:
+            return False
+    return True
+
+
+def to_table(rows: List[dict], fields: List, mapping: Optional[dict]) -> pa.Table:
+    """
+    Build the Arrow table of selected fields, typed like Hypersync's output with prefixed hex.
+
+    Args:
+        rows (List[dict]): The rows.
+        fields (List): The selected fields.
+        mapping (Optional[dict]): The column mapping of the fields, optional.
+
+    Returns:
+        pa.Table: The table, with a null column for each selected field the rows don't have.
+    """
+    mapping = {getattr(k, "value", k): v for k, v in (mapping or {}).items()}
+    columns = {}
+    for name in (getattr(f, "value", f) for f in fields):
+        values = [row.get(name) for row in rows]
+        if name in mapping:
+            arrow_type = MAPPED_TYPES[mapping[name]]
+            if mapping[name] == DataType.INTSTR:
+                values = [None if v is None else str(v) for v in values]
+            columns[name] = pa.array(values, arrow_type)
+        elif name in NATIVE_INTEGER_FIELDS:
+            columns[name] = pa.array(values, pa.uint64())
+        elif any(isinstance(v, bool) for v in values):
+            columns[name] = pa.array(values, pa.bool_())
+        else:
+            columns[name] = pa.array(
+                [hex(v) if isinstance(v, int) else v for v in values], pa.string()
+            )
+    return pa.table(columns)
+
+
+def sample_response_data(logs: bool = True) -> SimpleNamespace:
+    """
+    A small hand-built response: three logs in two blocks, out of block order, with their transactions and blocks.
+
+    Args:
+        logs (bool): Whether the response has logs. Without them, only the transactions and blocks are filled.
+
+    Returns:
+        SimpleNamespace: The tables, like `hypersync.ArrowResponseData`.
+    """
+    return SimpleNamespace(
+        decoded_logs=pa.table({"amount": [3, 1, 2]} if logs else {}),
+        logs=pa.table({
+            "transaction_hash": ["0xc", "0xa", "0xb"],
+            "block_number": pa.array([2, 1, 2], pa.uint64()),
+            "log_index": pa.array([4, 0, 3], pa.uint64()),
+        } if logs else {}),
+        transactions=pa.table({
+            "hash": ["0xa", "0xb", "0xc"],
+            "block_number": pa.array([1, 2, 2], pa.uint64()),
+            "from": ["0x1", "0x2", "0x3"],
+        }),
+        blocks=pa.table({
+            "number": pa.array([1, 2], pa.uint64()),
+            "timestamp": pa.array([10, 20], pa.uint64()),
+            "hash": ["0xb1", "0xb2"],
+        }),
+    )
+
+
+def slashing_chain(slashes: int = 4, blocks: int = 10) -> SyntheticChain:
+    """
+    Build a chain of one provider's slashes and a deposit.
+
+    Args:
+        slashes (int): The number of `FundsSlashed` events, at blocks 0, 10, 20 and so on with amounts 0, 1, 2...
+        blocks (int): The number of empty blocks mined after the events.
+
+    Returns:
+        SyntheticChain: The chain, with a `FundsDeposited` event of amount 9 at block 35.
+    """
+    chain = SyntheticChain()
+    for i in range(slashes):
+        chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": i}, block_number=10 * i)
+    chain.emit("FundsDeposited", {"provider": "0x" + "11" * 20, "amount": 9}, block_number=35)
+    chain.mine(blocks)
+    return chain
+
+
+def fake_hypersync(chain: Optional[SyntheticChain] = None, **kwargs) -> Hypersync:
+    """
+    Create a Hypersync client answering from a synthetic chain instead of the network.
+
+    Args:
+        chain (Optional[SyntheticChain]): The chain to serve, optional. Defaults to an empty chain.
+        **kwargs: Further `Hypersync` attributes, e.g. `cache` or `tx_index`.
+
+    Returns:
+        Hypersync: The client. Its `client` is the `FakeHypersyncClient`.
+    """
+    client = Hypersync(url="http://localhost", pool=ClientPool(), **kwargs)
+    client.client = FakeHypersyncClient(chain if chain is not None else SyntheticChain())
+    return client
@@ -0,0 +1,171 @@
+import os
+import re
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Schema of the index. Hashes are stored as raw 32 byte values, half the size of their hex strings
+TX_INDEX_SCHEMA = {"hash": pl.Binary, "block_number": pl.UInt64}
+
+# A prefixed hex 32 byte transaction hash
+TX_HASH_PATTERN = re.compile(r"0x[0-9a-fA-F]{64}")
+
+
+def hash_to_binary(hash: pl.Expr) -> pl.Expr:
+    """Convert prefixed hex hashes to their raw bytes."""
+    return hash.str.to_lowercase().str.strip_prefix("0x").str.decode("hex")
+
+
+def check_tx_hashes(hashes: List[str]) -> None:
+    """
+    Validate transaction hashes before they are looked up or queried.
+
+    Args:
+        hashes (List[str]): The transaction hashes.
+
+    Raises:
+        ValueError: If a hash isn't a prefixed hex 32 byte hash, naming the invalid hashes.
+    """
+    invalid = [tx for tx in hashes if not isinstance(tx, str) or not TX_HASH_PATTERN.fullmatch(tx)]
+    if invalid:
+        raise ValueError(f"Invalid transaction hashes: {', '.join(map(repr, invalid))}")
+
+
+def group_block_ranges(located: dict[str, int], max_gap: int = 1_000) -> List[tuple[int, int, List[str]]]:
+    """
+    Group located transactions into the fewest block ranges, merging blocks at most `max_gap` blocks apart.
+
+    Args:
+        located (dict[str, int]): The block number of each transaction hash.
+        max_gap (int): The largest gap between two blocks queried in the same range.
+
+    Returns:
+        List[tuple[int, int, List[str]]]: The [from_block, to_block) ranges with the hashes they contain, in block
+            order.
+    """
+    if not located:
+        return []
+    groups = (
+        pl.DataFrame(
+            {"hash": list(located), "block_number": list(located.values())},
+            schema={"hash": pl.String, "block_number": pl.Int64},
+        )
+        .sort("block_number")
+        .with_columns(group=(pl.col("block_number").diff().fill_null(0) > max_gap).cum_sum())
+        .group_by("group", maintain_order=True)
+        .agg(
+            pl.col("block_number").min().alias("from_block"),
+            (pl.col("block_number").max() + 1).alias("to_block"),
+            pl.col("hash"),
+        )
+    )
+    return list(zip(groups["from_block"], groups["to_block"], groups["hash"].to_list()))
+
+
+@dataclass
+class TxIndex:
+    """
+    A local index of transaction hashes to the block numbers that include them.
+
+    The index is filled as a side effect of queries returning transactions or event logs, or by
+    `Hypersync.backfill_tx_index`, and persisted as a single Parquet file sorted by hash. Entries are only hints:
+    transactions missing from their indexed block, e.g. after a reorg, are searched for again.
+
+    Updates are buffered and merged into the index on the next lookup, or once they hold `max_pending_rows` rows, so
+    a long stream of queries without lookups doesn't grow the buffer without bound.
+
+    Attributes:
+        path (Optional[str]): The Parquet file persisting the index, optional. Loaded on creation if it exists.
+        max_pending_rows (int): The number of buffered rows that triggers a merge into the index.
+        frame (pl.DataFrame): The indexed hashes and block numbers.
+    """
+
+    path: Optional[str] = None
+    max_pending_rows: int = 1_000_000
+    frame: pl.DataFrame = field(init=False, repr=False)
+    _pending: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _pending_rows: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the persisted index, if any."""
+        if self.path and os.path.exists(self.path):
+            self.frame = pl.read_parquet(self.path)
+        else:
+            self.frame = pl.DataFrame(schema=TX_INDEX_SCHEMA)
+
+    def update(self, df: Optional[pl.DataFrame], hash_column: str = "hash") -> None:
+        """
+        Add the transactions of a DataFrame to the index.
+
+        Args:
+            df (Optional[pl.DataFrame]): Rows with a prefixed hex transaction hash and a "block_number" column.
+                Ignored if None or missing either column.
+            hash_column (str): The name of the transaction hash column.
+        """
+        if df is None or hash_column not in df.columns or "block_number" not in df.columns:
+            return
+        rows = df.select(
+            hash_to_binary(pl.col(hash_column)).alias("hash"),
+            pl.col("block_number").cast(pl.UInt64),
+        ).drop_nulls()
+        self._pending.append(rows)
+        self._pending_rows += rows.height
+        if self._pending_rows >= self.max_pending_rows:
+            self.compact()
+
+    def compact(self) -> pl.DataFrame:
+        """
+        Merge pending updates into the index, keeping the latest block of each hash.
+
+        Returns:
+            pl.DataFrame: The index.
+        """
+        if self._pending:
+            self.frame = (
+                pl.concat([self.frame, *self._pending])
+                .unique("hash", keep="last", maintain_order=True)
+                .sort("hash")
+            )
+            self._pending, self._pending_rows = [], 0
+        return self.frame
+
+    def lookup(self, hashes: List[str]) -> dict[str, int]:
+        """
+        Look up the block numbers of transactions.
+
+        Args:
+            hashes (List[str]): The prefixed hex transaction hashes.
+
+        Returns:
+            dict[str, int]: The block number of each indexed hash. Hashes missing from the index are left out.
+
+        Raises:
+            ValueError: If a hash isn't a prefixed hex 32 byte hash.
+        """
+        check_tx_hashes(hashes)
+        found = (
+            pl.DataFrame({"tx": hashes}, schema={"tx": pl.String})
+            .with_columns(hash_to_binary(pl.col("tx")).alias("hash"))
+            .join(self.compact(), on="hash", how="inner")
+        )
+        return dict(zip(found["tx"].to_list(), found["block_number"].to_list()))
+
+    def save(self) -> None:
+        """
+        Persist the index to `path`, atomically replacing the previous file.
+
+        Raises:
+            ValueError: If the index has no path.
+        """
+        if not self.path:
+            raise ValueError("Transaction index has no path to save to")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        self.compact().write_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return self.compact().height
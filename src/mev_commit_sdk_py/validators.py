@@ -0,0 +1,306 @@
+import os
+import pyarrow.parquet as pq
+import polars as pl
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# The validator registry events of the index, in the order they are applied within a log position tie. Staking opens
+# a validator's interval, unstaking or slashing, which also starts unstaking, closes it. Stake top-ups and withdrawals
+# don't change whether a validator is staked, so they aren't fetched
+VALIDATOR_EVENTS = ("Staked", "Unstaked", "Slashed")
+OPENING_EVENTS = ("Staked",)
+CLOSING_EVENTS = ("Unstaked", "Slashed")
+
+# Schema of the stake intervals. A validator is staked from start_block, inclusive, to end_block, exclusive, or
+# indefinitely while end_block is null
+INTERVAL_SCHEMA = {
+    "valBLSPubKey": pl.String,
+    "start_block": pl.UInt64,
+    "end_block": pl.UInt64,
+    "withdrawalAddress": pl.String,
+    "slashed": pl.Boolean,
+}
+
+
+def transitions(logs: pl.DataFrame, open_keys: pl.Series) -> pl.DataFrame:
+    """
+    Find the events that open or close a validator's interval.
+
+    After any event a validator is staked if the event opens an interval and unstaked otherwise, so an event is a
+    transition when that differs from the state after the key's previous event, or from `open_keys` for its first one.
+
+    Args:
+        logs (pl.DataFrame): The ordered events, with "valBLSPubKey", "block_number", "opens", "slashed" and
+            "withdrawalAddress" columns.
+        open_keys (pl.Series): The keys with an open interval before the events.
+
+    Returns:
+        pl.DataFrame: The transitions in order, with the "end_block" and "end_slashed" of the key's next transition
+            and the "position" of the transition among the key's transitions.
+    """
+    key = "valBLSPubKey"
+    was_open = pl.col("opens").shift(1).over(key).fill_null(pl.col(key).is_in(open_keys.implode()))
+    return (
+        logs.filter(pl.col("opens") != was_open)
+        .with_columns(
+            pl.col("block_number").shift(-1).over(key).alias("end_block"),
+            pl.col("slashed").shift(-1).over(key).alias("end_slashed"),
+            pl.int_range(pl.len()).over(key).alias("position"),
+        )
+    )
+
+
+@dataclass
+class ValidatorIndex:
+    """
+    The stake intervals of every validator BLS public key, maintained incrementally from validator registry events.
+
+    Intervals are kept in a frame sorted by start block, so membership queries for many (key, block) pairs are
+    resolved in one as-of join instead of replaying the events per key. Ingesting finds the events that open or close
+    an interval with window functions over the keys, pairs each opening with the key's next closing, and closes the
+    open intervals of the keys whose first transition is a closing.
+
+    Events must be ingested in block order. Events below `next_block` are skipped as already ingested, so overlapping
+    refreshes are harmless.
+
+    Attributes:
+        path (Optional[str]): The Parquet file persisting the intervals, optional. Loaded on creation if it exists.
+        next_block (int): The first block not ingested yet.
+    """
+
+    path: Optional[str] = None
+    next_block: int = 0
+    _closed: List[pl.DataFrame] = field(default_factory=list, init=False, repr=False)
+    _open: pl.DataFrame = field(init=False, repr=False)
+    _intervals: Optional[pl.DataFrame] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the persisted intervals, if any."""
+        if self.path and os.path.exists(self.path):
+            table = pq.read_table(self.path)
+            self.next_block = int(table.schema.metadata[b"next_block"])
+            self.load_intervals(pl.from_arrow(table))
+        else:
+            self.load_intervals(pl.DataFrame(schema=INTERVAL_SCHEMA))
+
+    def load_intervals(self, intervals: pl.DataFrame) -> None:
+        """Replace the state with intervals in `INTERVAL_SCHEMA`. Intervals without an end block are open."""
+        intervals = intervals.select(pl.col(name).cast(dtype) for name, dtype in INTERVAL_SCHEMA.items())
+        self._closed = [intervals.filter(pl.col("end_block").is_not_null())]
+        self._open = intervals.filter(pl.col("end_block").is_null())
+        self._intervals = None
+
+    def ingest(self, events: dict[str, Optional[pl.DataFrame]], next_block: Optional[int] = None) -> int:
+        """
+        Apply new validator registry events to the index.
+
+        Args:
+            events (dict[str, Optional[pl.DataFrame]]): The rows of each event, e.g. the result of
+                `Hypersync.execute_events_query` or the events of a subscription update. Rows need "valBLSPubKey"
+                and "block_number", and are ordered by "log_index" if present. Other events are ignored.
+            next_block (Optional[int]): The first block not covered by the events, optional. Defaults to the block
+                after the last event.
+
+        Returns:
+            int: The number of applied events.
+        """
+        frames = []
+        for order, event_name in enumerate(VALIDATOR_EVENTS):
+            df = events.get(event_name)
+            if df is None or df.is_empty():
+                continue
+            log_index = pl.col("log_index") if "log_index" in df.columns else pl.lit(0)
+            withdrawal_address = pl.col("withdrawalAddress") if "withdrawalAddress" in df.columns else pl.lit(None)
+            frames.append(
+                df.filter(pl.col("block_number") >= self.next_block).select(
+                    pl.col("valBLSPubKey").str.to_lowercase(),
+                    pl.col("block_number").cast(pl.UInt64),
+                    log_index.cast(pl.UInt64).alias("log_index"),
+                    pl.lit(order, dtype=pl.UInt8).alias("order"),
+                    pl.lit(event_name in OPENING_EVENTS).alias("opens"),
+                    pl.lit(event_name == "Slashed").alias("slashed"),
+                    withdrawal_address.cast(pl.String).str.to_lowercase().alias("withdrawalAddress"),
+                )
+            )
+        logs = pl.concat(frames).sort("block_number", "log_index", "order") if frames else pl.DataFrame()
+
+        if not logs.is_empty():
+            changes = transitions(logs, self._open["valBLSPubKey"])
+            opened = changes.filter(pl.col("opens")).select(
+                "valBLSPubKey",
+                pl.col("block_number").alias("start_block"),
+                "end_block",
+                "withdrawalAddress",
+                pl.when(pl.col("end_block").is_not_null()).then(pl.col("end_slashed")).alias("slashed"),
+            )
+            # A key's first transition closing an interval closes the one left open by earlier events
+            closing = changes.filter(~pl.col("opens") & (pl.col("position") == 0)).select(
+                "valBLSPubKey", pl.col("block_number").alias("end_block"), pl.col("slashed").alias("end_slashed")
+            )
+            closed = self._open.join(closing, on="valBLSPubKey", how="inner").select(
+                "valBLSPubKey",
+                "start_block",
+                pl.col("end_block_right").alias("end_block"),
+                "withdrawalAddress",
+                pl.col("end_slashed").alias("slashed"),
+            )
+            still_open = self._open.filter(~pl.col("valBLSPubKey").is_in(closing["valBLSPubKey"].implode()))
+            self._closed += [closed, opened.filter(pl.col("end_block").is_not_null())]
+            self._open = pl.concat([still_open, opened.filter(pl.col("end_block").is_null())])
+            self._intervals = None
+            self.next_block = max(self.next_block, logs["block_number"][-1] + 1)
+        if next_block is not None:
+            self.next_block = max(self.next_block, next_block)
+        return logs.height
+
+    def apply(self, update) -> int:
+        """
+        Apply an update of `Hypersync.subscribe`, rolling the index back on reorgs.
+
+        Args:
+            update (SubscriptionUpdate): The update of a subscription including the validator registry events.
+
+        Returns:
+            int: The number of applied events.
+        """
+        if update.rollback_block is not None:
+            self.rollback(update.rollback_block)
+            return 0
+        return self.ingest(update.events, update.next_block)
+
+    def rollback(self, block_number: int) -> None:
+        """
+        Undo every event at or above a block, e.g. after a reorg, so the blocks can be ingested again.
+
+        Args:
+            block_number (int): The first block to undo.
+        """
+        reopened = pl.col("end_block") >= block_number
+        self.load_intervals(
+            self.intervals.filter(pl.col("start_block") < block_number).with_columns(
+                pl.when(reopened).then(None).otherwise(pl.col("end_block")).alias("end_block"),
+                pl.when(reopened).then(None).otherwise(pl.col("slashed")).alias("slashed"),
+            )
+        )
+        self.next_block = min(self.next_block, block_number)
+
+    @property
+    def intervals(self) -> pl.DataFrame:
+        """Every stake interval in `INTERVAL_SCHEMA`, sorted by start block and key. Rebuilt only after changes."""
+        if self._intervals is None:
+            self._closed = [pl.concat(self._closed)]
+            self._intervals = (
+                pl.concat([*self._closed, self._open])
+                .sort("start_block", "valBLSPubKey")
+                .rechunk()
+            )
+        return self._intervals
+
+    def join(
+        self,
+        df: pl.DataFrame,
+        pubkey_column: str = "valBLSPubKey",
+        block_column: str = "block_number",
+    ) -> pl.DataFrame:
+        """
+        Resolve whether the validators of many (key, block) pairs were staked, in one vectorized as-of join.
+
+        Args:
+            df (pl.DataFrame): The pairs, with a prefixed hex BLS public key and a block number column.
+            pubkey_column (str): The name of the key column.
+            block_column (str): The name of the block number column.
+
+        Returns:
+            pl.DataFrame: The pairs in their original order, with a "staked" column and the "start_block",
+                "end_block", "withdrawalAddress" and "slashed" columns of the interval holding the block, if any.
+        """
+        queries = df.with_row_index("_row").with_columns(
+            pl.col(pubkey_column).str.to_lowercase().alias("_key"),
+            pl.col(block_column).cast(pl.UInt64).alias("_block"),
+        )
+        intervals = self.intervals.rename({"valBLSPubKey": "_key", "start_block": "_start"})
+        found = (
+            queries.sort("_block")
+            # Both sides are sorted by block, which can't be checked within the key groups
+            .join_asof(
+                intervals,
+                left_on="_block",
+                right_on="_start",
+                by="_key",
+                strategy="backward",
+                check_sortedness=False,
+            )
+            .with_columns(
+                staked=pl.col("_start").is_not_null()
+                & (pl.col("end_block").is_null() | (pl.col("_block") < pl.col("end_block")))
+            )
+        )
+        interval_columns = [
+            pl.when(pl.col("staked")).then(pl.col(name)).alias(name)
+            for name in ("end_block", "withdrawalAddress", "slashed")
+        ]
+        return (
+            found.sort("_row")
+            .select(
+                *df.columns,
+                "staked",
+                pl.when(pl.col("staked")).then(pl.col("_start")).alias("start_block"),
+                *interval_columns,
+            )
+        )
+
+    def contains(self, pubkeys: str | List[str], block_numbers: int | List[int]) -> pl.Series:
+        """
+        Check whether validators were staked at blocks.
+
+        Args:
+            pubkeys (str | List[str]): The prefixed hex BLS public keys.
+            block_numbers (int | List[int]): The block of each key, or one block for every key.
+
+        Returns:
+            pl.Series: Whether each key was staked at its block, in order.
+        """
+        pubkeys = [pubkeys] if isinstance(pubkeys, str) else pubkeys
+        if isinstance(block_numbers, int):
+            block_numbers = [block_numbers] * len(pubkeys)
+        queries = pl.DataFrame(
+            {"valBLSPubKey": pubkeys, "block_number": block_numbers},
+            schema={"valBLSPubKey": pl.String, "block_number": pl.UInt64},
+        )
+        return self.join(queries)["staked"]
+
+    def staked_at(self, block_number: int) -> pl.DataFrame:
+        """
+        List the validators staked at a block.
+
+        Args:
+            block_number (int): The block.
+
+        Returns:
+            pl.DataFrame: The intervals holding the block in `INTERVAL_SCHEMA`.
+        """
+        intervals = self.intervals
+        started = intervals.head(intervals["start_block"].search_sorted(block_number, side="right"))
+        return started.filter(pl.col("end_block").is_null() | (pl.col("end_block") > block_number))
+
+    def save(self) -> None:
+        """
+        Persist the intervals and the next block to `path`, atomically replacing the previous file.
+
+        Raises:
+            ValueError: If the index has no path.
+        """
+        if not self.path:
+            raise ValueError("Validator index has no path to save to")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = self.intervals.to_arrow()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), "next_block": str(self.next_block)})
+        tmp_path = f"{self.path}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return self.intervals.height
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+import polars as pl
+import pyarrow as pa
+from types import SimpleNamespace
+from mev_commit_sdk_py.arrow import hex_to_binary, join_blocks_arrow, left_join
+from mev_commit_sdk_py.hypersync_client import Hypersync, to_binary
+from mev_commit_sdk_py.testing import ReplayClient, sample_response_data
+
+
+class TestArrowOutput(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = Hypersync(url='https://mev-commit.hypersync.xyz')
+
+    def test_table_matches_frame(self):
+        for logs in (True, False):
+            for tx_data in (True, False):
+                with self.subTest(logs=logs, tx_data=tx_data):
+                    data = sample_response_data(logs)
+                    table = self.client.build_table(data, tx_data=tx_data, columns=["timestamp", "from"])
+                    frame = self.client.build_frame(data, tx_data=tx_data, columns=["timestamp", "from"])
+                    self.assertIsInstance(table, pa.Table)
+                    self.assertEqual(table.to_pylist(), frame.to_dicts())
+
+    def test_left_join_keeps_order(self):
+        left = pa.table({"key": [3, 1, 2, 3], "value": ["c", "a", "b", "d"]})
+        right = pa.table({"key": [1, 3], "other": ["x", "z"]})
+        joined = left_join(left, right, ["key"])
+        self.assertEqual(joined["value"].to_pylist(), ["c", "a", "b", "d"])
+        self.assertEqual(joined["other"].to_pylist(), ["z", "x", None, "z"])
+        # The left columns are kept without a copy
+        data = lambda table: table["value"].chunk(0).buffers()[2].address
+        self.assertEqual(data(joined), data(left))
+
+        repeated = left_join(left, pa.table({"key": [3, 3], "other": ["y", "z"]}), ["key"])
+        self.assertEqual(repeated["value"].to_pylist(), ["c", "c", "a", "b", "d", "d"])
+        self.assertEqual(repeated["other"].to_pylist(), ["y", "z", None, None, "y", "z"])
+
+    def test_hex_to_binary(self):
+        strings = pa.chunked_array([["0xdead", "0x", None], ["0XBEEF"]])
+        self.assertEqual(hex_to_binary(strings).to_pylist(), [b"\xde\xad", b"", None, b"\xbe\xef"])
+        sliced = pa.array([None, "0xaa", "0x01bc", None]).slice(1)
+        self.assertEqual(hex_to_binary(sliced).to_pylist(), [b"\xaa", b"\x01\xbc", None])
+
+        table = pa.table({"hash": ["0xab", "0xcd"], "value": [1, 2]})
+        self.assertEqual(
+            pl.from_arrow(to_binary(table, ["hash"])).to_dicts(),
+            to_binary(pl.from_arrow(table), ["hash"]).to_dicts(),
+        )
+
+    def test_join_blocks_suffixes_clashing_columns(self):
+        data = sample_response_data()
+        joined = join_blocks_arrow(data.transactions, data.blocks)
+        self.assertEqual(joined.column_names, ["hash", "block_number", "from", "timestamp", "hash_block"])
+
+    def test_get_blocks_returns_arrow(self):
+        client = Hypersync(url='https://mev-commit.hypersync.xyz')
+        client.client = ReplayClient([SimpleNamespace(data=sample_response_data(), next_block=3)])
+        blocks = asyncio.run(client.get_blocks(from_block=0, to_block=3, output="arrow", print_time=False))
+        self.assertIsInstance(blocks, pa.Table)
+        self.assertEqual(blocks.num_rows, 2)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(client.get_blocks(from_block=0, to_block=3, output="pandas", print_time=False))
+
+    def test_lazy_arrow_is_rejected(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.client.get_blocks_txs(0, 10, lazy=True, output="arrow", print_time=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from benchmarks.run import STAGES, compare, run_case
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_stages_run(self):
+        for stage in STAGES:
+            with self.subTest(stage=stage):
+                result = run_case(stage, "FundsSlashed", 40, repeat=1)
+                self.assertEqual(result["rows"], 40)
+                self.assertGreater(result["rows_per_sec"], 0)
+                self.assertGreater(result["peak_rss_mb"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = [{"stage": "join", "event": "FundsSlashed", "rows": 10, "rows_per_sec": 1000.0}]
+        self.assertEqual(compare([dict(baseline[0], rows_per_sec=900.0)], baseline, threshold=0.2), [])
+        self.assertEqual(len(compare([dict(baseline[0], rows_per_sec=700.0)], baseline, threshold=0.2)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
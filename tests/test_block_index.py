@@ -0,0 +1,155 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import polars as pl
+from datetime import datetime, timezone
+from decimal import Decimal
+from mev_commit_sdk_py.block_index import BlockIndex
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+WINNER = "0x" + "ab" * 20
+GENESIS = 1_700_000_000
+
+
+class TestBlockIndex(unittest.TestCase):
+
+    def setUp(self):
+        # 30 blocks 12 seconds apart with distinct base fees and gas used, and an event every third block
+        self.chain = SyntheticChain(genesis_timestamp=GENESIS, block_time=12)
+        for block in range(0, 30, 3):
+            self.chain.emit("NewL1Block", {"blockNumber": block, "winner": WINNER, "window": 1}, block_number=block)
+        self.chain.mine(30 - self.chain.height)
+        for block in self.chain.blocks:
+            block["base_fee_per_gas"] = 7 + block["number"]
+            block["gas_used"] = 1_000 * block["number"]
+        self.client = fake_hypersync(self.chain)
+
+    def indexed_client(self, to_block=None):
+        index = BlockIndex()
+        client = fake_hypersync(self.chain, block_index=index)
+        asyncio.run(client.update_block_index(index, to_block=to_block))
+        return client
+
+    def test_update_and_lookup(self):
+        index = BlockIndex()
+        self.assertEqual(asyncio.run(self.client.update_block_index(index, from_block=4, to_block=20)), 16)
+        self.assertEqual((index.first_block, index.next_block, len(index)), (4, 20, 16))
+        self.assertEqual(asyncio.run(self.client.update_block_index(index)), 10)
+        self.assertEqual(asyncio.run(self.client.update_block_index(index)), 0)
+
+        found = index.lookup(pl.Series([5, 2, 29, 30]))
+        self.assertEqual(found["timestamp"].to_list(), [GENESIS + 60, None, GENESIS + 348, None])
+        self.assertEqual(found["base_fee_per_gas"].to_list(), [Decimal(12), None, Decimal(36), None])
+        self.assertEqual(found["gas_used"].to_list(), [5_000, None, 29_000, None])
+        self.assertEqual(index.last_timestamp, GENESIS + 348)
+
+    def test_results_match_fetched_block_columns(self):
+        client = self.indexed_client()
+        expected = asyncio.run(self.client.execute_event_query("NewL1Block", print_time=False))
+        result = asyncio.run(client.execute_event_query("NewL1Block", print_time=False))
+        self.assertTrue(result.equals(expected))
+        self.assertNotIn("timestamp", client.client.queries[-1].field_selection.block)
+
+        lazy = asyncio.run(client.execute_event_query("NewL1Block", print_time=False, lazy=True))
+        self.assertTrue(lazy.collect().equals(expected))
+        arrow = asyncio.run(client.execute_event_query("NewL1Block", print_time=False, output="arrow"))
+        self.assertTrue(pl.from_arrow(arrow).equals(expected))
+
+        events = asyncio.run(client.execute_events_query(["NewL1Block"], print_time=False))
+        self.assertTrue(events["NewL1Block"].equals(expected.select(events["NewL1Block"].columns)))
+
+        columns = ["hash", "gas_used", "timestamp", "base_fee_per_gas", "gas_used_block"]
+        expected = asyncio.run(self.client.get_blocks_txs(print_time=False, columns=columns))
+        result = asyncio.run(client.get_blocks_txs(print_time=False, columns=columns))
+        self.assertTrue(result.equals(expected))
+        self.assertEqual(client.client.queries[-1].field_selection.block, [])
+
+    def test_uncovered_ranges_fetch_block_columns(self):
+        index = BlockIndex()
+        asyncio.run(self.client.update_block_index(index, from_block=10, to_block=20))
+        client = fake_hypersync(self.chain, block_index=index)
+        query = {"from_block": 3, "to_block": 12, "print_time": False}
+        expected = asyncio.run(self.client.execute_event_query("NewL1Block", **query))
+        result = asyncio.run(client.execute_event_query("NewL1Block", **query))
+        self.assertTrue(result.equals(expected))
+        self.assertIn("timestamp", client.client.queries[-1].field_selection.block)
+        self.assertEqual(index.next_block, 20)
+
+        # A query starting inside the index extends it to its end, the chain height
+        result = asyncio.run(client.execute_event_query("NewL1Block", from_block=15, print_time=False))
+        self.assertEqual(index.next_block, 29)
+        self.assertNotIn("timestamp", client.client.queries[-1].field_selection.block)
+        self.assertEqual(result["timestamp"].to_list(), [GENESIS + 12 * b for b in (15, 18, 21, 24, 27)])
+
+    def test_time_ranges(self):
+        client = fake_hypersync(self.chain, block_index=BlockIndex())
+        with self.assertRaises(ValueError):
+            asyncio.run(client.get_block_range(from_time=GENESIS + 50))
+        self.assertEqual(client.client.queries, [])
+
+        # The index is extended to the chain height when a time is past its last block
+        asyncio.run(client.update_block_index(client.block_index, from_block=0, to_block=10))
+        result = asyncio.run(
+            client.execute_event_query("NewL1Block", from_time=GENESIS + 50, to_time=GENESIS + 216, print_time=False)
+        )
+        self.assertEqual(result["block_number"].to_list(), [6, 9, 12, 15])
+        self.assertEqual(client.block_index.next_block, 30)
+
+        start = datetime.fromtimestamp(GENESIS + 60, tz=timezone.utc)
+        self.assertEqual(
+            asyncio.run(client.get_block_range(from_time=start, to_time=GENESIS + 60.5 + 12)),
+            {"from_block": 5, "to_block": 7},
+        )
+        self.assertEqual(asyncio.run(client.get_block_range(from_block=2, to_time=GENESIS + 24))["from_block"], 2)
+        blocks = asyncio.run(client.get_blocks(from_time=GENESIS + 320, print_time=False))
+        self.assertEqual(blocks["number"].to_list(), [27, 28])
+
+        with self.assertRaises(ValueError):
+            asyncio.run(client.get_block_range(from_time=GENESIS + 100, to_time=GENESIS))
+        # Times before the first block resolve to it only for an index starting at genesis
+        self.assertEqual(asyncio.run(client.block_at_time(GENESIS - 100)), 0)
+        later = fake_hypersync(self.chain, block_index=BlockIndex())
+        asyncio.run(later.update_block_index(later.block_index, from_block=10))
+        with self.assertRaises(ValueError):
+            asyncio.run(later.get_block_range(from_time=GENESIS + 60))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.client.execute_event_query("NewL1Block", from_time=GENESIS, print_time=False))
+
+    def test_save_load_and_rollback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks")
+            index = BlockIndex(path=path)
+            asyncio.run(self.client.update_block_index(index, to_block=12))
+            asyncio.run(self.client.update_block_index(index))
+            self.assertEqual(
+                sorted(os.listdir(path)), ["000000000000-000000000012.arrow", "000000000012-000000000030.arrow"]
+            )
+
+            loaded = BlockIndex(path=path)
+            self.assertEqual((loaded.first_block, loaded.next_block), (0, 30))
+            self.assertTrue(loaded.frame.equals(index.frame))
+
+            loaded.rollback(20)
+            self.assertEqual(loaded.next_block, 20)
+            loaded.save()
+            self.assertEqual(os.listdir(path), ["000000000000-000000000020.arrow"])
+            self.chain.reorg(20)
+            self.chain.mine(5)
+            asyncio.run(self.client.update_block_index(loaded))
+            reloaded = BlockIndex(path=path)
+            self.assertEqual(reloaded.next_block, 25)
+            self.assertEqual(reloaded.frame["number"].to_list(), list(range(25)))
+
+    def test_invalid_index(self):
+        index = BlockIndex()
+        asyncio.run(self.client.update_block_index(index, to_block=5))
+        blocks = asyncio.run(self.client.get_blocks(from_block=6, to_block=8, print_time=False))
+        with self.assertRaises(ValueError):
+            index.ingest(blocks)
+        with self.assertRaises(ValueError):
+            index.save()
+
+
+if __name__ == '__main__':
+    unittest.main()
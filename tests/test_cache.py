@@ -0,0 +1,116 @@
+import asyncio
+import hypersync
+import tempfile
+import unittest
+import polars as pl
+from mev_commit_sdk_py.cache import EventCache, merge_ranges
+from mev_commit_sdk_py.hypersync_client import EVENT_REGISTRY
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+
+class TestEventCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = EventCache(self.tmp.name, reorg_depth=10)
+        self.key = self.cache.key("FundsSlashed", "0xabc")
+        self.fetched = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def fetch(self, start, end):
+        self.fetched.append((start, end))
+        return pl.DataFrame({"block_number": list(range(start, end, 5)), "log_index": 0})
+
+    def test_merge_ranges(self):
+        self.assertEqual(merge_ranges([[5, 10], [0, 5], [20, 30], [25, 26]]), [[0, 10], [20, 30]])
+
+    def test_fetches_only_missing_ranges(self):
+        df = asyncio.run(self.cache.fetch(self.key, 0, 100, 100, self.fetch))
+        self.assertEqual(self.fetched, [(0, 90), (90, 100)])
+        self.assertEqual(df["block_number"].to_list(), list(range(0, 100, 5)))
+
+        # The unfinalized tip is fetched again along with the new blocks
+        self.fetched.clear()
+        df = asyncio.run(self.cache.fetch(self.key, 0, 150, 150, self.fetch))
+        self.assertEqual(self.fetched, [(90, 140), (140, 150)])
+        self.assertEqual(df["block_number"].to_list(), list(range(0, 150, 5)))
+
+        # A fully cached sub-range is served from disk
+        self.fetched.clear()
+        df = asyncio.run(self.cache.fetch(self.key, 20, 60, 150, self.fetch))
+        self.assertEqual(self.fetched, [])
+        self.assertEqual(df["block_number"].to_list(), list(range(20, 60, 5)))
+
+    def test_gaps_are_fetched_concurrently(self):
+        asyncio.run(self.cache.fetch(self.key, 20, 40, 200, self.fetch))
+        asyncio.run(self.cache.fetch(self.key, 60, 80, 200, self.fetch))
+        self.fetched.clear()
+        running, peak = 0, 0
+
+        async def slow_fetch(start, end):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return await self.fetch(start, end)
+
+        df = asyncio.run(self.cache.fetch(self.key, 0, 200, 200, slow_fetch, max_concurrency=3))
+        self.assertEqual(sorted(self.fetched), [(0, 20), (40, 60), (80, 190), (190, 200)])
+        self.assertEqual(peak, 3)
+        self.assertEqual(df["block_number"].to_list(), list(range(0, 200, 5)))
+        self.assertEqual(self.cache.missing_ranges(self.key, 0, 200), [[190, 200]])
+
+    def test_overlapping_fetches_keep_every_range(self):
+        async def fetch_all(ranges):
+            await asyncio.gather(*(self.cache.fetch(self.key, start, end, 200, self.fetch) for start, end in ranges))
+
+        # Each event loop serializes its own manifest writes
+        asyncio.run(fetch_all([(0, 30), (20, 60), (50, 80)]))
+        asyncio.run(fetch_all([(100, 130), (120, 160)]))
+        self.assertEqual(self.cache.missing_ranges(self.key, 0, 190), [[80, 100], [160, 190]])
+        # Blocks fetched by more than one query are stored once
+        expected = list(range(0, 80, 5)) + list(range(100, 160, 5))
+        self.assertEqual(self.cache.read(self.key, 0, 190)["block_number"].to_list(), expected)
+
+    def test_key_covers_decoding(self):
+        spec = EVENT_REGISTRY.get("FundsSlashed")
+        key = self.cache.key(spec.name, spec.contract, signature=spec.signature, column_mapping=spec.column_mapping)
+        mapping = hypersync.ColumnMapping(decoded_log={"amount": hypersync.DataType.FLOAT64})
+        self.assertNotEqual(key, self.cache.key(spec.name, spec.contract))
+        self.assertNotEqual(
+            key, self.cache.key(spec.name, spec.contract, signature=spec.signature, column_mapping=mapping)
+        )
+        self.assertNotEqual(
+            key,
+            self.cache.key(
+                spec.name, spec.contract, signature=spec.signature.replace("uint256", "uint128"),
+                column_mapping=spec.column_mapping,
+            ),
+        )
+
+    def test_cached_results_keep_the_query_schema(self):
+        chain = SyntheticChain()
+        for i in range(3):
+            chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": i}, block_number=10 * i)
+        chain.mine(100)
+        for tx_data in (True, False):
+            with self.subTest(tx_data=tx_data):
+                query = {"from_block": 0, "to_block": 100, "tx_data": tx_data}
+                expected = asyncio.run(fake_hypersync(chain).execute_event_query("FundsSlashed", **query))
+                cached = fake_hypersync(chain, cache=EventCache(self.tmp.name, reorg_depth=10))
+                for _ in range(2):
+                    self.assertTrue(asyncio.run(cached.execute_event_query("FundsSlashed", **query)).equals(expected))
+        self.assertEqual(expected.columns, ["provider", "amount"])
+
+    def test_invalidate(self):
+        asyncio.run(self.cache.fetch(self.key, 0, 100, 100, self.fetch))
+        self.cache.invalidate(self.key, 42)
+        self.assertEqual(self.cache.missing_ranges(self.key, 0, 100), [[42, 100]])
+        self.assertEqual(self.cache.read(self.key, 0, 100)["block_number"].max(), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import polars as pl
+from decimal import Decimal
+from mev_commit_sdk_py.commitments import CommitmentBook
+from mev_commit_sdk_py.hypersync_client import SubscriptionUpdate
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+
+def commitment_index(i: int) -> str:
+    return "0x" + format(i, "064x")
+
+
+def store(chain: SyntheticChain, i: int) -> None:
+    chain.emit("UnopenedCommitmentStored", {
+        "commitmentIndex": commitment_index(i),
+        "committer": "0x" + "11" * 20,
+        "commitmentDigest": "0x" + "22" * 32,
+        "commitmentSignature": "0x" + "33" * 65,
+        "dispatchTimestamp": 1_000 + i,
+    })
+
+
+def open_commitment(chain: SyntheticChain, i: int, bidder: str = "0x" + "44" * 20) -> None:
+    chain.emit("OpenedCommitmentStored", {
+        "commitmentIndex": commitment_index(i),
+        "bidder": bidder,
+        "commiter": "0x" + "11" * 20,
+        "bid": 10**18 + i,
+        "blockNumber": 20_000_000 + i,
+        "bidHash": "0x" + "55" * 32,
+        "decayStartTimeStamp": 1,
+        "decayEndTimeStamp": 2,
+        "txnHash": "ab" * 32,
+        "revertingTxHashes": "",
+        "commitmentHash": "0x" + "66" * 32,
+        "bidSignature": "0x" + "77" * 65,
+        "commitmentSignature": "0x" + "88" * 65,
+        "dispatchTimestamp": 5,
+        "sharedSecretKey": "0x" + "99" * 32,
+    })
+
+
+def process(chain: SyntheticChain, i: int, is_slash: bool = False) -> None:
+    chain.emit("CommitmentProcessed", {"commitmentIndex": commitment_index(i), "isSlash": is_slash})
+
+
+class TestCommitmentBook(unittest.TestCase):
+
+    def setUp(self):
+        # Blocks 0-2 store commitments 0-2, blocks 3-4 open 0 and 1, block 5 settles 0 and block 6 slashes 1
+        self.chain = SyntheticChain()
+        for i in range(3):
+            store(self.chain, i)
+        open_commitment(self.chain, 0)
+        open_commitment(self.chain, 1)
+        process(self.chain, 0)
+        process(self.chain, 1, is_slash=True)
+        self.client = fake_hypersync(self.chain)
+
+    def test_lifecycle(self):
+        book = CommitmentBook()
+        self.assertEqual(asyncio.run(self.client.update_commitment_book(book)), 7)
+        self.assertEqual(book.next_block, 7)
+        self.assertEqual(len(book), 3)
+
+        settled = book.get(commitment_index(0))
+        self.assertEqual(settled["status"], "processed")
+        self.assertEqual((settled["stored_block"], settled["opened_block"], settled["processed_block"]), (0, 3, 5))
+        self.assertEqual(settled["bid"], Decimal(10**18))
+        # The unopened commitment's signature is kept
+        self.assertEqual(settled["commitmentSignature"], "0x" + "33" * 65)
+        self.assertEqual(book.get(commitment_index(1))["status"], "slashed")
+        self.assertEqual(book.get(commitment_index(2))["status"], "unopened")
+        self.assertIsNone(book.get(commitment_index(9)))
+
+        self.assertEqual(book.status_at(commitment_index(0), 2), "unopened")
+        self.assertEqual(book.status_at(commitment_index(0), 4), "opened")
+        self.assertEqual(book.status_at(commitment_index(1), 6), "slashed")
+        self.assertIsNone(book.status_at(commitment_index(2), 1))
+
+    def test_open_at(self):
+        book = CommitmentBook()
+        asyncio.run(self.client.update_commitment_book(book))
+        for block, expected in [(0, 1), (2, 3), (5, 2), (6, 1)]:
+            self.assertEqual(book.open_count(block), expected)
+            self.assertEqual(book.open_at(block).height, expected)
+        open_at_4 = book.open_at(4)
+        self.assertEqual(
+            dict(zip(open_at_4["commitmentIndex"], open_at_4["status"])),
+            {commitment_index(0): "opened", commitment_index(1): "opened", commitment_index(2): "unopened"},
+        )
+
+    def test_incremental_updates_match_a_full_ingest(self):
+        book = CommitmentBook()
+        asyncio.run(self.client.update_commitment_book(book, to_block=4))
+        self.assertEqual(book.get(commitment_index(0))["status"], "opened")
+        # Refreshing an ingested range again changes nothing
+        self.assertEqual(book.ingest(asyncio.run(self.client.execute_events_query(
+            ["OpenedCommitmentStored"], from_block=0, to_block=4, print_time=False
+        ))), 0)
+
+        open_commitment(self.chain, 2)
+        asyncio.run(self.client.update_commitment_book(book))
+        full = CommitmentBook()
+        asyncio.run(self.client.update_commitment_book(full))
+        self.assertTrue(book.frame.equals(full.frame))
+        self.assertEqual(book.get(commitment_index(2))["status"], "opened")
+
+    def test_commitments_first_seen_opened(self):
+        # Commitment 3 is opened before its unopened commitment is seen, then opened again
+        chain = SyntheticChain()
+        open_commitment(chain, 3)
+        store(chain, 3)
+        open_commitment(chain, 3, bidder="0x" + "aa" * 20)
+        book = CommitmentBook()
+        self.assertEqual(asyncio.run(fake_hypersync(chain).update_commitment_book(book, to_block=2)), 2)
+        asyncio.run(fake_hypersync(chain).update_commitment_book(book))
+
+        commitment = book.get(commitment_index(3))
+        self.assertEqual((commitment["stored_block"], commitment["opened_block"]), (0, 0))
+        self.assertEqual(commitment["status"], "opened")
+        # The opening's signature is kept, and the missing committer is taken from the unopened commitment
+        self.assertEqual(commitment["commitmentSignature"], "0x" + "88" * 65)
+        self.assertEqual(commitment["committer"], "0x" + "11" * 20)
+        self.assertEqual(commitment["bidder"], "0x" + "44" * 20)
+        self.assertEqual(book.open_count(2), 1)
+
+    def test_rollback(self):
+        book = CommitmentBook()
+        asyncio.run(self.client.update_commitment_book(book))
+        book.rollback(4)
+        self.assertEqual(book.next_block, 4)
+        self.assertEqual(book.get(commitment_index(0))["status"], "opened")
+        self.assertEqual(book.get(commitment_index(1))["status"], "unopened")
+        self.assertIsNone(book.get(commitment_index(1))["bidder"])
+        self.assertEqual(book.open_count(10), 3)
+
+        self.chain.reorg(4)
+        process(self.chain, 0, is_slash=True)
+        asyncio.run(self.client.update_commitment_book(book))
+        self.assertEqual(book.get(commitment_index(0))["status"], "slashed")
+        self.assertEqual(book.get(commitment_index(1))["status"], "unopened")
+
+    def test_apply_subscription_updates(self):
+        book = CommitmentBook()
+        events = asyncio.run(self.client.execute_events_query(
+            ["UnopenedCommitmentStored", "CommitmentProcessed"], from_block=0, to_block=7, print_time=False
+        ))
+        self.assertEqual(book.apply(SubscriptionUpdate(events=events, next_block=7)), 5)
+        # Processed without a seen opening
+        self.assertEqual(book.get(commitment_index(0))["status"], "processed")
+        self.assertEqual(book.apply(SubscriptionUpdate(events={}, next_block=5, rollback_block=5)), 0)
+        self.assertEqual(book.get(commitment_index(0))["status"], "unopened")
+        self.assertEqual(book.next_block, 5)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "commitments.parquet")
+            book = CommitmentBook(path=path)
+            asyncio.run(self.client.update_commitment_book(book))
+            loaded = CommitmentBook(path=path)
+            self.assertEqual(loaded.next_block, 7)
+            self.assertTrue(loaded.frame.equals(book.frame))
+            self.assertEqual(loaded.open_count(4), 3)
+            self.assertIn(commitment_index(2), loaded)
+
+    def test_empty_book(self):
+        book = CommitmentBook()
+        self.assertEqual(book.open_count(100), 0)
+        self.assertTrue(book.open_at(100).is_empty())
+        self.assertEqual(book.frame.schema["bid"], pl.Decimal(38, 0))
+        with self.assertRaises(ValueError):
+            book.save()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import polars as pl
+from hypersync import DataType
+from mev_commit_sdk_py.decoding import binary_to_utf8, decode_logs, parse_event_signature
+from mev_commit_sdk_py.hypersync_client import EVENT_CONFIG
+
+
+def word(value: int) -> str:
+    return format(value, "064x")
+
+
+def padded(data: bytes) -> str:
+    return data.hex().ljust(-(-len(data) // 32) * 64, "0")
+
+
+class TestDecoding(unittest.TestCase):
+
+    def test_parse_event_signature(self):
+        params = parse_event_signature(EVENT_CONFIG["FundsRewarded"]["signature"])
+        self.assertEqual([p.name for p in params], ["commitmentDigest", "bidder", "provider", "window", "amount"])
+        self.assertEqual([p.indexed for p in params], [True, True, True, False, False])
+
+    def test_parse_all_configured_signatures(self):
+        for event_name, config in EVENT_CONFIG.items():
+            with self.subTest(event_name=event_name):
+                self.assertTrue(parse_event_signature(config["signature"]))
+
+    def test_decode_static_and_dynamic_values(self):
+        signature = "Stored(bytes32 indexed index, address bidder, uint256 bid, string txnHash, bytes signature, bool isSlash, uint64 blockNumber)"
+        head = ["00" * 12 + "11" * 20, word(10**20), word(6 * 32), word(8 * 32), word(1), word(42)]
+        tail = [word(3), padded(b"abc"), word(4), padded(bytes([1, 2, 3, 250]))]
+        logs_df = pl.DataFrame({
+            "topic1": ["0x" + "cd" * 32],
+            "data": ["0x" + "".join(head + tail)],
+        })
+
+        decoded = decode_logs(logs_df, signature, {"blockNumber": DataType.UINT64}).row(0, named=True)
+        self.assertEqual(decoded["index"], "0x" + "cd" * 32)
+        self.assertEqual(decoded["bidder"], "0x" + "11" * 20)
+        self.assertEqual(int(decoded["bid"], 16), 10**20)
+        self.assertEqual(decoded["txnHash"], "abc")
+        self.assertEqual(decoded["signature"], "0x010203fa")
+        self.assertTrue(decoded["isSlash"])
+        self.assertEqual(decoded["blockNumber"], 42)
+
+    def test_binary_to_utf8_fallbacks(self):
+        series = pl.Series("text", [b"caf\xc3\xa9", b"caf\xe9", None])
+        self.assertEqual(binary_to_utf8(series).to_list(), ["café", "caf\ufffd", None])
+        self.assertEqual(binary_to_utf8(series, fallback="latin-1").to_list(), ["café", "café", None])
+
+    def test_decode_integer_mapping_above_32_bits(self):
+        logs_df = pl.DataFrame({"topic1": ["0x" + word(7)], "data": ["0x" + word(2**63 + 5)]})
+        decoded = decode_logs(
+            logs_df, "Withdraw(address indexed provider, uint256 amount)", {"amount": DataType.UINT64}
+        )
+        self.assertEqual(decoded["amount"].to_list(), [2**63 + 5])
+
+    def test_decode_exact_uint256_amounts(self):
+        logs_df = pl.DataFrame({
+            "topic1": ["0x" + word(7)] * 2,
+            "data": ["0x" + word(10**30 + 7), "0x" + word(2**64 + 1)],
+        })
+        decoded = decode_logs(
+            logs_df, "Withdraw(address indexed provider, uint256 amount)", {"amount": DataType.DECIMAL128}
+        )
+        self.assertEqual(decoded["amount"].dtype, pl.Decimal(38, 0))
+        self.assertEqual(decoded["amount"].sum(), 10**30 + 2**64 + 8)
+
+    def test_configured_amounts_are_exact(self):
+        for event_name in ("BidderRegistered", "OpenedCommitmentStored", "FundsSlashed", "StakeAdded"):
+            with self.subTest(event_name=event_name):
+                mapping = EVENT_CONFIG[event_name]["column_mapping"].decoded_log
+                amounts = [k for k in mapping if k in ("amount", "bid", "depositedAmount", "newBalance")]
+                self.assertTrue(amounts)
+                self.assertTrue(all(mapping[k] == DataType.DECIMAL128 for k in amounts))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,43 @@
 import asyncio
 import polars as pl
 import unittest
-from mev_commit_sdk_py.hypersync_client import Hypersync, EVENT_CONFIG
+from decimal import Decimal
+from mev_commit_sdk_py.hypersync_client import EVENT_CONFIG, EVENT_REGISTRY
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
 
 # expand polars df output
 pl.Config.set_fmt_str_lengths(200)
 pl.Config.set_fmt_float("full")
 
 
+def sample_value(abi_type: str, i: int):
+    """A distinct value of an ABI type."""
+    if abi_type == "address":
+        return "0x" + format(i, "040x")
+    if abi_type == "bool":
+        return i % 2 == 0
+    if abi_type.startswith(("uint", "int")):
+        return 10**18 + i if abi_type == "uint256" else i
+    if abi_type == "string":
+        return f"value {i}"
+    if abi_type == "bytes":
+        return "0x" + format(i, "08x")
+    return "0x" + format(i, "064x")
+
+
 class TestHypersyncEvents(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.client = Hypersync(url='https://mev-commit.hypersync.xyz')
+        chain = SyntheticChain()
+        cls.emitted = {}
+        for spec in EVENT_REGISTRY:
+            cls.emitted[spec.name] = [
+                {p.name: sample_value(p.type, i + j) for j, p in enumerate(spec.params)} for i in range(3)
+            ]
+            for values in cls.emitted[spec.name]:
+                chain.emit(spec, values)
+        cls.client = fake_hypersync(chain)
 
     def run_event_query_test(self, event_name: str):
         """Helper method to test a specific event name."""
@@ -23,8 +48,18 @@ class TestHypersyncEvents(unittest.TestCase):
             self.client.execute_event_query(event_name, from_block=0, to_block=5_000_000)
         )
         self.assertIsInstance(result, pl.DataFrame)
-        self.assertGreater(result.shape[0], 0, f"Results for {
-                           event_name} should not be empty")
+        self.assertGreater(result.shape[0], 0, f"Results for {event_name} should not be empty")
+
+        # Decoded values round trip
+        for param in EVENT_REGISTRY.get(event_name).params:
+            expected = [values[param.name] for values in self.emitted[event_name]]
+            actual = result[param.name].to_list()
+            if param.type.startswith("uint") and isinstance(actual[0], str):
+                # Unmapped integers are returned as hex words
+                actual = [int(v, 16) for v in actual]
+            elif param.type == "uint256":
+                expected = [Decimal(v) for v in expected]
+            self.assertEqual(actual, expected, param.name)
 
     def test_l1_blocks(self):
         event_name = "NewL1Block"
@@ -74,6 +109,26 @@ class TestHypersyncEvents(unittest.TestCase):
         event_name = "ProviderRegistered"
         self.run_event_query_test(event_name)
 
+    def test_binary_output(self):
+        """Address and bytes parameters and hashes are returned as raw bytes, other values are unchanged."""
+        hex_df = asyncio.run(self.client.execute_event_query(
+            "OpenedCommitmentStored", from_block=0, to_block=5_000_000, print_time=False
+        ))
+        df = asyncio.run(self.client.execute_event_query(
+            "OpenedCommitmentStored", from_block=0, to_block=5_000_000, print_time=False, binary=True
+        ))
+        for column in ("bidder", "commitmentIndex", "bidSignature", "hash", "from"):
+            self.assertEqual(df[column].dtype, pl.Binary)
+            self.assertEqual(["0x" + v.hex() for v in df[column]], hex_df[column].to_list())
+        self.assertEqual(df["txnHash"].to_list(), hex_df["txnHash"].to_list())
+        self.assertEqual(df["bid"].to_list(), hex_df["bid"].to_list())
+
+        frames = asyncio.run(self.client.execute_events_query(
+            ["FundsSlashed", "OpenedCommitmentStored"], from_block=0, to_block=5_000_000, print_time=False, binary=True
+        ))
+        self.assertEqual(frames["FundsSlashed"]["provider"].dtype, pl.Binary)
+        self.assertEqual(frames["OpenedCommitmentStored"]["bidder"].dtype, pl.Binary)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import asyncio
 import polars as pl
-from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
 
 # Configure polars for expanded output
 pl.Config.set_fmt_str_lengths(200)
@@ -12,20 +12,37 @@ class TestHypersyncClient(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        mev_commit_url = 'https://mev-commit.hypersync.xyz'
-        cls.client = Hypersync(mev_commit_url)
+        chain = SyntheticChain()
+        chain.mine(100)
+        for block_number in range(0, 100_000, 7_919):
+            chain.add_transaction(block_number)
+        cls.client = fake_hypersync(chain)
 
     def test_get_blocks_txs_historical(self):
         """Test arbitrary block range query."""
         async def run_test():
             df = await self.client.get_blocks_txs(from_block=0, to_block=100000)
             self.assertIsInstance(df, pl.DataFrame)
-            # It's okay if df.shape[0] is 0
-            self.assertGreaterEqual(df.shape[0], 0)
-            print(df.shape)
+            self.assertEqual(df.shape[0], 13)
+            self.assertEqual(df["block_number"].to_list(), list(range(0, 100_000, 7_919)))
+            # Block columns are joined to their transactions
+            self.assertEqual(df["timestamp"].null_count(), 0)
 
         asyncio.run(run_test())
 
+    def test_get_blocks_txs_binary(self):
+        """Hashes and addresses are returned as raw bytes."""
+        hex_df = asyncio.run(self.client.get_blocks_txs(from_block=0, to_block=100000, print_time=False))
+        df = asyncio.run(self.client.get_blocks_txs(from_block=0, to_block=100000, print_time=False, binary=True))
+        for column in ("hash", "from", "to"):
+            self.assertEqual(df[column].dtype, pl.Binary)
+            self.assertEqual(["0x" + v.hex() for v in df[column]], hex_df[column].to_list())
+        self.assertEqual(df["block_number"].to_list(), hex_df["block_number"].to_list())
+
+        blocks = asyncio.run(self.client.get_blocks(from_block=0, to_block=10, print_time=False, binary=True))
+        self.assertEqual(blocks["hash"].dtype, pl.Binary)
+        self.assertEqual(len(blocks["hash"][0]), 32)
+
 
 if __name__ == '__main__':
     unittest.main()
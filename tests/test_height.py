@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from mev_commit_sdk_py.hypersync_client import Hypersync
+
+
+class CountingClient:
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_height(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return 100 + self.calls
+
+
+class TestHeight(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Hypersync(url="http://localhost:1")
+        self.client.client = CountingClient()
+
+    def test_concurrent_callers_share_one_request(self):
+        async def run():
+            return await asyncio.gather(*(self.client.get_height() for _ in range(50)))
+
+        self.assertEqual(asyncio.run(run()), [101] * 50)
+        self.assertEqual(self.client.client.calls, 1)
+
+    def test_ttl(self):
+        async def run():
+            first = await self.client.get_height()
+            cached = await self.client.get_height()
+            fresh = await self.client.get_height(max_age=0)
+            return first, cached, fresh
+
+        self.assertEqual(asyncio.run(run()), (101, 101, 102))
+
+    def test_pin_height(self):
+        async def run():
+            async with self.client.pin_height() as pinned:
+                heights = await asyncio.gather(self.client.get_height(), self.client.get_height())
+                block_range = await self.client.get_block_range(block_range=10)
+            return pinned, heights, block_range, await self.client.get_height(max_age=0)
+
+        pinned, heights, block_range, after = asyncio.run(run())
+        self.assertEqual(heights, [pinned, pinned])
+        self.assertEqual(block_range, {"from_block": pinned - 10, "to_block": pinned})
+        self.assertEqual(after, pinned + 1)
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        async def run():
+            first = asyncio.ensure_future(self.client.get_height())
+            second = asyncio.ensure_future(self.client.get_height())
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), 101)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from decimal import Decimal
+import polars as pl
+from mev_commit_sdk_py.helpers import address_to_topic, bytes_to_hex, bytes_to_string, hex_to_bytes, wei_to_eth
+
+
+class TestHelpers(unittest.TestCase):
+
+    def test_address_to_topic(self):
+        self.assertEqual(address_to_topic("0x" + "ab" * 20), "0x" + "00" * 12 + "ab" * 20)
+
+    def test_address_to_topic_column(self):
+        df = pl.DataFrame({"address": ["0x" + "ab" * 20, None]})
+        topics = df.select(address_to_topic(pl.col("address")))["address"]
+        self.assertEqual(topics.to_list(), ["0x" + "00" * 12 + "ab" * 20, None])
+
+    def test_hex_bytes_round_trip(self):
+        df = pl.DataFrame({"hash": ["0x" + "0f" * 32, "0x", None]})
+        binary = df.select(hex_to_bytes("hash"))["hash"]
+        self.assertEqual(binary.dtype, pl.Binary)
+        self.assertEqual(binary.to_list(), [b"\x0f" * 32, b"", None])
+        self.assertEqual(binary.to_frame().select(bytes_to_hex("hash"))["hash"].to_list(), df["hash"].to_list())
+
+    def test_bytes_to_string_falls_back_to_latin1(self):
+        df = pl.DataFrame({"extra_data": ["0x" + "héllo".encode().hex(), "0x" + b"caf\xe9".hex(), None]})
+        self.assertEqual(df.select(bytes_to_string("extra_data"))["extra_data"].to_list(), ["héllo", "café", None])
+        binary = df.select(hex_to_bytes("extra_data"))
+        self.assertEqual(binary.select(bytes_to_string("extra_data"))["extra_data"].to_list(), ["héllo", "café", None])
+
+    def test_wei_to_eth_is_exact(self):
+        df = pl.DataFrame({"amount": pl.Series([10**20 + 1, 3, None], dtype=pl.Decimal(38, 0))})
+        eth = df.select(wei_to_eth("amount"))["amount"]
+        self.assertEqual(eth.dtype, pl.Decimal(38, 18))
+        self.assertEqual(eth.to_list(), [Decimal("100.000000000000000001"), Decimal("3e-18"), None])
+
+    def test_wei_to_gwei_from_integers(self):
+        gwei = pl.DataFrame({"fee": [1_500_000_001]}).select(wei_to_eth(pl.col("fee"), decimals=9))["fee"]
+        self.assertEqual(gwei[0], Decimal("1.500000001"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import importlib.util
+import io
+import tempfile
+import unittest
+from mev_commit_sdk_py.cache import EventCache
+from mev_commit_sdk_py.resume import RetryPolicy
+from mev_commit_sdk_py.testing import FakeHypersyncClient, fake_hypersync, slashing_chain
+
+
+class FailingOnceClient(FakeHypersyncClient):
+
+    async def stream_arrow(self, query, config):
+        if not self.queries:
+            self.queries.append(query)
+            raise RuntimeError("connection reset")
+        return await super().stream_arrow(query, config)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_query_metrics(self):
+        metrics = []
+        client = fake_hypersync(slashing_chain(slashes=5, blocks=100), listeners=[metrics.append])
+
+        asyncio.run(client.execute_event_query("FundsSlashed", from_block=0, to_block=100, print_time=False))
+
+        (query,) = metrics
+        self.assertEqual(query.name, "execute_event_query")
+        self.assertEqual((query.from_block, query.to_block, query.block_range), (0, 100, 100))
+        self.assertEqual(query.rows["logs"], 5)
+        self.assertEqual(query.rows["transactions"], 5)
+        self.assertGreater(query.bytes_received, 0)
+        self.assertEqual(set(query.phases), {"network", "decode", "join"})
+        self.assertGreaterEqual(query.duration, max(query.phases.values()))
+        self.assertIsNone(query.error)
+
+    def test_timings_are_logged_not_printed(self):
+        client = fake_hypersync(slashing_chain(slashes=5, blocks=100))
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with self.assertLogs("mev_commit_sdk_py.hypersync_client", level="DEBUG") as logs:
+                asyncio.run(client.execute_event_query("FundsSlashed", from_block=0, to_block=100))
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIn("execute_event_query query finished in", logs.output[0])
+
+        with contextlib.redirect_stdout(stdout):
+            with self.assertLogs("mev_commit_sdk_py.hypersync_client", level="INFO") as logs:
+                asyncio.run(client.get_blocks(from_block=0, to_block=5, print_time=True))
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(logs.records[0].levelname, "INFO")
+        self.assertIn("get_blocks query finished in", logs.output[0])
+
+    def test_retries_cache_and_errors(self):
+        metrics = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = fake_hypersync(
+                cache=EventCache(cache_dir, reorg_depth=10),
+                retry=RetryPolicy(base_delay=0),
+                listeners=[metrics.append],
+            )
+            client.client = FailingOnceClient(slashing_chain(slashes=5, blocks=100))
+
+            for _ in range(2):
+                asyncio.run(client.execute_event_query("FundsSlashed", from_block=0, to_block=100, print_time=False))
+            with self.assertRaises(ValueError):
+                asyncio.run(client.execute_event_query("Unknown", print_time=False))
+
+        first, second, failed = metrics
+        self.assertEqual(first.retries, 1)
+        self.assertEqual((first.cache_hit_blocks, first.cache_miss_blocks), (0, 100))
+        self.assertEqual((second.cache_hit_blocks, second.cache_miss_blocks), (100, 0))
+        self.assertIn("Unsupported event name", failed.error)
+
+    def test_failing_listener_warns(self):
+        def fail(metrics):
+            raise RuntimeError("exporter down")
+
+        client = fake_hypersync(slashing_chain(slashes=5, blocks=100), listeners=[fail])
+        with self.assertWarns(RuntimeWarning):
+            asyncio.run(client.get_blocks(from_block=0, to_block=10, print_time=False))
+
+    @unittest.skipUnless(importlib.util.find_spec("prometheus_client"), "prometheus_client is not installed")
+    def test_prometheus_listener(self):
+        import prometheus_client
+        from mev_commit_sdk_py.instrumentation import prometheus_listener
+
+        registry = prometheus_client.CollectorRegistry()
+        client = fake_hypersync(slashing_chain(slashes=5, blocks=100), listeners=[prometheus_listener(registry)])
+        asyncio.run(client.execute_event_query("FundsSlashed", from_block=0, to_block=100, print_time=False))
+        self.assertEqual(
+            registry.get_sample_value(
+                "hypersync_rows_received_total", {"query": "execute_event_query", "table": "logs"}
+            ),
+            5,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
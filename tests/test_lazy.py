@@ -0,0 +1,47 @@
+import unittest
+import polars as pl
+import pyarrow as pa
+from types import SimpleNamespace
+from polars.testing import assert_frame_equal
+from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.testing import sample_response_data
+
+
+class TestLazy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = Hypersync(url='https://mev-commit.hypersync.xyz')
+
+    def test_lazy_matches_eager(self):
+        for logs in (True, False):
+            with self.subTest(logs=logs):
+                data = sample_response_data(logs)
+                eager = self.client.build_frame(data, tx_data=True, columns=["timestamp", "from"])
+                lazy = self.client.build_frame(data, tx_data=True, columns=["timestamp", "from"], lazy=True)
+                self.assertIsInstance(lazy, pl.LazyFrame)
+                assert_frame_equal(lazy.collect(), eager)
+
+    def test_lazy_without_tx_data(self):
+        lazy = self.client.build_frame(sample_response_data(), tx_data=False, lazy=True)
+        self.assertEqual(lazy.collect_schema().names(), ["amount", "block_number", "log_index"])
+
+    def test_filter_is_pushed_below_join(self):
+        lazy = self.client.build_frame(sample_response_data(), tx_data=True, columns=["timestamp"], lazy=True)
+        filtered = lazy.filter(pl.col("amount") > 1).select("amount", "timestamp")
+        self.assertEqual(filtered.collect()["timestamp"].to_list(), [20, 20])
+
+        # The filter on a log column runs on the left input of the transaction join
+        plan = filtered.explain()
+        self.assertLess(plan.index("LEFT PLAN ON"), plan.index("FILTER"))
+        self.assertLess(plan.index("FILTER"), plan.index("RIGHT PLAN ON"))
+
+    def test_empty_response(self):
+        data = SimpleNamespace(
+            decoded_logs=pa.table({}), logs=pa.table({}), transactions=pa.table({}), blocks=pa.table({})
+        )
+        self.assertIsNone(self.client.build_frame(data, lazy=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
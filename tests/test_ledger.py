@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import polars as pl
+from decimal import Decimal
+from mev_commit_sdk_py.helpers import wei_to_eth
+from mev_commit_sdk_py.ledger import BidderLedger
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+ALICE = "0x" + "aa" * 20
+BOB = "0x" + "bb" * 20
+DIGEST = "0x" + "11" * 32
+
+
+class TestBidderLedger(unittest.TestCase):
+
+    def setUp(self):
+        # One event per block: blocks 0-2 deposit, 3-4 take funds from Alice's window 10, 5 withdraws Bob's window 10
+        self.chain = SyntheticChain()
+        self.chain.emit("BidderRegistered", {"bidder": ALICE, "depositedAmount": 10**18, "windowNumber": 10})
+        self.chain.emit("BidderRegistered", {"bidder": ALICE, "depositedAmount": 2 * 10**18, "windowNumber": 11})
+        self.chain.emit("BidderRegistered", {"bidder": BOB, "depositedAmount": 5 * 10**17, "windowNumber": 10})
+        self.chain.emit("FundsRetrieved", {"commitmentDigest": DIGEST, "bidder": ALICE, "window": 10, "amount": 10**17})
+        self.chain.emit("FundsRewarded", {
+            "commitmentDigest": DIGEST, "bidder": ALICE, "provider": BOB, "window": 10, "amount": 2 * 10**17
+        })
+        self.chain.emit("BidderWithdrawal", {"bidder": BOB, "window": 10, "amount": 5 * 10**17})
+        self.client = fake_hypersync(self.chain)
+
+    def locked(self, balances: pl.DataFrame) -> dict:
+        return {(b, w): locked for b, w, locked in balances.select("bidder", "window", "locked").iter_rows()}
+
+    def test_balances(self):
+        ledger = BidderLedger()
+        self.assertEqual(asyncio.run(self.client.update_bidder_ledger(ledger)), 6)
+        self.assertEqual(ledger.next_block, 6)
+
+        balances = ledger.balances()
+        self.assertEqual(self.locked(balances), {
+            (ALICE, 10): Decimal(7 * 10**17),
+            (ALICE, 11): Decimal(2 * 10**18),
+            (BOB, 10): Decimal(0),
+        })
+        alice = balances.row(0, named=True)
+        self.assertEqual((alice["retrieved"], alice["rewarded"]), (Decimal(10**17), Decimal(2 * 10**17)))
+
+        self.assertEqual(self.locked(ledger.balances(windows=11)), {(ALICE, 11): Decimal(2 * 10**18)})
+        self.assertEqual(set(self.locked(ledger.balances(bidders=BOB.upper().replace("0X", "0x")))), {(BOB, 10)})
+
+    def test_point_in_time_balances(self):
+        ledger = BidderLedger()
+        asyncio.run(self.client.update_bidder_ledger(ledger))
+        self.assertEqual(self.locked(ledger.balances(0)), {(ALICE, 10): Decimal(10**18)})
+        self.assertEqual(self.locked(ledger.balances(3)), {
+            (ALICE, 10): Decimal(9 * 10**17),
+            (ALICE, 11): Decimal(2 * 10**18),
+            (BOB, 10): Decimal(5 * 10**17),
+        })
+
+        locked = ledger.locked(4)
+        self.assertEqual(locked["bidder"].to_list(), [ALICE, BOB])
+        self.assertEqual(locked["windows"].to_list(), [2, 1])
+        self.assertEqual(locked.select(wei_to_eth("locked"))["locked"].to_list(), [Decimal("2.7"), Decimal("0.5")])
+        # Bob's window is withdrawn at the latest block
+        self.assertEqual(ledger.locked()["bidder"].to_list(), [ALICE])
+
+    def test_incremental_updates_match_a_full_ingest(self):
+        ledger = BidderLedger()
+        asyncio.run(self.client.update_bidder_ledger(ledger, to_block=3))
+        self.assertEqual(len(ledger), 3)
+        self.chain.emit("BidderRegistered", {"bidder": BOB, "depositedAmount": 1, "windowNumber": 12})
+        asyncio.run(self.client.update_bidder_ledger(ledger))
+        # Refreshing an ingested range again changes nothing
+        self.assertEqual(asyncio.run(self.client.update_bidder_ledger(ledger)), 0)
+        self.assertEqual(ledger.ingest(asyncio.run(self.client.execute_events_query(
+            ["BidderRegistered"], from_block=0, to_block=3, print_time=False
+        ))), 0)
+
+        full = BidderLedger()
+        asyncio.run(self.client.update_bidder_ledger(full))
+        self.assertTrue(ledger.balances().equals(full.balances()))
+        self.assertTrue(ledger.balances(4).equals(full.balances(4)))
+        self.assertTrue(ledger.flows.equals(full.flows))
+
+    def test_rollback(self):
+        ledger = BidderLedger()
+        asyncio.run(self.client.update_bidder_ledger(ledger))
+        ledger.rollback(3)
+        self.assertEqual(ledger.next_block, 3)
+        self.assertTrue(ledger.balances().equals(ledger.balances(2)))
+        self.assertEqual(self.locked(ledger.balances())[(ALICE, 10)], Decimal(10**18))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.parquet")
+            ledger = BidderLedger(path=path)
+            asyncio.run(self.client.update_bidder_ledger(ledger))
+            loaded = BidderLedger(path=path)
+            self.assertEqual(loaded.next_block, 6)
+            self.assertTrue(loaded.balances().equals(ledger.balances()))
+            self.assertTrue(loaded.balances(3).equals(ledger.balances(3)))
+
+    def test_empty_ledger(self):
+        ledger = BidderLedger()
+        self.assertTrue(ledger.balances().is_empty())
+        self.assertTrue(ledger.locked(100).is_empty())
+        self.assertEqual(ledger.balances(5).schema["locked"], pl.Decimal(38, 0))
+        with self.assertRaises(ValueError):
+            ledger.save()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+import hypersync
+from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.pool import ClientPool, ClientSettings
+
+
+class TestClientPool(unittest.TestCase):
+
+    def test_instances_share_clients(self):
+        pool = ClientPool()
+        first = Hypersync(url="http://localhost:1", pool=pool)
+        second = Hypersync(url="http://localhost:1", pool=pool)
+        other_url = Hypersync(url="http://localhost:2", pool=pool)
+        other_settings = Hypersync(
+            url="http://localhost:1", pool=pool, settings=ClientSettings(bearer_token="token", max_num_retries=3)
+        )
+
+        self.assertIs(first.client, second.client)
+        self.assertIsNot(first.client, other_url.client)
+        self.assertIsNot(first.client, other_settings.client)
+        self.assertEqual(len(pool), 3)
+
+    def test_context_manager_releases_client(self):
+        pool = ClientPool()
+
+        async def run():
+            async with Hypersync(url="http://localhost:1", pool=pool) as first:
+                async with Hypersync(url="http://localhost:1", pool=pool) as second:
+                    self.assertIs(first.client, second.client)
+                self.assertEqual(len(pool), 1)
+                # Closing twice doesn't release the client still used by `first`
+                await second.close()
+                self.assertEqual(len(pool), 1)
+
+        asyncio.run(run())
+        self.assertEqual(len(pool), 0)
+
+    def test_settings(self):
+        settings = ClientSettings(bearer_token="secret", http_req_timeout_millis=5_000)
+        self.assertNotIn("secret", repr(settings))
+
+        config = settings.client_config("http://localhost:1")
+        self.assertEqual(config.bearer_token, "secret")
+        self.assertEqual(config.http_req_timeout_millis, 5_000)
+
+    def test_batch_size(self):
+        client = Hypersync(url="http://localhost:1", pool=ClientPool(), batch_size=500)
+        self.assertEqual(client.stream_config(hypersync.StreamConfig()).batch_size, 500)
+        self.assertEqual(client.stream_config(hypersync.StreamConfig(batch_size=10)).batch_size, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+import pyarrow as pa
+from types import SimpleNamespace
+from mev_commit_sdk_py.hypersync_client import (
+    Hypersync,
+    create_field_selection,
+    EVENT_TX_COLUMNS,
+)
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+
+class TestProjection(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = Hypersync(url='https://mev-commit.hypersync.xyz')
+
+    def test_field_selection_routes_columns(self):
+        selection = create_field_selection(["timestamp", "from", "gas_used_block"], logs=True)
+        self.assertIn("from", selection.transaction)
+        self.assertIn("hash", selection.transaction)
+        self.assertIn("block_number", selection.transaction)
+        self.assertEqual(sorted(selection.block), ["gas_used", "number", "timestamp"])
+        self.assertIn("topic0", selection.log)
+
+    def test_field_selection_without_tx_data(self):
+        selection = create_field_selection([], logs=True)
+        self.assertEqual(selection.transaction, [])
+        self.assertEqual(selection.block, [])
+
+    def test_field_selection_rejects_unknown_column(self):
+        with self.assertRaises(ValueError):
+            create_field_selection(["not_a_field"])
+
+    def test_build_frame_selects_requested_columns(self):
+        data = SimpleNamespace(
+            decoded_logs=pa.table({"amount": [1, 2]}),
+            logs=pa.table({
+                "transaction_hash": ["0xa", "0xb"],
+                "block_number": [1, 2],
+                "log_index": [0, 3],
+            }),
+            transactions=pa.table({
+                "hash": ["0xa", "0xb"],
+                "block_number": [1, 2],
+                "from": ["0x1", "0x2"],
+            }),
+            blocks=pa.table({"number": [1, 2], "timestamp": [10, 20]}),
+        )
+        df = self.client.build_frame(data, tx_data=True, columns=["timestamp"])
+        self.assertEqual(df.columns, ["amount", "hash", "block_number", "log_index", "timestamp"])
+        self.assertEqual(df["timestamp"].to_list(), [10, 20])
+
+        df = self.client.build_frame(data, tx_data=False, columns=EVENT_TX_COLUMNS)
+        self.assertEqual(df.columns, ["amount", "block_number", "log_index"])
+
+    def test_registered_columns_narrow_the_field_selection(self):
+        chain = SyntheticChain()
+        chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": 5})
+        chain.emit("NewL1Block", {"blockNumber": 1, "winner": "0x" + "22" * 20, "window": 1})
+        client = fake_hypersync(chain)
+
+        df = asyncio.run(client.execute_event_query("FundsSlashed", print_time=False))
+        selection = client.client.queries[-1].field_selection
+        self.assertEqual(sorted(selection.transaction), ["block_number", "from", "hash"])
+        self.assertEqual(sorted(selection.block), ["number", "timestamp"])
+        self.assertEqual(df.columns, ["provider", "amount", "hash", "block_number", "log_index", "from", "timestamp"])
+
+        # Multi-event queries request the union, and the full projection once an event has no registered columns
+        asyncio.run(client.execute_events_query(["FundsSlashed", "OpenedCommitmentStored"], print_time=False))
+        self.assertEqual(sorted(client.client.queries[-1].field_selection.block), ["number", "timestamp"])
+        asyncio.run(client.execute_events_query(["FundsSlashed", "NewL1Block"], print_time=False))
+        self.assertIn("base_fee_per_gas", client.client.queries[-1].field_selection.block)
+        self.assertIn("gas_used", client.client.queries[-1].field_selection.transaction)
+
+
+if __name__ == '__main__':
+    unittest.main()
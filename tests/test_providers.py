@@ -0,0 +1,124 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+import polars as pl
+from decimal import Decimal
+from mev_commit_sdk_py.providers import ProviderState
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+PROVIDERS = ["0x" + format(i, "02x") * 20 for i in range(1, 5)]
+BLS_KEY = "0x" + "12" * 48
+
+
+def brute_force_totals(chain: SyntheticChain, block_number: int) -> dict:
+    """The stake and slash count of each provider, summed from every emitted event up to a block."""
+    client = fake_hypersync(chain)
+    events = asyncio.run(client.execute_events_query(
+        ["ProviderRegistered", "FundsDeposited", "Withdraw", "FundsSlashed"],
+        from_block=0, to_block=block_number + 1, print_time=False, tx_data=False,
+    ))
+    totals = {}
+    for event_name, df in events.items():
+        for row in (df.iter_rows(named=True) if df is not None else []):
+            stake, slashes = totals.get(row["provider"], (0, 0))
+            if event_name == "ProviderRegistered":
+                stake += row["stakedAmount"]
+            elif event_name == "FundsDeposited":
+                stake += row["amount"]
+            else:
+                stake -= row["amount"]
+                slashes += event_name == "FundsSlashed"
+            totals[row["provider"]] = (stake, slashes)
+    return totals
+
+
+class TestProviderState(unittest.TestCase):
+
+    def setUp(self):
+        # Providers register in blocks 0-3, then 40 random deposits, withdrawals and slashes follow
+        self.chain = SyntheticChain()
+        for provider in PROVIDERS:
+            self.chain.emit(
+                "ProviderRegistered", {"provider": provider, "stakedAmount": 10**19, "blsPublicKey": BLS_KEY}
+            )
+        rng = random.Random(7)
+        for _ in range(40):
+            event = rng.choice(["FundsDeposited", "Withdraw", "FundsSlashed"])
+            self.chain.emit(event, {"provider": rng.choice(PROVIDERS), "amount": rng.randrange(1, 10**17)})
+        self.client = fake_hypersync(self.chain)
+
+    def totals(self, snapshot: pl.DataFrame) -> dict:
+        return {p: (stake, slashes) for p, stake, slashes in snapshot.select("provider", "stake", "slashes").iter_rows()}
+
+    def test_totals(self):
+        state = ProviderState()
+        self.assertEqual(asyncio.run(self.client.update_provider_state(state)), 44)
+        self.assertEqual(state.next_block, 44)
+        self.assertEqual(len(state), 4)
+        self.assertEqual(self.totals(state.totals), brute_force_totals(self.chain, 43))
+
+        first = state.get(PROVIDERS[0].upper().replace("0X", "0x"))
+        self.assertEqual(first["staked"], Decimal(10**19))
+        self.assertEqual(first["stake"], first["staked"] + first["deposited"] - first["withdrawn"] - first["slashed"])
+        self.assertIsNone(state.get("0x" + "ff" * 20))
+
+    def test_snapshots_match_a_full_scan(self):
+        state = ProviderState(checkpoint_interval=8)
+        asyncio.run(self.client.update_provider_state(state, to_block=20))
+        asyncio.run(self.client.update_provider_state(state))
+        self.assertTrue(state.snapshot(-1).is_empty())
+        for block in [0, 3, 7, 8, 9, 15, 16, 25, 42, 43]:
+            self.assertEqual(self.totals(state.snapshot(block)), brute_force_totals(self.chain, block), block)
+        self.assertEqual(state.snapshot(1)["provider"].to_list(), PROVIDERS[:2])
+        self.assertIsNone(state.get(PROVIDERS[3], block_number=2))
+
+    def test_leaderboard(self):
+        state = ProviderState()
+        asyncio.run(self.client.update_provider_state(state))
+        board = state.leaderboard("slashed", n=2)
+        self.assertEqual(board.height, 2)
+        expected = state.totals.sort("slashed", descending=True)["slashed"].head(2).to_list()
+        self.assertEqual(board["slashed"].to_list(), expected)
+        self.assertEqual(state.leaderboard("stake", block_number=0)["provider"].to_list(), [PROVIDERS[0]])
+        with self.assertRaises(ValueError):
+            state.leaderboard("provider")
+
+    def test_incremental_updates_and_rollback(self):
+        state = ProviderState(checkpoint_interval=5)
+        for to_block in range(3, 44, 6):
+            asyncio.run(self.client.update_provider_state(state, to_block=to_block))
+        asyncio.run(self.client.update_provider_state(state))
+        full = ProviderState(checkpoint_interval=5)
+        asyncio.run(self.client.update_provider_state(full))
+        self.assertTrue(state.totals.equals(full.totals))
+        self.assertTrue(state.deltas.equals(full.deltas))
+
+        state.rollback(12)
+        self.assertEqual(state.next_block, 12)
+        self.assertEqual(self.totals(state.totals), brute_force_totals(self.chain, 11))
+        self.chain.reorg(12)
+        self.chain.emit("FundsSlashed", {"provider": PROVIDERS[0], "amount": 1})
+        asyncio.run(self.client.update_provider_state(state))
+        self.assertEqual(self.totals(state.totals), brute_force_totals(self.chain, 12))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "providers.parquet")
+            state = ProviderState(path=path, checkpoint_interval=10)
+            asyncio.run(self.client.update_provider_state(state))
+            loaded = ProviderState(path=path, checkpoint_interval=10)
+            self.assertEqual(loaded.next_block, 44)
+            self.assertTrue(loaded.totals.equals(state.totals))
+            self.assertTrue(loaded.snapshot(17).equals(state.snapshot(17)))
+
+    def test_invalid_state(self):
+        with self.assertRaises(ValueError):
+            ProviderState(checkpoint_interval=0)
+        with self.assertRaises(ValueError):
+            ProviderState().save()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import hypersync
+from mev_commit_sdk_py.hypersync_client import EVENT_CONFIG, EVENT_REGISTRY, Contracts, Hypersync
+from mev_commit_sdk_py.registry import EventRegistry
+
+
+class TestEventRegistry(unittest.TestCase):
+
+    def test_registry_matches_config(self):
+        self.assertEqual(len(EVENT_REGISTRY), len(EVENT_CONFIG))
+        for event_name, config in EVENT_CONFIG.items():
+            with self.subTest(event_name=event_name):
+                spec = EVENT_REGISTRY.get(event_name)
+                self.assertEqual(spec.signature, config["signature"])
+                self.assertEqual(spec.contract, config["contract"].value)
+                self.assertEqual(spec.topic0, hypersync.signature_to_topic0(config["signature"]))
+                self.assertIn(spec, EVENT_REGISTRY.by_topic0(spec.topic0, spec.contract))
+
+    def test_select_logs(self):
+        spec = EVENT_REGISTRY.get("FundsSlashed")
+        self.assertIs(spec.select_logs(), spec.log_selection)
+        self.assertEqual(spec.log_selection.topics, [[spec.topic0]])
+
+        selection = spec.select_logs("0x" + "AB" * 20)
+        self.assertEqual(selection.address, [Contracts.PROVIDER_REGISTRY.value])
+        self.assertEqual(selection.topics[1], ["0x" + "00" * 12 + "ab" * 20])
+
+    def test_register_at_runtime(self):
+        registry = EventRegistry()
+        spec = registry.register("Ping", "Ping(uint256 indexed id)", Contracts.ORACLE, columns=["timestamp"])
+        self.assertIs(registry.by_signature("Ping(uint256 indexed id)"), spec)
+        self.assertEqual(registry.by_topic0(spec.topic0), (spec,))
+        self.assertEqual(registry.by_topic0(spec.topic0, Contracts.BLOCK_TRACKER.value), ())
+
+        with self.assertRaises(ValueError):
+            registry.register("Ping", "Ping(uint256 id)", Contracts.ORACLE)
+
+        replaced = registry.register("Ping", "Pong(uint256 id)", Contracts.ORACLE, replace=True)
+        self.assertIs(registry.get("Ping"), replaced)
+        self.assertIsNone(registry.by_signature("Ping(uint256 indexed id)"))
+        self.assertEqual(registry.by_topic0(spec.topic0), ())
+
+    def test_create_event_query_uses_registry(self):
+        client = Hypersync(url="http://localhost:1")
+        spec = EVENT_REGISTRY.get("NewL1Block")
+        query = client.create_event_query(spec.signature, 0, 10)
+        self.assertEqual(query.logs[0].topics, [[spec.topic0]])
+        with self.assertRaises(ValueError):
+            client.create_event_query("Unknown(uint256 value)", 0, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import hypersync
+import os
+import tempfile
+import unittest
+import pyarrow as pa
+from types import SimpleNamespace
+from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.pool import ClientPool
+from mev_commit_sdk_py.resume import RetryPolicy, is_transient
+
+
+def page(start: int, end: int) -> SimpleNamespace:
+    data = SimpleNamespace(
+        logs=pa.table({}),
+        transactions=pa.table({}),
+        decoded_logs=pa.table({}),
+        blocks=pa.table({"number": pa.array(range(start, end), pa.uint64())}),
+    )
+    return SimpleNamespace(data=data, next_block=end)
+
+
+class FlakyReceiver:
+
+    def __init__(self, client, cursor, to_block):
+        self.client = client
+        self.cursor = cursor
+        self.to_block = to_block
+
+    async def recv(self):
+        if self.cursor >= self.to_block:
+            return None
+        if self.client.failures and self.cursor == self.client.failures[0]:
+            self.client.failures.pop(0)
+            raise self.client.error
+        start, self.cursor = self.cursor, min(self.cursor + 10, self.to_block)
+        return page(start, self.cursor)
+
+    async def close(self):
+        pass
+
+
+class FlakyClient:
+    """Streams pages of 10 blocks, failing once with `error` when reaching each block in `failures`."""
+
+    def __init__(self, failures, error=None):
+        self.failures = list(failures)
+        self.error = error or RuntimeError("connection reset")
+        self.starts = []
+
+    async def stream_arrow(self, query, config):
+        self.starts.append(query.from_block)
+        return FlakyReceiver(self, query.from_block, query.to_block)
+
+
+class TestResumableCollection(unittest.TestCase):
+
+    def client(self, failures, error=None, **kwargs) -> Hypersync:
+        client = Hypersync(url="http://localhost:1", pool=ClientPool(), **kwargs)
+        client.client = FlakyClient(failures, error)
+        return client
+
+    def test_retries_continue_from_cursor(self):
+        client = self.client([10, 20, 20], retry=RetryPolicy(max_retries=2, base_delay=0))
+
+        blocks = asyncio.run(client.get_blocks(from_block=0, to_block=30))
+
+        self.assertEqual(client.client.starts, [0, 10, 20, 20])
+        self.assertEqual(blocks["number"].to_list(), list(range(30)))
+
+    def test_gives_up_after_max_retries(self):
+        client = self.client([10, 10], retry=RetryPolicy(max_retries=1, base_delay=0))
+        with self.assertRaises(RuntimeError):
+            asyncio.run(client.get_blocks(from_block=0, to_block=30))
+
+    def test_checkpoint_resumes_after_restart(self):
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            crashed = self.client([20], retry=RetryPolicy(max_retries=0), checkpoint_dir=checkpoint_dir)
+            with self.assertRaises(RuntimeError):
+                asyncio.run(crashed.get_blocks(from_block=0, to_block=30))
+
+            restarted = self.client([], checkpoint_dir=checkpoint_dir)
+            blocks = asyncio.run(restarted.get_blocks(from_block=0, to_block=30))
+
+            self.assertEqual(restarted.client.starts, [20])
+            self.assertEqual(blocks["number"].to_list(), list(range(30)))
+            self.assertEqual(os.listdir(checkpoint_dir), [])
+
+    def test_other_failures_are_not_retried(self):
+        client = self.client([10], error=ValueError("invalid field selection"), retry=RetryPolicy(base_delay=0))
+        with self.assertRaises(ValueError):
+            asyncio.run(client.get_blocks(from_block=0, to_block=30))
+        self.assertEqual(client.client.starts, [0])
+
+        self.assertTrue(is_transient(TimeoutError()))
+        self.assertTrue(is_transient(ConnectionResetError()))
+        self.assertTrue(is_transient(ValueError("error sending request for url: operation timed out")))
+        self.assertFalse(is_transient(TypeError("connection")))
+        self.assertFalse(is_transient(KeyError("timeout")))
+
+    def test_streams_retry_from_cursor(self):
+        client = self.client([20], retry=RetryPolicy(base_delay=0))
+        query = client.create_query(from_block=0, to_block=30, logs=[], blocks=[])
+
+        async def collect():
+            return [response.next_block async for response in client.stream_pages(query, hypersync.StreamConfig())]
+
+        self.assertEqual(asyncio.run(collect()), [10, 20, 30])
+        self.assertEqual(client.client.starts, [0, 20])
+
+    def test_collections_of_different_ranges_keep_separate_checkpoints(self):
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            crashed = self.client([30], retry=RetryPolicy(max_retries=0), checkpoint_dir=checkpoint_dir)
+            with self.assertRaises(RuntimeError):
+                asyncio.run(crashed.get_blocks(from_block=0, to_block=50))
+
+            # A shorter collection with the same start neither resumes nor clears the longer one's checkpoint
+            shorter = self.client([], checkpoint_dir=checkpoint_dir)
+            blocks = asyncio.run(shorter.get_blocks(from_block=0, to_block=15))
+            self.assertEqual(shorter.client.starts, [0])
+            self.assertEqual(blocks["number"].to_list(), list(range(15)))
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 1)
+
+            restarted = self.client([], checkpoint_dir=checkpoint_dir)
+            blocks = asyncio.run(restarted.get_blocks(from_block=0, to_block=50))
+            self.assertEqual(restarted.client.starts, [30])
+            self.assertEqual(blocks["number"].to_list(), list(range(50)))
+            self.assertEqual(os.listdir(checkpoint_dir), [])
+
+    def test_delay_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        for attempt in range(6):
+            self.assertLessEqual(policy.delay(attempt), min(4.0, 2**attempt))
+            self.assertGreaterEqual(policy.delay(attempt), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
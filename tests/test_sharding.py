@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+import polars as pl
+from mev_commit_sdk_py.sharding import ShardPlanner, run_sharded
+
+
+class TestSharding(unittest.TestCase):
+
+    def test_planner_covers_range(self):
+        planner = ShardPlanner(0, 10_500, shards=4, min_chunk_size=1)
+        ranges = []
+        while (block_range := planner.next_range()) is not None:
+            ranges.append(block_range)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 10_500)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_planner_adapts_chunk_size(self):
+        planner = ShardPlanner(0, 1_000_000, shards=10, target_seconds=1.0, min_chunk_size=1)
+        planner.observe(100_000, seconds=10.0, rows=10)
+        self.assertEqual(planner.chunk_size, 50_000)
+        planner.observe(50_000, seconds=0.1, rows=10)
+        self.assertEqual(planner.chunk_size, 100_000)
+
+    def test_run_sharded_concatenates_in_block_order(self):
+        in_flight, peak = 0, 0
+
+        async def fetch(start, end):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Finish later chunks first to check ordering
+            await asyncio.sleep(0.001 * (10_000 - start) / 1_000)
+            in_flight -= 1
+            return pl.DataFrame({"block_number": list(range(start, end))})
+
+        planner = ShardPlanner(0, 10_000, shards=8, min_chunk_size=100)
+        df = asyncio.run(run_sharded(fetch, planner, max_concurrency=3))
+        self.assertEqual(df["block_number"].to_list(), list(range(10_000)))
+        self.assertLessEqual(peak, 3)
+
+    def test_run_sharded_propagates_errors(self):
+        async def fetch(start, end):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run_sharded(fetch, ShardPlanner(0, 100, shards=4), max_concurrency=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+import polars as pl
+import pyarrow as pa
+from types import SimpleNamespace
+from mev_commit_sdk_py.hypersync_client import Hypersync
+from mev_commit_sdk_py.sink import ParquetSink
+from mev_commit_sdk_py.testing import ReplayClient, SyntheticChain, fake_hypersync
+
+
+def blocks_page(numbers: list[int], next_block: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        data=SimpleNamespace(blocks=pa.table({"number": numbers, "timestamp": numbers})), next_block=next_block
+    )
+
+
+class TestParquetSink(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_block_range_partitions(self):
+        sink = ParquetSink(self.path, partition_size=10)
+        entries = sink.write("Staked", pl.DataFrame({"block_number": [1, 5, 12], "amount": [1, 2, 3]}))
+
+        self.assertEqual([e["partition"] for e in entries], ["block_range=000000000000", "block_range=000000000010"])
+        self.assertEqual([(e["min_block"], e["max_block"], e["rows"]) for e in entries], [(1, 5, 2), (12, 12, 1)])
+        with open(sink.manifest_path) as f:
+            self.assertEqual([json.loads(line) for line in f], entries)
+
+        df = sink.scan("Staked").filter(pl.col("block_range") == 10).collect()
+        self.assertEqual(df["amount"].to_list(), [3])
+
+    def test_day_partitions(self):
+        sink = ParquetSink(self.path, partition_by="day")
+        entries = sink.write("blocks", pl.DataFrame({"number": [1, 2], "timestamp": [0, 86_400]}))
+        self.assertEqual([e["partition"] for e in entries], ["day=1970-01-01", "day=1970-01-02"])
+
+        with self.assertRaises(ValueError):
+            sink.write("blocks", pl.DataFrame({"number": [1]}))
+
+    def test_overwrite_and_append(self):
+        ParquetSink(self.path, partition_by=None).write("Staked", pl.DataFrame({"block_number": [1]}))
+
+        appended = ParquetSink(self.path, partition_by=None, mode="append")
+        appended.write("Staked", pl.DataFrame({"block_number": [2]}))
+        self.assertEqual(appended.scan("Staked").collect()["block_number"].sort().to_list(), [1, 2])
+
+        overwritten = ParquetSink(self.path, partition_by=None)
+        overwritten.write("Staked", pl.DataFrame({"block_number": [3]}))
+        overwritten.write("Staked", pl.DataFrame({"block_number": [4]}))
+        self.assertEqual(overwritten.scan("Staked").collect()["block_number"].sort().to_list(), [3, 4])
+        self.assertEqual(len(os.listdir(os.path.join(self.path, "Staked"))), 2)
+
+    def test_concurrent_writers_append_to_the_manifest(self):
+        first = ParquetSink(self.path, partition_by=None, mode="append")
+        second = ParquetSink(self.path, partition_by=None, mode="append")
+        entries = first.write("Staked", pl.DataFrame({"block_number": [1, 2]}))
+        with open(first.manifest_path) as f:
+            written = f.read()
+        entries += second.write("Staked", pl.DataFrame({"block_number": [1, 2]}))
+        entries += first.write("Staked", pl.DataFrame({"block_number": [3]}))
+
+        # Files of the same block range don't collide, and earlier manifest lines are left as they are
+        self.assertEqual(len({e["path"] for e in entries}), 3)
+        self.assertTrue(entries[0]["path"].startswith(os.path.join("Staked", "part-000000000001-000000000002-")))
+        with open(first.manifest_path) as f:
+            self.assertTrue(f.read().startswith(written))
+        self.assertEqual(first.load_manifest()["files"], entries)
+        self.assertEqual(first.scan("Staked").collect()["block_number"].sort().to_list(), [1, 1, 2, 2, 3])
+
+        # A line cut short by an interrupted write is skipped
+        with open(first.manifest_path, "a") as f:
+            f.write('{"dataset": "Sta')
+        self.assertEqual(first.load_manifest()["files"], entries)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            ParquetSink(self.path, partition_by="month")
+        with self.assertRaises(ValueError):
+            ParquetSink(self.path, mode="merge")
+
+    def test_get_blocks_streams_into_sink(self):
+        client = Hypersync(url="http://localhost:1")
+        client.client = ReplayClient([blocks_page([1, 2], 3), blocks_page([], 3), blocks_page([3], 4)])
+        sink = ParquetSink(self.path, partition_by=None)
+
+        entries = asyncio.run(client.get_blocks(from_block=0, to_block=4, sink=sink))
+
+        self.assertTrue(client.client.receivers[0].closed)
+        self.assertEqual([e["rows"] for e in entries], [2, 1])
+        self.assertEqual(sink.scan("blocks").collect()["number"].sort().to_list(), [1, 2, 3])
+
+    def test_save_data_writes_to_save_dir(self):
+        chain = SyntheticChain()
+        chain.mine(3)
+        client = fake_hypersync(chain, save_dir=os.path.join(self.path, "out"))
+        asyncio.run(client.get_blocks(from_block=0, to_block=3, save_data=True, print_time=False))
+        saved = pl.read_parquet(os.path.join(self.path, "out", "blocks_data.parquet"))
+        self.assertEqual(saved["number"].to_list(), [0, 1, 2])
+
+    def test_sink_rejects_save_data(self):
+        client = Hypersync(url="http://localhost:1")
+        with self.assertRaises(ValueError):
+            asyncio.run(client.get_blocks_txs(from_block=0, to_block=4, save_data=True, sink=ParquetSink(self.path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
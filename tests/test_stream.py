@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+import polars as pl
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+
+GENESIS = 1_700_000_000
+
+
+class TestStreamEvent(unittest.TestCase):
+
+    def setUp(self):
+        # Two slashes in each of blocks 0..6, one transaction each, streamed in pages of 4 blocks
+        self.chain = SyntheticChain(genesis_timestamp=GENESIS, block_time=12)
+        for block in range(7):
+            for amount in (2 * block, 2 * block + 1):
+                self.chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": amount}, block_number=block)
+        self.chain.mine(3)
+        self.client = fake_hypersync(self.chain)
+        self.client.client.page_size = 4
+
+        self.configs = []
+        stream_arrow = self.client.client.stream_arrow
+
+        async def recording_stream_arrow(query, config):
+            self.configs.append(config)
+            return await stream_arrow(query, config)
+
+        self.client.client.stream_arrow = recording_stream_arrow
+
+    def stream(self, **kwargs):
+        async def collect():
+            return [df async for df in self.client.stream_event("FundsSlashed", from_block=0, to_block=10, **kwargs)]
+
+        return asyncio.run(collect())
+
+    def test_pages_are_sliced_to_batch_size(self):
+        batches = self.stream(batch_size=3)
+        # Pages of 8 and 6 rows, each sliced on its own
+        self.assertEqual([df.height for df in batches], [3, 3, 2, 3, 3])
+        amounts = pl.concat(batches)["amount"].cast(pl.Int64).to_list()
+        self.assertEqual(amounts, list(range(14)))
+
+    def test_max_num_logs_is_capped_at_batch_size(self):
+        self.stream(batch_size=3, concurrency=2)
+        self.assertEqual([(c.max_num_logs, c.concurrency) for c in self.configs], [(3, 2)])
+
+    def test_transactions_and_blocks_are_joined_per_page(self):
+        batches = self.stream(batch_size=5)
+        expected = asyncio.run(
+            self.client.execute_event_query("FundsSlashed", from_block=0, to_block=10, print_time=False)
+        )
+        self.assertTrue(pl.concat(batches).equals(expected))
+        hashes = {(log["block_number"], log["log_index"]): log["transaction_hash"] for log in self.chain.logs}
+        for df in batches:
+            self.assertEqual(df["timestamp"].to_list(), [GENESIS + 12 * b for b in df["block_number"]])
+            keys = df.select("block_number", "log_index").rows()
+            self.assertEqual(df["hash"].to_list(), [hashes[key] for key in keys])
+
+        tables = self.stream(batch_size=5, output="arrow")
+        self.assertEqual([t.num_rows for t in tables], [5, 3, 5, 1])
+        self.assertEqual(pl.concat([pl.from_arrow(t) for t in tables]).to_dicts(), expected.to_dicts())
+
+        bare = self.stream(batch_size=5, tx_data=False)
+        self.assertEqual(bare[0].columns, ["provider", "amount", "block_number", "log_index"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+import pyarrow as pa
+from types import SimpleNamespace
+from mev_commit_sdk_py.hypersync_client import EVENT_REGISTRY, Hypersync
+from mev_commit_sdk_py.resume import RetryPolicy
+
+
+def funds_slashed(block_number: int, log_index: int, amount: int) -> dict:
+    spec = EVENT_REGISTRY.get("FundsSlashed")
+    return {
+        "block_number": block_number,
+        "transaction_hash": "0x" + format(block_number, "064x"),
+        "log_index": log_index,
+        "address": spec.contract,
+        "data": "0x" + format(amount, "064x"),
+        "topic0": spec.topic0,
+        "topic1": "0x" + "00" * 12 + "11" * 20,
+        "topic2": None,
+        "topic3": None,
+    }
+
+
+def response(
+    logs: list[dict], next_block: int, guard: SimpleNamespace, blocks: pa.Table = pa.table({})
+) -> SimpleNamespace:
+    data = SimpleNamespace(
+        logs=pa.Table.from_pylist(logs),
+        transactions=pa.table({}),
+        blocks=blocks,
+        decoded_logs=pa.table({}),
+    )
+    return SimpleNamespace(data=data, next_block=next_block, rollback_guard=guard)
+
+
+def block_hash_response(block_number: int, hash: str) -> SimpleNamespace:
+    return response([], block_number + 1, None, blocks=pa.table({"number": [block_number], "hash": [hash]}))
+
+
+def guard(first_block_number: int, first_parent_hash: str, block_number: int, hash: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        first_block_number=first_block_number,
+        first_parent_hash=first_parent_hash,
+        block_number=block_number,
+        hash=hash,
+    )
+
+
+class FakeClient:
+
+    def __init__(self, heights, responses):
+        self.heights = list(heights)
+        self.responses = list(responses)
+        self.queries = []
+
+    async def get_height(self):
+        return self.heights.pop(0)
+
+    async def collect_arrow(self, query, config):
+        self.queries.append((query.from_block, query.to_block))
+        result = self.responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def collect_updates(client: Hypersync, count: int, **kwargs) -> list:
+    async def collect():
+        updates = []
+        async for update in client.subscribe(["FundsSlashed"], tx_data=False, poll_interval=0, **kwargs):
+            updates.append(update)
+            if len(updates) == count:
+                break
+        return updates
+
+    return asyncio.run(collect())
+
+
+class TestSubscribe(unittest.TestCase):
+
+    def test_subscribe_follows_head(self):
+        client = Hypersync(url="http://localhost:1")
+        client.client = FakeClient(
+            heights=[10, 10, 12, 13],
+            responses=[
+                response([funds_slashed(10, 0, 5)], 11, guard(10, "0x09", 10, "0x10")),
+                # Overlapping log at block 10 is dropped
+                response([funds_slashed(10, 0, 5), funds_slashed(12, 1, 7)], 13, guard(11, "0x10", 12, "0x12")),
+                # The parent of block 13 isn't the last seen block
+                response([], 14, guard(13, "0xbad", 13, "0x13")),
+            ],
+        )
+        first, second, rollback = collect_updates(client, 3, from_block=10, reorg_depth=2)
+        self.assertEqual(client.client.queries, [(10, 11), (11, 13), (13, 14)])
+        self.assertEqual(first.events["FundsSlashed"]["block_number"].to_list(), [10])
+        self.assertEqual(second.events["FundsSlashed"]["block_number"].to_list(), [12])
+        self.assertEqual(second.events["FundsSlashed"]["amount"].to_list(), [7])
+        self.assertEqual(second.next_block, 13)
+        self.assertEqual(rollback.events, {})
+        self.assertEqual(rollback.rollback_block, 11)
+
+    def test_reorg_across_a_poll_gap(self):
+        # Blocks 11-12 come without a rollback guard, so the next response can't be compared with block 10
+        for hash_of_10, reorged in [("0x10b", True), ("0x10", False)]:
+            with self.subTest(reorged=reorged):
+                client = Hypersync(url="http://localhost:1")
+                client.client = FakeClient(
+                    heights=[10, 12, 13, 14],
+                    responses=[
+                        response([funds_slashed(10, 0, 5)], 11, guard(10, "0x09", 10, "0x10")),
+                        response([funds_slashed(12, 0, 7)], 13, None),
+                        response([], 14, guard(13, "0x12", 13, "0x13")),
+                        block_hash_response(10, hash_of_10),
+                        response([funds_slashed(14, 0, 9)], 15, guard(14, "0x13", 14, "0x14")),
+                    ],
+                )
+                _, _, third = collect_updates(client, 3, from_block=10, reorg_depth=2)
+                self.assertEqual(client.client.queries[3], (10, 11))
+                if reorged:
+                    self.assertEqual(third.rollback_block, 11)
+                else:
+                    self.assertIsNone(third.rollback_block)
+                    self.assertEqual(third.events["FundsSlashed"]["block_number"].to_list(), [14])
+
+    def test_transient_failures_are_retried(self):
+        client = Hypersync(url="http://localhost:1", retry=RetryPolicy(base_delay=0))
+        client.client = FakeClient(
+            heights=[10, 10],
+            responses=[
+                ConnectionError("connection reset"),
+                response([funds_slashed(10, 0, 5)], 11, guard(10, "0x09", 10, "0x10")),
+            ],
+        )
+        (update,) = collect_updates(client, 1, from_block=10)
+        self.assertEqual(update.events["FundsSlashed"]["amount"].to_list(), [5])
+        self.assertEqual(client.client.queries, [(10, 11), (10, 11)])
+
+        client.client = FakeClient(heights=[10], responses=[ValueError("invalid query")])
+        with self.assertRaises(ValueError):
+            collect_updates(client, 1, from_block=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import unittest
+from mev_commit_sdk_py.sync import SyncHypersync
+from mev_commit_sdk_py.testing import fake_hypersync, slashing_chain
+
+
+class TestSyncHypersync(unittest.TestCase):
+
+    def setUp(self):
+        self.sync = SyncHypersync(client=fake_hypersync(slashing_chain()))
+
+    def tearDown(self):
+        self.sync.close()
+
+    def test_blocking_queries_reuse_loop(self):
+        slashes = self.sync.execute_event_query("FundsSlashed", from_block=0, print_time=False)
+        self.assertEqual(slashes["block_number"].to_list(), [0, 10, 20, 30])
+        self.assertEqual(self.sync.get_height(), 45)
+        blocks = self.sync.get_blocks(from_block=0, to_block=5, print_time=False)
+        self.assertEqual(blocks.height, 5)
+
+    def test_batch(self):
+        client = self.sync.client
+        slashes, deposits, error = self.sync.batch(
+            [
+                client.execute_event_query("FundsSlashed", from_block=0, print_time=False),
+                client.execute_event_query("FundsDeposited", from_block=0, print_time=False),
+                client.execute_event_query("Unknown", print_time=False),
+            ],
+            return_exceptions=True,
+            pin_height=True,
+        )
+        self.assertEqual(slashes.height, 4)
+        self.assertEqual(deposits["block_number"].to_list(), [35])
+        self.assertIsInstance(error, ValueError)
+
+    def test_stream_event_closes_early(self):
+        self.sync.client.client.page_size = 10
+        batches = self.sync.stream_event("FundsSlashed", from_block=0, to_block=40)
+        first = next(batches)
+        batches.close()
+        self.assertEqual(first["block_number"].to_list(), [0])
+
+    def test_stream_event_reader(self):
+        self.sync.client.client.page_size = 10
+        reader = self.sync.stream_event_reader("FundsSlashed", from_block=0, to_block=40, tx_data=False)
+        self.assertEqual(reader.schema.names, ["provider", "amount", "block_number", "log_index"])
+        self.assertEqual(reader.read_all()["block_number"].to_pylist(), [0, 10, 20, 30])
+
+        empty = self.sync.stream_event_reader("FundsDeposited", from_block=0, to_block=30)
+        self.assertEqual(empty.read_all().num_rows, 0)
+
+    def test_usable_inside_running_loop(self):
+        async def notebook_cell():
+            return self.sync.execute_event_query("FundsSlashed", from_block=0, print_time=False)
+
+        self.assertEqual(asyncio.run(notebook_cell()).height, 4)
+
+    def test_close(self):
+        thread = self.sync._thread
+        with self.sync:
+            pass
+        self.assertFalse(thread.is_alive())
+        self.assertNotIn(thread, threading.enumerate())
+        with self.assertRaises(RuntimeError):
+            self.sync.get_height()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+import polars as pl
+from decimal import Decimal
+from mev_commit_sdk_py.hypersync_client import EVENT_REGISTRY
+from mev_commit_sdk_py.registry import EventSpec
+from mev_commit_sdk_py.testing import FakeHypersyncClient, SyntheticChain, encode_log, fake_hypersync
+
+
+class TestSyntheticChain(unittest.TestCase):
+
+    def test_dynamic_values_round_trip(self):
+        spec = EventSpec(
+            "Note", "Note(address indexed sender, string text, bytes blob, uint64 count)", "0x" + "cc" * 20,
+            EVENT_REGISTRY.default_column_mapping,
+        )
+        log = encode_log(spec, {"sender": "0x" + "ab" * 20, "text": "héllo" * 20, "blob": "0xdeadbeef", "count": 7})
+
+        decoded = spec.decode(pl.DataFrame([log]))
+        self.assertEqual(decoded.row(0), ("0x" + "ab" * 20, "héllo" * 20, "0xdeadbeef", "0x" + format(7, "064x")))
+
+    def test_stream_pages_and_reorg(self):
+        chain = SyntheticChain()
+        chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": 5}, block_number=3)
+        chain.mine(20)
+        client = fake_hypersync(chain)
+        client.client.page_size = 10
+
+        entries = []
+
+        async def collect():
+            async for df in client.stream_event("FundsSlashed", from_block=0, to_block=24):
+                entries.append(df)
+
+        asyncio.run(collect())
+        self.assertEqual(len(client.client.queries), 1)
+        self.assertEqual(pl.concat(entries)["block_number"].to_list(), [3])
+
+        old_hash = chain.blocks[10]["hash"]
+        chain.reorg(10)
+        chain.mine(5)
+        self.assertNotEqual(chain.blocks[10]["hash"], old_hash)
+        self.assertEqual(chain.blocks[10]["parent_hash"], chain.blocks[9]["hash"])
+
+    def test_transaction_selection(self):
+        chain = SyntheticChain()
+        wanted = chain.add_transaction(2, from_="0x" + "01" * 20)
+        chain.add_transaction(4)
+        client = FakeHypersyncClient(chain)
+        txs = asyncio.run(fake_hypersync(chain).get_blocks_txs(from_block=0, columns=["from"]))
+        self.assertEqual(txs["hash"].to_list()[0], wanted)
+        self.assertEqual(txs["from"].to_list()[0], "0x" + "01" * 20)
+        # Like Hypersync, the height is the last block
+        self.assertEqual(asyncio.run(client.get_height()), 4)
+
+    def test_decoded_logs_match_emitted_values(self):
+        chain = SyntheticChain()
+        chain.emit("FundsSlashed", {"provider": "0x" + "AB" * 20, "amount": 10**20}, block_number=2)
+        chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": 3}, block_number=4)
+        client = fake_hypersync(chain)
+        expected = [("0x" + "ab" * 20, Decimal(10**20)), ("0x" + "11" * 20, Decimal(3))]
+
+        # Decoded by the fake from the emitted values
+        single = asyncio.run(client.execute_event_query("FundsSlashed", from_block=0, to_block=5, print_time=False))
+        self.assertEqual(single.select("provider", "amount").rows(), expected)
+        # Decoded by the SDK from the raw logs
+        events = asyncio.run(
+            client.execute_events_query(["FundsSlashed"], from_block=0, to_block=5, print_time=False)
+        )
+        self.assertEqual(events["FundsSlashed"].select("provider", "amount").rows(), expected)
+
+    def test_subscribe_includes_the_head_block(self):
+        chain = SyntheticChain()
+        chain.emit("FundsSlashed", {"provider": "0x" + "11" * 20, "amount": 3}, block_number=4)
+        client = fake_hypersync(chain)
+
+        async def first_update():
+            updates = client.subscribe(["FundsSlashed"], from_block=0, tx_data=False)
+            try:
+                return await anext(updates)
+            finally:
+                await updates.aclose()
+
+        update = asyncio.run(first_update())
+        self.assertEqual(update.events["FundsSlashed"]["block_number"].to_list(), [4])
+        self.assertEqual(update.next_block, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import polars as pl
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+from mev_commit_sdk_py.tx_index import TxIndex, group_block_ranges
+
+
+def tx_hash(i: int) -> str:
+    return "0x" + format(i, "064x")
+
+
+class TestTxIndex(unittest.TestCase):
+
+    def test_group_block_ranges(self):
+        located = {"a": 5, "b": 7, "c": 5000, "d": 100}
+        self.assertEqual(
+            group_block_ranges(located, max_gap=100),
+            [(5, 101, ["a", "b", "d"]), (5000, 5001, ["c"])],
+        )
+        self.assertEqual(group_block_ranges({}), [])
+
+    def test_update_lookup_and_save(self):
+        with tempfile.TemporaryDirectory() as path:
+            index = TxIndex(os.path.join(path, "txs.parquet"))
+            index.update(pl.DataFrame({"hash": [tx_hash(1), tx_hash(2)], "block_number": [10, 20]}))
+            index.update(pl.DataFrame({"transaction_hash": [tx_hash(2)], "block_number": [21]}), "transaction_hash")
+            index.update(pl.DataFrame({"number": [1]}))
+            index.save()
+
+            reloaded = TxIndex(index.path)
+            self.assertEqual(len(reloaded), 2)
+            self.assertEqual(reloaded.lookup([tx_hash(1), tx_hash(2), tx_hash(3)]), {tx_hash(1): 10, tx_hash(2): 21})
+
+    def test_pending_updates_are_compacted(self):
+        index = TxIndex(max_pending_rows=3)
+        for block in range(5):
+            index.update(pl.DataFrame({"hash": [tx_hash(1), tx_hash(block + 2)], "block_number": [block, block]}))
+            self.assertLess(sum(df.height for df in index._pending), 3)
+        self.assertEqual(index.frame.height, 5)
+        self.assertEqual(index.lookup([tx_hash(1), tx_hash(6)]), {tx_hash(1): 4, tx_hash(6): 4})
+
+    def test_search_txs_queries_indexed_blocks(self):
+        # Transaction i is at block 10 * i
+        chain = SyntheticChain()
+        for i in range(500):
+            chain.add_transaction(block_number=10 * i, hash=tx_hash(i))
+        client = fake_hypersync(chain, tx_index=TxIndex())
+
+        async def run():
+            await client.backfill_tx_index(from_block=0, to_block=2000)
+            client.client.queries.clear()
+            # Transaction 300 isn't indexed and falls back to a full scan
+            return await client.search_txs([tx_hash(1), tx_hash(3), tx_hash(150), tx_hash(300)], print_time=False)
+
+        df = asyncio.run(run())
+        self.assertEqual(sorted(df["block_number"].to_list()), [10, 30, 1500, 3000])
+        ranges = [(query.from_block, query.to_block) for query in client.client.queries]
+        self.assertEqual(ranges, [(10, 31), (1500, 1501), (0, 4990)])
+
+    def test_malformed_hashes_are_rejected(self):
+        client = fake_hypersync(tx_index=TxIndex())
+        with self.assertRaisesRegex(ValueError, r"'0xzz'.*'abc'"):
+            asyncio.run(client.search_txs([tx_hash(1), "0xzz", "abc"], print_time=False))
+        with self.assertRaisesRegex(ValueError, "0x12"):
+            client.tx_index.lookup(["0x12"])
+        self.assertEqual(client.client.queries, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+import polars as pl
+from mev_commit_sdk_py.testing import SyntheticChain, fake_hypersync
+from mev_commit_sdk_py.validators import ValidatorIndex
+
+KEYS = ["0x" + format(i, "02x") * 48 for i in range(1, 4)]
+WITHDRAWAL = "0x" + "aa" * 20
+
+
+def emit(chain: SyntheticChain, event_name: str, key: str) -> None:
+    values = {"msgSender": WITHDRAWAL, "withdrawalAddress": WITHDRAWAL, "valBLSPubKey": key, "amount": 32 * 10**18}
+    if event_name == "StakeAdded":
+        values["newBalance"] = 64 * 10**18
+    if event_name == "Slashed":
+        values["slashReceiver"] = WITHDRAWAL
+    chain.emit(event_name, values)
+
+
+class TestValidatorIndex(unittest.TestCase):
+
+    def setUp(self):
+        # One event per block. Key 0 is staked over blocks 0-2 and again from block 6, key 1 over blocks 1-4 until
+        # slashed, key 2 from block 7
+        self.chain = SyntheticChain()
+        for event_name, key in [
+            ("Staked", 0), ("Staked", 1), ("StakeAdded", 0), ("Unstaked", 0), ("StakeAdded", 1),
+            ("Slashed", 1), ("Staked", 0), ("Staked", 2), ("StakeWithdrawn", 1),
+        ]:
+            emit(self.chain, event_name, KEYS[key])
+        self.client = fake_hypersync(self.chain)
+
+    def expected(self, key: int, block: int) -> bool:
+        return {0: block in (0, 1, 2) or block >= 6, 1: 1 <= block <= 4, 2: block >= 7}[key]
+
+    def test_intervals(self):
+        index = ValidatorIndex()
+        # Stake top-ups and withdrawals aren't fetched
+        self.assertEqual(asyncio.run(self.client.update_validator_index(index)), 6)
+        self.assertEqual(index.next_block, 9)
+        intervals = index.intervals
+        self.assertEqual(intervals["start_block"].to_list(), [0, 1, 6, 7])
+        self.assertEqual(intervals["end_block"].to_list(), [3, 5, None, None])
+        self.assertEqual(intervals["slashed"].to_list(), [False, True, None, None])
+        self.assertEqual(intervals["withdrawalAddress"].unique().to_list(), [WITHDRAWAL])
+
+    def test_batched_membership(self):
+        index = ValidatorIndex()
+        asyncio.run(self.client.update_validator_index(index))
+        rng = random.Random(3)
+        pairs = [(rng.randrange(3), rng.randrange(12)) for _ in range(500)]
+        staked = index.contains([KEYS[k].upper().replace("0X", "0x") for k, _ in pairs], [b for _, b in pairs])
+        self.assertEqual(staked.to_list(), [self.expected(k, b) for k, b in pairs])
+        self.assertEqual(index.contains(KEYS, 2).to_list(), [True, True, False])
+        self.assertEqual(index.contains("0x" + "ff" * 48, 5).to_list(), [False])
+
+    def test_join(self):
+        index = ValidatorIndex()
+        asyncio.run(self.client.update_validator_index(index))
+        slots = pl.DataFrame({"slot": [1, 2, 3], "proposer": [KEYS[1], KEYS[0], KEYS[1]], "block": [4, 4, 5]})
+        joined = index.join(slots, pubkey_column="proposer", block_column="block")
+        self.assertEqual(joined.columns[:3], ["slot", "proposer", "block"])
+        self.assertEqual(joined["slot"].to_list(), [1, 2, 3])
+        self.assertEqual(joined["staked"].to_list(), [True, False, False])
+        self.assertEqual(joined["start_block"].to_list(), [1, None, None])
+        self.assertEqual(joined["slashed"].to_list(), [True, None, None])
+
+    def test_staked_at(self):
+        index = ValidatorIndex()
+        asyncio.run(self.client.update_validator_index(index))
+        for block in range(10):
+            expected = [KEYS[k] for k in range(3) if self.expected(k, block)]
+            self.assertEqual(sorted(index.staked_at(block)["valBLSPubKey"].to_list()), expected, block)
+
+    def test_incremental_updates_and_rollback(self):
+        index = ValidatorIndex()
+        for to_block in range(1, 10, 2):
+            asyncio.run(self.client.update_validator_index(index, to_block=to_block))
+        asyncio.run(self.client.update_validator_index(index))
+        full = ValidatorIndex()
+        asyncio.run(self.client.update_validator_index(full))
+        self.assertTrue(index.intervals.equals(full.intervals))
+
+        index.rollback(5)
+        self.assertEqual(index.next_block, 5)
+        self.assertEqual(index.intervals["end_block"].to_list(), [3, None])
+        self.chain.reorg(5)
+        emit(self.chain, "Unstaked", KEYS[1])
+        asyncio.run(self.client.update_validator_index(index))
+        self.assertEqual(index.intervals["end_block"].to_list(), [3, 5])
+        self.assertEqual(index.intervals["slashed"].to_list(), [False, False])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "validators.parquet")
+            index = ValidatorIndex(path=path)
+            asyncio.run(self.client.update_validator_index(index, to_block=7))
+            loaded = ValidatorIndex(path=path)
+            self.assertEqual(loaded.next_block, 7)
+            self.assertTrue(loaded.intervals.equals(index.intervals))
+            # Open intervals are closed by later events after loading
+            asyncio.run(self.client.update_validator_index(loaded))
+            self.assertEqual(loaded.contains(KEYS[1], 6).to_list(), [False])
+
+    def test_empty_index(self):
+        index = ValidatorIndex()
+        self.assertEqual(index.contains(KEYS, 0).to_list(), [False, False, False])
+        self.assertTrue(index.staked_at(0).is_empty())
+        with self.assertRaises(ValueError):
+            index.save()
+
+
+if __name__ == '__main__':
+    unittest.main()